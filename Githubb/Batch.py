@@ -0,0 +1,176 @@
+"""Exécution des algorithmes sans interface graphique, par lots.
+
+Chaque fichier d'instance (.json ou .npz) contient une clé "algorithme" et les
+paramètres de la fonction solve_* correspondante. Une clé "graphe" peut désigner
+un fichier de graphe (.gr, .max, .csr, .csv, .tsv, .txt, chemin relatif au
+fichier d'instance) qui fournit alors les sommets, arcs et poids. Un fichier
+DIMACS .max seul est résolu directement par le flot maximal, et un tableau de
+transport bordé .npy seul par Stepping Stone. Une clé "donnees" désigne de même
+un fichier d'instance de transport (.npy, .npz ou .csv, voir Transport.py),
+ouvert en memmap ; "dtype" précise alors le type attendu des coûts. Les
+résultats en memmap (matrice des distances) sont écrits par le nom de leur
+fichier ; sans clé "sortie", la matrice d'une instance "distances" va à côté
+du fichier de résultats (resultats.<instance>.npy pour resultats.jsonl). Exemple :
+
+    python Batch.py instances/ --sortie resultats.jsonl --processus 4
+"""
+import argparse
+import functools
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from WelshPowell import solve_welsh_powell
+from Kruskal import solve_kruskal
+from PotentielMetra import solve_pert_monte_carlo, solve_potentiel_metra
+from BellmanFord import solve_bellman_ford
+from Dijkstra import solve_dijkstra
+from FordFulkerson import solve_flot_maximal, solve_flot_incremental
+from Nord_west_Moindre_Cout import solve_transport
+from SteppingStone import solve_stepping_stone
+from CheminsDynamiques import solve_chemins_dynamiques
+from Distances import solve_distances
+from Lecteurs import charger_graphe, lire_dimacs
+from Transport import lire_transport
+
+SOLVEURS = {
+    "welsh_powell": solve_welsh_powell,
+    "kruskal": solve_kruskal,
+    "potentiel_metra": solve_potentiel_metra,
+    "pert_monte_carlo": solve_pert_monte_carlo,
+    "bellman_ford": solve_bellman_ford,
+    "dijkstra": solve_dijkstra,
+    "flot_maximal": solve_flot_maximal,
+    "transport": solve_transport,
+    "stepping_stone": solve_stepping_stone,
+    "chemins_dynamiques": solve_chemins_dynamiques,
+    "flot_incremental": solve_flot_incremental,
+    "distances": solve_distances,
+}
+
+EXTENSIONS = (".json", ".npz", ".max", ".npy")
+
+# Nom du paramètre qui reçoit les poids du graphe (None : graphe non pondéré)
+PARAMETRE_POIDS = {"flot_maximal": "capacites", "flot_incremental": "capacites", "welsh_powell": None}
+
+def _avec_graphe(algorithme, parametres, dossier):
+    """Remplace la clé "graphe" (fichier) par les tableaux d'arêtes du graphe lu."""
+    parametres = dict(parametres)
+    oriente = parametres.pop("oriente", None)
+    graphe = charger_graphe(Path(dossier) / parametres.pop("graphe"), oriente)
+    origines, extremites, poids = graphe.aretes()
+    parametres.update(num_vertices=graphe.nombre_sommets, origines=origines, extremites=extremites)
+    cle = PARAMETRE_POIDS.get(algorithme, "poids")
+    if cle is not None:
+        parametres[cle] = poids if poids is not None else np.ones(len(origines), dtype=np.int64)
+    if algorithme in ("dijkstra", "distances"):
+        parametres["oriente"] = graphe.oriente
+    if algorithme == "kruskal" and graphe.noms is not None:
+        parametres.setdefault("noms", graphe.noms)
+    return parametres
+
+def charger_instance(chemin):
+    """Lit un fichier d'instance ; retourne (algorithme, paramètres)."""
+    chemin = Path(chemin)
+    if chemin.suffix == ".json":
+        with open(chemin, encoding="utf-8") as f:
+            parametres = json.load(f)
+    elif chemin.suffix == ".npz":
+        with np.load(chemin, allow_pickle=False) as donnees:
+            # Les scalaires sont stockés comme des tableaux de dimension 0
+            parametres = {cle: donnees[cle].item() if donnees[cle].ndim == 0 else donnees[cle]
+                          for cle in donnees.files}
+    elif chemin.suffix == ".max":
+        parametres = {"algorithme": "flot_maximal", **lire_dimacs(chemin)}
+    elif chemin.suffix == ".npy":
+        # Tableau de transport bordé, ouvert en memmap
+        couts, capacites, demandes = lire_transport(chemin)
+        parametres = {"algorithme": "stepping_stone", "couts": couts, "capacites": capacites, "demandes": demandes}
+    else:
+        raise ValueError(f"Format d'instance non reconnu : {chemin.suffix}")
+
+    algorithme = parametres.pop("algorithme", None)
+    if algorithme not in SOLVEURS:
+        raise ValueError(f"Algorithme inconnu : {algorithme}")
+    if "graphe" in parametres:
+        parametres = _avec_graphe(algorithme, parametres, chemin.parent)
+    if "donnees" in parametres:
+        # Instance de transport dans un fichier séparé (.npy, .npz ou .csv)
+        couts, capacites, demandes = lire_transport(chemin.parent / parametres.pop("donnees"),
+                                                    parametres.pop("dtype", None))
+        parametres.update(couts=couts, capacites=capacites, demandes=demandes)
+    return algorithme, parametres
+
+def fichier_matrice(sortie, chemin):
+    """Fichier de la matrice des distances d'une instance, à côté du fichier de résultats `sortie`."""
+    sortie = Path(sortie)
+    return sortie.with_name(f"{sortie.stem}.{Path(chemin).name}.npy")
+
+def resoudre_fichier(chemin, sortie=None):
+    """Résout une instance ; retourne l'enregistrement JSON (résultat ou erreur).
+
+    `sortie` (fichier de résultats) place la matrice d'une instance "distances"
+    qui n'a pas sa propre clé "sortie" ; sans lui, elle reste en mémoire.
+    """
+    enregistrement = {"fichier": str(chemin)}
+    start = time.perf_counter()
+    try:
+        algorithme, parametres = charger_instance(chemin)
+        enregistrement["algorithme"] = algorithme
+        if algorithme == "distances" and sortie is not None:
+            parametres.setdefault("sortie", str(fichier_matrice(sortie, chemin)))
+        resultat = SOLVEURS[algorithme](**parametres)
+        # Un memmap (matrice des distances) reste sur disque : seul son fichier est transmis
+        enregistrement["resultat"] = {cle: str(valeur.filename) if isinstance(valeur, np.memmap) else valeur
+                                      for cle, valeur in resultat.items()}
+    except Exception as e:
+        enregistrement["erreur"] = f"{type(e).__name__}: {e}"
+        enregistrement["trace"] = traceback.format_exc()
+    enregistrement["duree"] = time.perf_counter() - start
+    return enregistrement
+
+def _vers_json(objet):
+    """Conversion des types NumPy pour json.dumps."""
+    if isinstance(objet, np.ndarray):
+        return objet.tolist()
+    if isinstance(objet, np.generic):
+        return objet.item()
+    raise TypeError(f"Type non sérialisable : {type(objet).__name__}")
+
+def lister_instances(dossier):
+    """Liste triée des fichiers d'instance d'un dossier."""
+    return sorted(p for p in Path(dossier).iterdir() if p.suffix in EXTENSIONS)
+
+def traiter_dossier(dossier, sortie, processus=None):
+    """Résout toutes les instances d'un dossier sur un pool de processus.
+
+    Les résultats sont écrits en JSON lines dans `sortie`, dans l'ordre des
+    fichiers. Retourne le nombre d'instances en erreur.
+    """
+    fichiers = lister_instances(dossier)
+    erreurs = 0
+    with open(sortie, "w", encoding="utf-8") as f, ProcessPoolExecutor(max_workers=processus) as pool:
+        for enregistrement in pool.map(functools.partial(resoudre_fichier, sortie=sortie), fichiers):
+            erreurs += "erreur" in enregistrement
+            f.write(json.dumps(enregistrement, default=_vers_json, ensure_ascii=False) + "\n")
+            f.flush()
+    return erreurs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Résolution par lots des instances d'un dossier.")
+    parser.add_argument("dossier", help="dossier contenant les fichiers .json / .npz / .max / .npy")
+    parser.add_argument("--sortie", default="resultats.jsonl", help="fichier JSON lines de sortie")
+    parser.add_argument("--processus", type=int, default=os.cpu_count(), help="nombre de processus")
+    args = parser.parse_args(argv)
+
+    erreurs = traiter_dossier(args.dossier, args.sortie, args.processus)
+    print(f"{len(lister_instances(args.dossier))} instances traitées, {erreurs} en erreur -> {args.sortie}")
+    return 1 if erreurs else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
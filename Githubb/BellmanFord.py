@@ -1,33 +1,93 @@
-import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
-import random
-from tkinter import simpledialog, messagebox, Toplevel
+from tkinter import simpledialog, Toplevel
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # Pour intégrer matplotlib dans Tkinter
+from Dijkstra import reconstruire_chemin
+from Rendu import dessiner_graphe
+from Generateurs import gnp
+from Graphe import Graphe
+from Cache import avec_cache
 
 def generate_weighted_digraph(gui):
-    """Génère un graphe pondéré dirigé avec des sommets nommés x0 à xN."""
+    """Génère un Graphe pondéré dirigé avec des sommets nommés x0 à xN."""
     num_vertices = simpledialog.askinteger("Entrée", "Entrez le nombre de sommets :", parent=gui, minvalue=1)
     if num_vertices is None:  # Si l'utilisateur annule
         return None
+    densite = simpledialog.askfloat("Entrée", "Entrez la densité des arêtes (0 à 1, 1 = graphe complet) :",
+                                    parent=gui, minvalue=0.0, maxvalue=1.0, initialvalue=1.0)
+    if densite is None:
+        return None
 
-    graph = nx.DiGraph()
+    # Arcs xi -> xj (i < j) avec des poids aléatoires entre 1 et 100
     vertices = [f"x{i}" for i in range(num_vertices)]
-    graph.add_nodes_from(vertices)
+    origines, extremites, poids = gnp(num_vertices, densite)
+    return Graphe.depuis_aretes(num_vertices, origines, extremites, poids, noms=vertices, oriente=True)
 
-    # Ajout des arêtes dirigées avec des poids aléatoires entre 1 et 100
-    for i in range(num_vertices):
-        for j in range(i + 1, num_vertices):
-            weight = random.randint(1, 100)
-            graph.add_edge(vertices[i], vertices[j], weight=weight)
+def bellman_ford_csr(adjacence, source, progression=None):
+    """Bellman-Ford vectorisé en une seule passe : distances, prédécesseurs et cycle négatif.
 
-    return graph
+    Chaque tour relâche d'un coup (np.minimum.at) tous les arcs sortant des sommets
+    dont la distance a changé au tour précédent, à la manière de SPFA. Le calcul
+    s'arrête dès qu'un tour ne modifie plus rien ; un changement au n-ième tour
+    signale un cycle de poids négatif accessible depuis la source.
+    `progression` est appelé à chaque tour.
+    """
+    debut, tete, poids = adjacence
+    n = len(debut) - 1
+    degre = np.diff(debut)
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int64)
+    dist[source] = 0.0
+    actifs = np.array([source])
 
-def bellman_ford(gui, output_label):
-    """Fonction principale pour exécuter l'algorithme de Bellman-Ford via l'interface graphique."""
+    for tour in range(n):
+        if progression is not None:
+            progression(tours=tour, actifs=len(actifs))
+        # Arcs sortant des sommets actifs
+        longueurs = degre[actifs]
+        total = int(longueurs.sum())
+        if total == 0:
+            return dist, pred, False
+        decalage = np.repeat(debut[actifs] - (np.cumsum(longueurs) - longueurs), longueurs)
+        arcs = np.arange(total) + decalage
+        u = np.repeat(actifs, longueurs)
+        v = tete[arcs]
+        candidat = dist[u] + poids[arcs]
+
+        nouvelle = dist.copy()
+        np.minimum.at(nouvelle, v, candidat)
+        ameliore = nouvelle < dist
+        if not ameliore.any():
+            return dist, pred, False
+
+        gagnant = ameliore[v] & (candidat == nouvelle[v])
+        pred[v[gagnant]] = u[gagnant]
+        dist = nouvelle
+        actifs = np.flatnonzero(ameliore)
+
+    return dist, pred, True
+
+@avec_cache("bellman_ford")
+def solve_bellman_ford(num_vertices, origines, extremites, poids, source, cible=None, progression=None):
+    """Plus courts chemins depuis `source` sur un graphe orienté, sans interface graphique.
+
+    Retourne {"distances", "predecesseurs", "cycle_negatif"} et, si `cible` est
+    donnée, la "distance" et le "chemin" (None si inaccessible) jusqu'à elle.
+    """
+    graphe = Graphe.depuis_aretes(num_vertices, origines, extremites, poids, oriente=True)
+    dist, pred, cycle_negatif = bellman_ford_csr(graphe.adjacence, int(source), progression)
+    resultat = {"distances": dist, "predecesseurs": pred, "cycle_negatif": bool(cycle_negatif)}
+    if cible is not None:
+        resultat["distance"] = float(dist[cible])
+        resultat["chemin"] = None if cycle_negatif else reconstruire_chemin(pred, int(source), int(cible))
+    return resultat
+
+def preparer_bellman_ford(gui, output_label):
+    """Demande le graphe et les sommets ; retourne (instance, contexte) ou None si l'action est annulée."""
     graph = generate_weighted_digraph(gui)
     if graph is None:
         output_label.config(text="Action annulée par l'utilisateur.")
-        return
+        return None
 
     # Demande des sommets de départ et d'arrivée
     start_vertex = simpledialog.askstring("Entrée", "Entrez le sommet de départ (ex: x0) :", parent=gui)
@@ -35,46 +95,64 @@ def bellman_ford(gui, output_label):
 
     if start_vertex is None or end_vertex is None:
         output_label.config(text="Action annulée par l'utilisateur.")
-        return
+        return None
 
     # Vérifie si les sommets existent dans le graphe
     if start_vertex not in graph or end_vertex not in graph:
         output_label.config(text="L'un des sommets n'existe pas dans le graphe.")
+        return None
+
+    origines, extremites, poids = graph.aretes()
+    instance = {"num_vertices": graph.nombre_sommets, "origines": origines, "extremites": extremites,
+                "poids": poids, "source": graph.indice(start_vertex), "cible": graph.indice(end_vertex)}
+    contexte = {"graph": graph, "start_vertex": start_vertex, "end_vertex": end_vertex}
+    return instance, contexte
+
+def afficher_bellman_ford(gui, output_label, contexte, resultat):
+    """Affiche le plus court chemin calculé par `solve_bellman_ford`."""
+    graph = contexte["graph"]
+    start_vertex, end_vertex = contexte["start_vertex"], contexte["end_vertex"]
+
+    if resultat["cycle_negatif"]:
+        output_label.config(text="Le graphe contient un cycle de poids négatif.")
         return
 
-    try:
-        # Calcul du plus court chemin avec Bellman-Ford
-        length = nx.single_source_bellman_ford_path_length(graph, start_vertex)
-        path = nx.single_source_bellman_ford_path(graph, start_vertex)
-
-        if end_vertex in path:
-            output = f"Distance minimale de {start_vertex} à {end_vertex} : {length[end_vertex]}\n"
-            output += f"Chemin le plus court : {path[end_vertex]}"
-            output_label.config(text=output)
-
-            # Créer une nouvelle fenêtre pour afficher le graphe
-            graph_window = Toplevel(gui)
-            graph_window.title("Graphe avec chemin le plus court (Bellman-Ford)")
-            graph_window.geometry("800x800")
-
-            # Dessiner le graphe avec les couleurs des nœuds et des arêtes
-            pos = nx.spring_layout(graph)
-            fig, ax = plt.subplots(figsize=(8, 8))
-            nx.draw(graph, pos, with_labels=True, node_color="lightblue", edge_color="gray", ax=ax)
-            nx.draw_networkx_nodes(graph, pos, nodelist=path[end_vertex], node_color="red", ax=ax)
-            path_edges = [(path[end_vertex][i], path[end_vertex][i + 1]) for i in range(len(path[end_vertex]) - 1)]
-            nx.draw_networkx_edges(graph, pos, edgelist=path_edges, edge_color="blue", width=2, ax=ax)
-            nx.draw_networkx_edge_labels(graph, pos, edge_labels={(u, v): d['weight'] for u, v, d in graph.edges(data=True)}, ax=ax)
-            plt.title("Graphe avec chemin le plus court (Bellman-Ford)")
-
-            # Intégrer le graphe dans la nouvelle fenêtre avec FigureCanvasTkAgg
-            canvas = FigureCanvasTkAgg(fig, master=graph_window)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill="both", expand=True)
-
-        else:
-            output_label.config(text=f"Aucun chemin entre {start_vertex} et {end_vertex}")
-    except nx.NetworkXNoPath:
+    if resultat["chemin"] is None:
         output_label.config(text=f"Aucun chemin entre {start_vertex} et {end_vertex}")
-    except nx.NetworkXUnbounded:
-        output_label.config(text="Le graphe contient un cycle de poids négatif.")
\ No newline at end of file
+        return
+
+    length = resultat["distance"]
+    length = int(length) if length.is_integer() else length
+    path = [graph.nom(i) for i in resultat["chemin"]]
+    output = f"Distance minimale de {start_vertex} à {end_vertex} : {length}\n"
+    output += f"Chemin le plus court : {path}"
+    output_label.config(text=output)
+
+    # Créer une nouvelle fenêtre pour afficher le graphe
+    graph_window = Toplevel(gui)
+    graph_window.title("Graphe avec chemin le plus court (Bellman-Ford)")
+    graph_window.geometry("800x800")
+
+    # Dessiner le graphe avec les couleurs des nœuds et des arêtes
+    fig, ax = plt.subplots(figsize=(8, 8))
+    graph = graph.to_networkx()
+    on_path = set(path)
+    node_colors = ["red" if node in on_path else "lightblue" for node in graph.nodes()]
+    path_edges = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
+    dessiner_graphe(graph, ax, aretes_importantes=path_edges,
+                    etiquettes={(u, v): d['weight'] for u, v, d in graph.edges(data=True)},
+                    node_color=node_colors, couleur_importante="blue", couleur_fond="gray", node_size=300)
+    plt.title("Graphe avec chemin le plus court (Bellman-Ford)")
+
+    # Intégrer le graphe dans la nouvelle fenêtre avec FigureCanvasTkAgg
+    canvas = FigureCanvasTkAgg(fig, master=graph_window)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill="both", expand=True)
+
+def bellman_ford(gui, output_label):
+    """Fonction principale pour exécuter l'algorithme de Bellman-Ford via l'interface graphique."""
+    preparation = preparer_bellman_ford(gui, output_label)
+    if preparation is None:
+        return
+    instance, contexte = preparation
+    afficher_bellman_ford(gui, output_label, contexte, solve_bellman_ford(**instance))
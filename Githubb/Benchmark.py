@@ -0,0 +1,222 @@
+"""Mesure de la montée en charge de chaque algorithme.
+
+Génère des instances aléatoires reproductibles (graine fixe) sur une série de
+tailles, mesure le temps, le pic mémoire et des compteurs propres à chaque
+algorithme, puis enregistre les mesures en JSON. Exemples :
+
+    python Benchmark.py --sortie reference.json
+    python Benchmark.py --comparer reference.json --tolerance 1.3
+"""
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from WelshPowell import solve_welsh_powell
+from Kruskal import solve_kruskal
+from PotentielMetra import solve_potentiel_metra
+from BellmanFord import solve_bellman_ford
+from Dijkstra import solve_dijkstra
+from FordFulkerson import solve_flot_maximal
+from SteppingStone import nord_ouest, moindre_cout, simplexe_transport
+from Generateurs import gnm
+
+GRAINE = 12345
+
+# Tailles balayées par module (nombre de sommets, de tâches ou d'usines)
+TAILLES = {
+    "welsh_powell": [100, 1000, 10000],
+    "kruskal": [100, 1000, 10000],
+    "boruvka": [1000, 10000, 100000],
+    "potentiel_metra": [100, 1000, 10000],
+    "bellman_ford": [100, 1000, 10000],
+    "dijkstra": [100, 1000, 10000],
+    "flot_maximal": [100, 1000, 10000],
+    "nord_ouest": [10, 100, 1000],
+    "moindre_cout": [10, 100, 1000],
+    "stepping_stone": [10, 30, 100],
+}
+
+def _aretes(rng, n, degre_moyen=4, oriente=False):
+    """Graphe aléatoire G(n, m) sans boucles : tableaux (origines, extremites, poids)."""
+    return gnm(n, degre_moyen * n // (1 if oriente else 2), rng, oriente)
+
+def _transport(rng, n):
+    """Instance de transport carrée équilibrée n x n."""
+    couts = rng.integers(1, 20, (n, n))
+    capacites = rng.integers(10, 50, n)
+    demandes = rng.integers(10, 50, n)
+    ecart = capacites.sum() - demandes.sum()
+    if ecart > 0:
+        demandes[-1] += ecart
+    else:
+        capacites[-1] -= ecart
+    return couts, capacites, demandes
+
+def _taches(rng, n):
+    """Table de tâches au format de PotentielMetra (au plus deux antériorités)."""
+    tasks = {}
+    for i in range(1, n + 1):
+        k = int(rng.integers(0, min(2, i - 1) + 1))
+        predecessors = rng.choice(i - 1, size=k, replace=False) + 1 if k else []
+        tasks[f"T{i}"] = {"duration": int(rng.integers(1, 11)), "predecessors": [f"T{p}" for p in predecessors]}
+    return tasks
+
+# Chaque cas construit son instance et retourne (calcul, compteurs) : la fonction
+# à chronométrer et celle qui extrait les compteurs de son résultat.
+
+def cas_welsh_powell(rng, n):
+    origines, extremites, _ = _aretes(rng, n)
+    return (lambda: solve_welsh_powell(n, origines, extremites, cache=False),
+            lambda r: {"aretes": len(origines), "couleurs": r["nombre_chromatique"]})
+
+def cas_kruskal(rng, n):
+    origines, extremites, poids = _aretes(rng, n)
+    return (lambda: solve_kruskal(n, origines, extremites, poids, cache=False),
+            lambda r: {"aretes": len(origines), "aretes_arbre": len(r["mst_edges"]), "cout": r["total_cost"]})
+
+def cas_boruvka(rng, n):
+    origines, extremites, poids = _aretes(rng, n)
+    return (lambda: solve_kruskal(n, origines, extremites, poids, methode="boruvka", cache=False),
+            lambda r: {"aretes": len(origines), "aretes_arbre": len(r["mst_edges"]), "cout": r["total_cost"]})
+
+def cas_potentiel_metra(rng, n):
+    tasks = _taches(rng, n)
+    return (lambda: solve_potentiel_metra(tasks, cache=False),
+            lambda r: {"duree_projet": r["total_duration"], "taches_critiques": len(r["critical_path"])})
+
+def cas_bellman_ford(rng, n):
+    origines, extremites, poids = _aretes(rng, n, oriente=True)
+    return (lambda: solve_bellman_ford(n, origines, extremites, poids, 0, cache=False),
+            lambda r: {"aretes": len(origines), "accessibles": int(np.isfinite(r["distances"]).sum())})
+
+def cas_dijkstra(rng, n):
+    origines, extremites, poids = _aretes(rng, n)
+    requetes = rng.integers(0, n, (10, 2)).tolist()
+    return (lambda: solve_dijkstra(n, origines, extremites, poids, requetes, cache=False),
+            lambda r: {"aretes": len(origines), "requetes": len(requetes),
+                       "chemins": sum(q["chemin"] is not None for q in r["resultats"])})
+
+def cas_flot_maximal(rng, n):
+    origines, extremites, capacites = _aretes(rng, n, oriente=True)
+    return (lambda: solve_flot_maximal(n, origines, extremites, capacites, 0, n - 1, cache=False),
+            lambda r: {"aretes": len(origines), "flot": r["max_flow"], "aretes_coupe": len(r["aretes_coupe"])})
+
+def cas_nord_ouest(rng, n):
+    _, capacites, demandes = _transport(rng, n)
+    return (lambda: nord_ouest(capacites.copy(), demandes.copy()),
+            lambda allocation: {"cases_allouees": int(np.count_nonzero(allocation))})
+
+def cas_moindre_cout(rng, n):
+    couts, capacites, demandes = _transport(rng, n)
+    return (lambda: moindre_cout(couts, capacites.copy(), demandes.copy()),
+            lambda allocation: {"cases_allouees": int(np.count_nonzero(allocation)),
+                                "cout": int(np.sum(couts * allocation))})
+
+def cas_stepping_stone(rng, n):
+    couts, capacites, demandes = _transport(rng, n)
+    depart = moindre_cout(couts, capacites.copy(), demandes.copy())
+    return (lambda: simplexe_transport(couts, depart),
+            lambda r: {"pivots": r[2], "cout": int(np.sum(couts * r[0]))})
+
+CAS = {
+    "welsh_powell": cas_welsh_powell,
+    "kruskal": cas_kruskal,
+    "boruvka": cas_boruvka,
+    "potentiel_metra": cas_potentiel_metra,
+    "bellman_ford": cas_bellman_ford,
+    "dijkstra": cas_dijkstra,
+    "flot_maximal": cas_flot_maximal,
+    "nord_ouest": cas_nord_ouest,
+    "moindre_cout": cas_moindre_cout,
+    "stepping_stone": cas_stepping_stone,
+}
+
+def mesurer(module, taille, repetitions=3):
+    """Mesure un cas : meilleur temps sur `repetitions`, pic mémoire et compteurs."""
+    calcul, compteurs = CAS[module](np.random.default_rng([GRAINE, taille]), taille)
+
+    temps = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        resultat = calcul()
+        temps.append(time.perf_counter() - start)
+
+    # Le suivi mémoire ralentit le calcul : passe séparée
+    tracemalloc.start()
+    calcul()
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"module": module, "taille": taille, "temps": min(temps),
+            "memoire_pic": pic, "compteurs": compteurs(resultat)}
+
+def executer(modules=None, echelle=1.0, repetitions=3):
+    """Exécute le balayage de tailles pour les modules demandés (tous par défaut)."""
+    mesures = []
+    for module in modules or CAS:
+        for taille in TAILLES[module]:
+            taille = max(2, int(taille * echelle))
+            mesure = mesurer(module, taille, repetitions)
+            print(f"{module:16s} n={taille:<7d} {mesure['temps']:9.4f} s  "
+                  f"{mesure['memoire_pic'] / 2**20:8.2f} Mo  {mesure['compteurs']}")
+            mesures.append(mesure)
+    return {
+        "meta": {"python": platform.python_version(), "numpy": np.__version__,
+                 "machine": platform.machine(), "date": time.strftime("%Y-%m-%d %H:%M:%S")},
+        "mesures": mesures,
+    }
+
+def comparer(mesures, reference, tolerance=1.3, seuil_temps=1e-3):
+    """Compare des mesures à une référence ; retourne la liste des régressions.
+
+    Une régression est un temps (au-delà de `seuil_temps` secondes d'écart) ou
+    un pic mémoire supérieur à `tolerance` fois la référence.
+    """
+    index = {(m["module"], m["taille"]): m for m in reference["mesures"]}
+    regressions = []
+    for mesure in mesures["mesures"]:
+        base = index.get((mesure["module"], mesure["taille"]))
+        if base is None:
+            continue
+        if mesure["temps"] > tolerance * base["temps"] and mesure["temps"] - base["temps"] > seuil_temps:
+            regressions.append((mesure["module"], mesure["taille"], "temps", base["temps"], mesure["temps"]))
+        if mesure["memoire_pic"] > tolerance * base["memoire_pic"]:
+            regressions.append((mesure["module"], mesure["taille"], "memoire_pic",
+                                base["memoire_pic"], mesure["memoire_pic"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure de la montée en charge des algorithmes.")
+    parser.add_argument("modules", nargs="*", help="modules à mesurer parmi : " + ", ".join(CAS))
+    parser.add_argument("--echelle", type=float, default=1.0, help="facteur appliqué aux tailles")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--sortie", help="fichier JSON où enregistrer les mesures")
+    parser.add_argument("--comparer", help="fichier JSON de référence")
+    parser.add_argument("--tolerance", type=float, default=1.3, help="rapport toléré avant de signaler une régression")
+    args = parser.parse_args(argv)
+    inconnus = set(args.modules) - set(CAS)
+    if inconnus:
+        parser.error(f"modules inconnus : {', '.join(sorted(inconnus))}")
+
+    mesures = executer(args.modules, args.echelle, args.repetitions)
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump(mesures, f, indent=2)
+
+    if args.comparer:
+        with open(args.comparer, encoding="utf-8") as f:
+            reference = json.load(f)
+        regressions = comparer(mesures, reference, args.tolerance)
+        for module, taille, critere, avant, apres in regressions:
+            print(f"RÉGRESSION {module} n={taille} {critere} : {avant:.4g} -> {apres:.4g} ({apres / avant:.2f}x)")
+        if regressions:
+            return 1
+        print("Aucune régression par rapport à la référence.")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
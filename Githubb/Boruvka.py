@@ -0,0 +1,152 @@
+"""Arbre couvrant minimal de Borůvka, réparti sur un pool de processus.
+
+À chaque tour, chaque composante choisit son arête sortante la plus légère et
+toutes ces arêtes entrent dans l'arbre à la fois ; le nombre de composantes
+est au moins divisé par deux, d'où au plus log2(n) tours. Le choix des arêtes
+est vectorisé : les arêtes sont découpées en une tranche par processus, chaque
+processus calcule par np.minimum.at la meilleure arête de chaque composante sur
+sa tranche (une ligne d'un tableau tranches x sommets), puis le processus
+principal prend le minimum de ces lignes et contracte les composantes par
+sauts de pointeurs.
+
+Les arêtes (origines, extremites, poids) sont placées une fois en mémoire
+partagée (voir MemoirePartagee.py), ainsi que l'étiquette de composante de
+chaque sommet, que seul le processus principal réécrit entre deux tours, et
+les minimums des tranches.
+
+Les égalités de poids sont départagées par l'indice de l'arête : l'arbre
+obtenu est exactement celui de kruskal_aretes (tri stable), et les arêtes sont
+rendues dans le même ordre de sélection.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from MemoirePartagee import TableauxPartages, initialiser, tableaux_partages
+
+ARETES_MIN_TACHE = 1 << 16     # En dessous, une tranche ne vaut pas un processus de plus
+INDICE_MAX = np.iinfo(np.int64).max
+
+def _infini(dtype):
+    return np.inf if np.issubdtype(dtype, np.floating) else np.iinfo(dtype).max
+
+def minimums_aretes(origines, extremites, poids, composante, aretes, meilleur_poids, meilleur_indice):
+    """Arête la plus légère sortant de chaque composante, parmi les arêtes d'indices `aretes`.
+
+    Écrit dans `meilleur_poids` et `meilleur_indice` (une case par sommet) le
+    poids et l'indice de l'arête choisie par chaque composante (à poids égal,
+    l'indice le plus petit ; INDICE_MAX sans arête sortante). Retourne les
+    arêtes de `aretes` qui relient encore deux composantes : les autres ne le
+    feront plus jamais, seules les sortantes sont à examiner aux tours suivants.
+    """
+    cu, cv = composante[origines[aretes]], composante[extremites[aretes]]
+    garde = cu != cv
+    sortantes, cu, cv = aretes[garde], cu[garde], cv[garde]
+    w = poids[sortantes]
+    meilleur_poids.fill(_infini(poids.dtype))
+    np.minimum.at(meilleur_poids, cu, w)
+    np.minimum.at(meilleur_poids, cv, w)
+    meilleur_indice.fill(INDICE_MAX)
+    for c in (cu, cv):
+        egales = w == meilleur_poids[c]
+        np.minimum.at(meilleur_indice, c[egales], sortantes[egales])
+    return sortantes
+
+def _fusionner(meilleurs_poids, meilleurs_indices):
+    """Minimum (poids, indice) par composante sur les lignes des tranches : (composantes, indices)."""
+    meilleur_poids = meilleurs_poids.min(axis=0)
+    meilleur_indice = np.where(meilleurs_poids == meilleur_poids, meilleurs_indices, INDICE_MAX).min(axis=0)
+    composantes = np.flatnonzero(meilleur_indice != INDICE_MAX)
+    return composantes, meilleur_indice[composantes]
+
+def _minimums_tranche(j, e0):
+    """Tâche d'un processus : minimums de la tranche j, lue et compactée en mémoire partagée.
+
+    La tranche j commence à l'indice e0 du tableau "aretes" et en occupe
+    longueurs[j] cases ; ses minimums vont dans la ligne j des tableaux
+    "meilleurs_*". Seule cette tâche y écrit pendant le tour.
+    """
+    tableaux = tableaux_partages()
+    aretes, longueurs = tableaux["aretes"], tableaux["longueurs"]
+    sortantes = minimums_aretes(tableaux["origines"], tableaux["extremites"], tableaux["poids"],
+                                tableaux["composante"], aretes[e0:e0 + longueurs[j]],
+                                tableaux["meilleurs_poids"][j], tableaux["meilleurs_indices"][j])
+    aretes[e0:e0 + len(sortantes)] = sortantes
+    longueurs[j] = len(sortantes)
+
+def contracter(composante, origines, extremites, composantes, indices):
+    """Fusionne chaque composante avec celle que rejoint son arête choisie ; réécrit `composante`.
+
+    Retourne les arêtes ajoutées à l'arbre (une arête choisie par ses deux
+    extrémités n'est comptée qu'une fois).
+    """
+    n = len(composante)
+    cu, cv = composante[origines[indices]], composante[extremites[indices]]
+    parent = np.arange(n)
+    parent[composantes] = np.where(cu == composantes, cv, cu)
+    # Deux composantes qui se choisissent mutuellement (forcément par la même
+    # arête, les égalités étant départagées) : la plus petite devient racine
+    mutuelles = (parent[parent[composantes]] == composantes) & (composantes < parent[composantes])
+    parent[composantes[mutuelles]] = composantes[mutuelles]
+    while True:
+        suivant = parent[parent]
+        if np.array_equal(suivant, parent):
+            break
+        parent = suivant
+    composante[:] = parent[composante]
+    return indices[~mutuelles]
+
+def boruvka_aretes(num_vertices, origines, extremites, poids, processus=None, progression=None):
+    """Borůvka : indices des arêtes de la forêt couvrante minimale (ordre de Kruskal) et coût total.
+
+    Avec `processus` > 1 (1 par défaut : un pool n'est créé qu'à la demande),
+    les arêtes sont réparties en une tranche par processus. `progression` est
+    appelé après chaque tour.
+    """
+    origines, extremites = np.asarray(origines, dtype=np.int64), np.asarray(extremites, dtype=np.int64)
+    poids = np.asarray(poids)
+    m = len(poids)
+    nombre = max(1, min(processus or 1, m // ARETES_MIN_TACHE))
+    pas = max(1, -(-m // nombre))
+    debuts = list(range(0, max(m, 1), pas))
+    minimums = {"meilleurs_poids": np.empty((len(debuts), num_vertices), dtype=poids.dtype),
+                "meilleurs_indices": np.empty((len(debuts), num_vertices), dtype=np.int64)}
+    retenues = [np.zeros(0, dtype=np.int64)]
+
+    def tours(calculer, composante, meilleurs_poids, meilleurs_indices):
+        tour = 0
+        while True:
+            calculer()
+            composantes, indices = _fusionner(meilleurs_poids, meilleurs_indices)
+            if len(composantes) == 0:
+                break
+            retenues.append(contracter(composante, origines, extremites, composantes, indices))
+            tour += 1
+            if progression is not None:
+                progression(tours=tour, aretes_retenues=sum(len(r) for r in retenues))
+
+    if len(debuts) == 1:
+        composante = np.arange(num_vertices)
+        aretes = np.arange(m)
+
+        def calculer():
+            nonlocal aretes
+            aretes = minimums_aretes(origines, extremites, poids, composante, aretes,
+                                     minimums["meilleurs_poids"][0], minimums["meilleurs_indices"][0])
+
+        tours(calculer, composante, minimums["meilleurs_poids"], minimums["meilleurs_indices"])
+    else:
+        longueurs = np.diff(np.r_[debuts, m])
+        with TableauxPartages(origines=origines, extremites=extremites, poids=poids,
+                              composante=np.arange(num_vertices), aretes=np.arange(m),
+                              longueurs=longueurs, **minimums) as partage, \
+                ProcessPoolExecutor(max_workers=len(debuts), initializer=initialiser,
+                                    initargs=(partage.descripteurs, ("aretes", "longueurs", *minimums))) as pool:
+            tableaux = partage.tableaux
+            tours(lambda: list(pool.map(_minimums_tranche, range(len(debuts)), debuts)), tableaux["composante"],
+                  tableaux["meilleurs_poids"], tableaux["meilleurs_indices"])
+            del tableaux
+
+    retenues = np.concatenate(retenues)
+    retenues = retenues[np.lexsort((retenues, poids[retenues]))]
+    return retenues, poids[retenues].sum()
@@ -0,0 +1,222 @@
+"""Cache des résultats, adressé par le contenu des instances.
+
+La clé d'un calcul est une empreinte blake2b de l'algorithme et de tous ses
+paramètres sous forme canonique : les tableaux sont hachés par blocs après
+conversion en int64 / float64 (un même graphe en int32 ou en int64 donne la même
+clé, un memmap n'est jamais chargé en entier), les autres paramètres via leur
+représentation JSON triée. Deux niveaux :
+
+    mémoire   dictionnaire LRU des derniers résultats, par processus
+    disque    un fichier pickle par résultat ; au-delà de `taille_disque`
+              octets, les fichiers les moins récemment utilisés sont supprimés
+
+Les fonctions solve_* décorées par `avec_cache` acceptent un paramètre `cache`
+(None : cache par défaut, False : pas de cache, ou un CacheResultats) et
+ajoutent au résultat la clé "cache" valant "hit", "miss" ou "off" (calcul fait
+hors cache : cache=False, résultat non reproductible ou paramètre qui ne se
+hache pas). Le cache par défaut n'a de niveau disque que si la variable
+d'environnement PROJET_RO_CACHE donne son dossier : les fichiers sont relus
+par pickle, seul un dossier choisi par l'utilisateur est lu.
+"""
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+VERSION = 1                  # À incrémenter si le format des résultats change
+TAILLE_BLOC = 1 << 24        # Octets hachés par bloc
+ENTREES_MEMOIRE = 32
+TAILLE_DISQUE = 1 << 29      # 512 Mo
+EXCLUS = ("progression", "cache")
+
+def _type_canonique(dtype):
+    if dtype.kind == "b":
+        return np.dtype(np.bool_)
+    if dtype.kind in "iu":
+        return np.dtype("<i8")
+    if dtype.kind == "f":
+        return np.dtype("<f8")
+    return None
+
+def _hacher_tableau(empreinte, tableau):
+    canonique = _type_canonique(tableau.dtype)
+    if canonique is None:
+        _hacher_valeur(empreinte, tableau.tolist())
+        return
+    empreinte.update(f"tableau{canonique.str}{tableau.shape}".encode())
+    if tableau.ndim == 0:
+        empreinte.update(np.asarray(tableau, dtype=canonique).tobytes())
+        return
+    pas = max(1, TAILLE_BLOC // max(1, tableau[:1].size * canonique.itemsize))
+    for debut in range(0, len(tableau), pas):
+        bloc = np.ascontiguousarray(tableau[debut:debut + pas], dtype=canonique)
+        empreinte.update(memoryview(bloc).cast("B"))
+
+def _json(objet):
+    if isinstance(objet, np.generic):
+        return objet.item()
+    if isinstance(objet, (set, frozenset)):
+        return sorted(objet, key=repr)
+    raise TypeError(f"Paramètre non hachable pour le cache : {type(objet).__name__}")
+
+def _hacher_valeur(empreinte, valeur):
+    empreinte.update(json.dumps(valeur, sort_keys=True, default=_json, ensure_ascii=False).encode("utf-8"))
+
+def cle_instance(algorithme, parametres):
+    """Empreinte hexadécimale (blake2b) de l'algorithme et de ses paramètres."""
+    empreinte = hashlib.blake2b(digest_size=20)
+    _hacher_valeur(empreinte, [VERSION, algorithme])
+    for nom in sorted(parametres):
+        if nom in EXCLUS:
+            continue
+        empreinte.update(f"\0{nom}\0".encode())
+        valeur = parametres[nom]
+        if isinstance(valeur, np.ndarray):
+            _hacher_tableau(empreinte, valeur)
+        else:
+            _hacher_valeur(empreinte, valeur)
+    return empreinte.hexdigest()
+
+class CacheResultats:
+    """Cache à deux niveaux : LRU en mémoire et fichiers sur disque (dossier=None : mémoire seule)."""
+
+    def __init__(self, dossier=None, entrees_memoire=ENTREES_MEMOIRE, taille_disque=TAILLE_DISQUE):
+        self.dossier = Path(dossier) if dossier else None
+        self.entrees_memoire = entrees_memoire
+        self.taille_disque = taille_disque
+        self.succes = 0
+        self.echecs = 0
+        self._memoire = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def _fichier(self, cle):
+        return self.dossier / f"{cle}.pkl"
+
+    def lire(self, cle):
+        """Résultat associé à `cle` (copie indépendante), None s'il est absent."""
+        with self._verrou:
+            if cle in self._memoire:
+                self._memoire.move_to_end(cle)
+                self.succes += 1
+                return copy.deepcopy(self._memoire[cle])
+        resultat = self._lire_disque(cle)
+        with self._verrou:
+            if resultat is None:
+                self.echecs += 1
+                return None
+            self.succes += 1
+            self._garder(cle, resultat)
+        return copy.deepcopy(resultat)
+
+    def _lire_disque(self, cle):
+        if self.dossier is None:
+            return None
+        fichier = self._fichier(cle)
+        try:
+            with open(fichier, "rb") as f:
+                resultat = pickle.load(f)
+            os.utime(fichier)  # Date de dernier usage, pour l'éviction
+            return resultat
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError):
+            fichier.unlink(missing_ok=True)  # Fichier tronqué ou illisible
+            return None
+
+    def _garder(self, cle, resultat):
+        self._memoire[cle] = resultat
+        self._memoire.move_to_end(cle)
+        while len(self._memoire) > self.entrees_memoire:
+            self._memoire.popitem(last=False)
+
+    def ecrire(self, cle, resultat):
+        """Enregistre un résultat dans les deux niveaux."""
+        resultat = copy.deepcopy(resultat)
+        with self._verrou:
+            self._garder(cle, resultat)
+        if self.dossier is None:
+            return
+        try:
+            self.dossier.mkdir(parents=True, exist_ok=True)
+            # Écriture dans un fichier temporaire puis renommage : un autre processus
+            # ne voit jamais de fichier à moitié écrit
+            temporaire = self.dossier / f"{cle}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporaire, "wb") as f:
+                pickle.dump(resultat, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporaire, self._fichier(cle))
+            self._evincer()
+        except OSError:
+            pass  # Le cache disque est facultatif
+
+    def _evincer(self):
+        """Supprime les fichiers les moins récemment utilisés au-delà de `taille_disque` octets."""
+        fichiers = []
+        for fichier in self.dossier.glob("*.pkl"):
+            try:
+                etat = fichier.stat()
+            except FileNotFoundError:
+                continue
+            fichiers.append((etat.st_mtime, etat.st_size, fichier))
+        total = sum(taille for _, taille, _ in fichiers)
+        for _, taille, fichier in sorted(fichiers, key=lambda f: f[0]):
+            if total <= self.taille_disque:
+                break
+            fichier.unlink(missing_ok=True)
+            total -= taille
+
+    def vider(self):
+        """Vide les deux niveaux."""
+        with self._verrou:
+            self._memoire.clear()
+        if self.dossier is not None and self.dossier.is_dir():
+            for fichier in self.dossier.glob("*.pkl"):
+                fichier.unlink(missing_ok=True)
+
+def _dossier_par_defaut():
+    return os.environ.get("PROJET_RO_CACHE") or None
+
+CACHE = CacheResultats(_dossier_par_defaut())
+
+def avec_cache(algorithme, condition=None):
+    """Décorateur des fonctions solve_* : résultat lu dans le cache si l'instance y est déjà.
+
+    Les paramètres sont complétés par leurs valeurs par défaut avant le calcul
+    de la clé : solve(g, s) et solve(g, s, methode="dinic") partagent la même
+    entrée. Les erreurs et les calculs annulés ne sont pas mis en cache.
+    `condition`, appelée avec le dictionnaire des paramètres, peut écarter du
+    cache les appels dont le résultat n'est pas reproductible (comme avec cache=False).
+    Un paramètre sans forme canonique (objet quelconque) fait de même : le
+    calcul est fait sans cache plutôt que d'échouer.
+    """
+    def decorateur(fonction):
+        signature = inspect.signature(fonction)
+
+        @functools.wraps(fonction)
+        def enveloppe(*args, cache=None, **kwargs):
+            cache = CACHE if cache is None else cache
+            if cache is False:
+                return dict(fonction(*args, **kwargs), cache="off")
+            liaison = signature.bind(*args, **kwargs)
+            liaison.apply_defaults()
+            if condition is not None and not condition(liaison.arguments):
+                return dict(fonction(*args, **kwargs), cache="off")
+            try:
+                cle = cle_instance(f"{algorithme}:{fonction.__module__}.{fonction.__qualname__}", liaison.arguments)
+            except TypeError:
+                return dict(fonction(*args, **kwargs), cache="off")
+            resultat = cache.lire(cle)
+            if resultat is not None:
+                return dict(resultat, cache="hit")
+            resultat = fonction(*args, **kwargs)
+            cache.ecrire(cle, resultat)
+            return dict(resultat, cache="miss")
+        return enveloppe
+    return decorateur
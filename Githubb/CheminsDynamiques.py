@@ -0,0 +1,208 @@
+"""Plus courts chemins dynamiques : réparation de l'arbre après des changements de poids.
+
+Un ArbreDynamique garde l'arbre des plus courts chemins depuis une source et
+les poids courants des arcs. Après un lot d'augmentations et de diminutions,
+seule la région touchée est recalculée, à la manière de Ramalingam et Reps :
+
+    augmentation d'un arc de l'arbre : le sous-arbre qu'il porte est détaché,
+        chacun de ses sommets reçoit sa meilleure distance candidate par un
+        arc entrant venant de l'extérieur du sous-arbre ;
+    diminution d'un arc u -> v : v est candidat si dist[u] + poids < dist[v] ;
+
+puis un Dijkstra part de ces seuls candidats et ne parcourt que les sommets dont
+la distance change. Le coût d'une mise à jour dépend de la taille de la région
+touchée (et des degrés de ses sommets), pas de celle du graphe. Les poids
+doivent être positifs ou nuls.
+"""
+import heapq
+
+import numpy as np
+
+from Dijkstra import reconstruire_chemin
+from Graphe import Graphe
+from Cache import avec_cache
+
+INFINI = float("inf")
+
+class ArbreDynamique:
+    """Arbre des plus courts chemins depuis `source`, mis à jour par lots de changements de poids."""
+
+    def __init__(self, graphe, source):
+        debut, tete, poids = graphe.adjacence
+        n = graphe.nombre_sommets
+        poids = np.ones(len(tete)) if poids is None else np.asarray(poids, dtype=float)
+        if len(poids) and poids.min() < 0:
+            raise ValueError("Les poids doivent être positifs ou nuls.")
+        self.oriente = graphe.oriente
+        self.source = int(source)
+        self._debut_np, self._tete_np = np.asarray(debut), np.asarray(tete)
+        self.debut, self.tete, self.poids = self._debut_np.tolist(), self._tete_np.tolist(), poids.tolist()
+        # Arcs entrants : indices des arcs triés par extrémité
+        self.origine = np.repeat(np.arange(n), np.diff(self._debut_np)).tolist()
+        entrants = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._tete_np, minlength=n), out=entrants[1:])
+        self.debut_entrant = entrants.tolist()
+        self.arcs_entrants = np.argsort(self._tete_np, kind="stable").tolist()
+
+        # Arbre : parent, arc de l'arbre, et enfants en listes chaînées
+        self.dist = [INFINI] * n
+        self.parent = [-1] * n
+        self.arc_arbre = [-1] * n
+        self._premier_enfant = [-1] * n
+        self._suivant = [-1] * n
+        self._precedent = [-1] * n
+        self.dist[self.source] = 0.0
+        self._propager([(0.0, self.source)], {})
+
+    @classmethod
+    def depuis_aretes(cls, num_vertices, origines, extremites, poids, source, oriente=False):
+        return cls(Graphe.depuis_aretes(num_vertices, origines, extremites, poids, oriente=oriente), source)
+
+    @property
+    def distances(self):
+        return np.array(self.dist)
+
+    @property
+    def predecesseurs(self):
+        return np.array(self.parent)
+
+    def chemin(self, cible):
+        """Chemin source -> cible dans l'arbre courant (None si inaccessible)."""
+        return reconstruire_chemin(self.parent, self.source, cible)
+
+    def _detacher(self, v):
+        p = self.parent[v]
+        if p < 0:
+            return
+        suivant, precedent = self._suivant[v], self._precedent[v]
+        if precedent >= 0:
+            self._suivant[precedent] = suivant
+        else:
+            self._premier_enfant[p] = suivant
+        if suivant >= 0:
+            self._precedent[suivant] = precedent
+        self.parent[v] = self.arc_arbre[v] = -1
+
+    def _attacher(self, v, k):
+        """Rattache v à l'arbre par l'arc k (origine[k] -> v)."""
+        self._detacher(v)
+        p = self.origine[k]
+        premier = self._premier_enfant[p]
+        self._suivant[v], self._precedent[v] = premier, -1
+        if premier >= 0:
+            self._precedent[premier] = v
+        self._premier_enfant[p] = v
+        self.parent[v], self.arc_arbre[v] = p, k
+
+    def _sous_arbre(self, racines):
+        """Sommets des sous-arbres portés par `racines` (parcours des listes d'enfants)."""
+        vus = set()
+        pile = list(racines)
+        while pile:
+            x = pile.pop()
+            if x in vus:
+                continue
+            vus.add(x)
+            enfant = self._premier_enfant[x]
+            while enfant >= 0:
+                pile.append(enfant)
+                enfant = self._suivant[enfant]
+        return vus
+
+    def _ameliorer(self, v, k, d, anciennes, tas):
+        if v not in anciennes:
+            anciennes[v] = self.dist[v]
+        self.dist[v] = d
+        self._attacher(v, k)
+        heapq.heappush(tas, (d, v))
+
+    def _propager(self, tas, anciennes):
+        """Dijkstra à partir des candidats du tas : seuls les sommets améliorés sont parcourus."""
+        dist, debut, tete, poids = self.dist, self.debut, self.tete, self.poids
+        while tas:
+            d, x = heapq.heappop(tas)
+            if d > dist[x]:
+                continue
+            for k in range(debut[x], debut[x + 1]):
+                v = tete[k]
+                nd = d + poids[k]
+                if nd < dist[v]:
+                    self._ameliorer(v, k, nd, anciennes, tas)
+
+    def arcs(self, u, v):
+        """Indices des arcs u -> v (et v -> u pour un graphe non orienté)."""
+        trouves = (self._debut_np[u] + np.flatnonzero(self._tete_np[self._debut_np[u]:self._debut_np[u + 1]] == v)).tolist()
+        if not self.oriente and u != v:
+            trouves += (self._debut_np[v] + np.flatnonzero(self._tete_np[self._debut_np[v]:self._debut_np[v + 1]] == u)).tolist()
+        return trouves
+
+    def mettre_a_jour(self, changements):
+        """Applique un lot de changements [(u, v, nouveau_poids), ...] et répare l'arbre.
+
+        Retourne (sommets, anciennes, nouvelles) : les sommets dont la distance a
+        changé, triés, avec leurs distances avant et après le lot.
+        """
+        racines, diminutions = [], []
+        for u, v, nouveau in changements:
+            nouveau = float(nouveau)
+            if nouveau < 0:
+                raise ValueError(f"Poids négatif pour l'arc ({u}, {v}).")
+            arcs = self.arcs(int(u), int(v))
+            if not arcs:
+                raise KeyError(f"Arc ({u}, {v}) absent du graphe.")
+            for k in arcs:
+                ancien, self.poids[k] = self.poids[k], nouveau
+                if nouveau > ancien and self.arc_arbre[self.tete[k]] == k:
+                    racines.append(self.tete[k])
+                elif nouveau < ancien:
+                    diminutions.append(k)
+
+        # Augmentations : les sous-arbres touchés sont détachés puis reçoivent
+        # leur meilleur arc entrant venant de la partie intacte de l'arbre
+        anciennes = {}
+        touches = self._sous_arbre(racines)
+        for x in touches:
+            anciennes[x] = self.dist[x]
+            self._detacher(x)
+            self.dist[x] = INFINI
+        tas = []
+        for x in touches:
+            meilleur, arc = INFINI, -1
+            for t in range(self.debut_entrant[x], self.debut_entrant[x + 1]):
+                k = self.arcs_entrants[t]
+                y = self.origine[k]
+                if y not in touches and self.dist[y] + self.poids[k] < meilleur:
+                    meilleur, arc = self.dist[y] + self.poids[k], k
+            if arc >= 0:
+                self._ameliorer(x, arc, meilleur, anciennes, tas)
+
+        # Diminutions : l'extrémité devient candidate si elle s'améliore
+        for k in diminutions:
+            v = self.tete[k]
+            d = self.dist[self.origine[k]] + self.poids[k]
+            if d < self.dist[v]:
+                self._ameliorer(v, k, d, anciennes, tas)
+
+        self._propager(tas, anciennes)
+        sommets = sorted(v for v, ancienne in anciennes.items() if self.dist[v] != ancienne)
+        return (np.array(sommets, dtype=np.int64), np.array([anciennes[v] for v in sommets], dtype=float),
+                np.array([self.dist[v] for v in sommets], dtype=float))
+
+@avec_cache("chemins_dynamiques")
+def solve_chemins_dynamiques(num_vertices, origines, extremites, poids, source, lots, oriente=False,
+                             progression=None):
+    """Distances depuis `source`, puis réparation après chaque lot de changements de poids.
+
+    `lots` est une liste de lots [(u, v, nouveau_poids), ...]. Retourne
+    {"distances_initiales", "lots": [{"sommets", "anciennes", "nouvelles"}, ...],
+    "distances"} : pour chaque lot, les sommets dont la distance a changé.
+    """
+    arbre = ArbreDynamique.depuis_aretes(num_vertices, origines, extremites, poids, source, oriente)
+    resultat = {"distances_initiales": arbre.distances, "lots": []}
+    for k, lot in enumerate(lots):
+        sommets, anciennes, nouvelles = arbre.mettre_a_jour(lot)
+        resultat["lots"].append({"sommets": sommets, "anciennes": anciennes, "nouvelles": nouvelles})
+        if progression is not None:
+            progression(lots=k + 1, total=len(lots))
+    resultat["distances"] = arbre.distances
+    return resultat
@@ -1,34 +1,131 @@
+import heapq
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
-import random
 import time
 from tkinter import simpledialog, messagebox, Toplevel, Label, ttk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # Importation pour afficher le graphe dans Tkinter
+from Rendu import dessiner_graphe
+from Generateurs import gnp
+from Graphe import Graphe
+from Cache import avec_cache
 
 def generate_weighted_graph(gui):
-    """Génère un graphe pondéré avec des sommets nommés x0 à xN."""
+    """Génère un Graphe pondéré avec des sommets nommés x0 à xN."""
     num_vertices = simpledialog.askinteger("Entrée", "Entrez le nombre de sommets :", parent=gui, minvalue=1)
     if num_vertices is None:  # Si l'utilisateur annule
         return None
+    densite = simpledialog.askfloat("Entrée", "Entrez la densité des arêtes (0 à 1, 1 = graphe complet) :",
+                                    parent=gui, minvalue=0.0, maxvalue=1.0, initialvalue=1.0)
+    if densite is None:
+        return None
 
-    G = nx.Graph()
+    # Arêtes tirées avec des pondérations aléatoires entre 1 et 100
     vertices = [f"x{i}" for i in range(num_vertices)]
-    G.add_nodes_from(vertices)
+    origines, extremites, poids = gnp(num_vertices, densite)
+    return Graphe.depuis_aretes(num_vertices, origines, extremites, poids, noms=vertices)
 
-    # Ajouter des arêtes avec des pondérations aléatoires entre 1 et 100
-    for i in range(num_vertices):
-        for j in range(i + 1, num_vertices):
-            weight = random.randint(1, 100)
-            G.add_edge(vertices[i], vertices[j], weight=weight)
+def dijkstra_csr(adjacence, source, cibles=None, progression=None):
+    """Dijkstra avec tas binaire sur une adjacence compacte.
 
-    return G
+    S'arrête dès que toutes les `cibles` sont définitivement fixées (toutes les
+    distances si `cibles` vaut None). Retourne les tableaux des distances
+    (inf si inaccessible) et des prédécesseurs (-1 pour la source et les inaccessibles).
+    `progression` est appelé tous les 10000 sommets fixés. L'adjacence peut
+    être donnée sous forme de listes, converties une fois pour des appels répétés.
+    """
+    debut, tete, poids = (t.tolist() if isinstance(t, np.ndarray) else t for t in adjacence)
+    n = len(debut) - 1
+    dist = [float('inf')] * n
+    pred = [-1] * n
+    fixe = [False] * n
+    restantes = set(cibles) if cibles is not None else None
+    nb_fixes = 0
 
-def dijkstra(gui, output_label):
-    """Fonction principale pour exécuter l'algorithme de Dijkstra via l'interface graphique."""
-    G = generate_weighted_graph(gui)
-    if G is None:
+    dist[source] = 0.0
+    tas = [(0.0, source)]
+    while tas:
+        d, u = heapq.heappop(tas)
+        if fixe[u]:
+            continue
+        fixe[u] = True
+        nb_fixes += 1
+        if progression is not None and nb_fixes % 10000 == 0:
+            progression(sommets_fixes=nb_fixes)
+        if restantes is not None:
+            restantes.discard(u)
+            if not restantes:
+                break
+        for k in range(debut[u], debut[u + 1]):
+            v = tete[k]
+            nd = d + poids[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(tas, (nd, v))
+
+    # Les sommets non fixés n'ont pas de distance définitive
+    dist = np.where(fixe, dist, np.inf)
+    pred = np.where(fixe, pred, -1)
+    return dist, pred
+
+def reconstruire_chemin(pred, source, cible):
+    """Reconstruit le chemin source -> cible à partir du tableau des prédécesseurs."""
+    if cible != source and pred[cible] < 0:
+        return None
+    chemin = [cible]
+    while chemin[-1] != source:
+        chemin.append(int(pred[chemin[-1]]))
+    chemin.reverse()
+    return chemin
+
+def dijkstra_lot(adjacence, requetes, progression=None):
+    """Répond à un lot de requêtes (source, cible).
+
+    Les requêtes partageant une source réutilisent un seul arbre des plus courts
+    chemins, calculé jusqu'à ce que toutes leurs cibles soient fixées. Retourne la
+    liste des (distance, chemin) dans l'ordre des requêtes (chemin None si aucun)
+    et les arbres {source: (dist, pred)}.
+    """
+    cibles_par_source = {}
+    for source, cible in requetes:
+        cibles_par_source.setdefault(source, set()).add(cible)
+
+    arbres = {}
+    for k, (source, cibles) in enumerate(cibles_par_source.items()):
+        arbres[source] = dijkstra_csr(adjacence, source, cibles, progression)
+        if progression is not None:
+            progression(sources=k + 1, total=len(cibles_par_source))
+
+    resultats = []
+    for source, cible in requetes:
+        dist, pred = arbres[source]
+        resultats.append((dist[cible], reconstruire_chemin(pred, source, cible)))
+    return resultats, arbres
+
+@avec_cache("dijkstra")
+def solve_dijkstra(num_vertices, origines, extremites, poids, requetes, oriente=False, progression=None):
+    """Résout un lot de requêtes (source, cible) de plus court chemin, sans interface graphique.
+
+    Retourne {"resultats": [{"source", "cible", "distance", "chemin"}, ...], "duree": secondes} ;
+    la distance vaut inf et le chemin None quand la cible est inaccessible.
+    """
+    start_time = time.perf_counter()
+    graphe = Graphe.depuis_aretes(num_vertices, origines, extremites, poids, oriente=oriente)
+    requetes = [(int(source), int(cible)) for source, cible in requetes]
+    resultats, _ = dijkstra_lot(graphe.adjacence, requetes, progression)
+    return {
+        "resultats": [{"source": source, "cible": cible, "distance": float(distance), "chemin": chemin}
+                      for (source, cible), (distance, chemin) in zip(requetes, resultats)],
+        "duree": time.perf_counter() - start_time,
+    }
+
+def preparer_dijkstra(gui, output_label):
+    """Demande le graphe et les sommets ; retourne (instance, contexte) ou None si l'action est annulée."""
+    graphe = generate_weighted_graph(gui)
+    if graphe is None:
         output_label.config(text="Action annulée par l'utilisateur.")
-        return
+        return None
 
     # Demande des sommets de départ et d'arrivée
     start_vertex = simpledialog.askstring("Entrée", "Entrez le sommet de départ (ex: x0) :", parent=gui)
@@ -36,47 +133,26 @@ def dijkstra(gui, output_label):
 
     if start_vertex is None or end_vertex is None:
         output_label.config(text="Action annulée par l'utilisateur.")
-        return
+        return None
 
     # Vérifie si les sommets existent dans le graphe
-    if start_vertex not in G or end_vertex not in G:
+    if start_vertex not in graphe or end_vertex not in graphe:
         output_label.config(text="L'un des sommets n'existe pas dans le graphe.")
-        return
+        return None
 
-    try:
-        # Calcul du plus court chemin avec Dijkstra
-        start_time = time.time()
-        length, path = nx.single_source_dijkstra(G, start_vertex, end_vertex, weight='weight')
-        end_time = time.time()
-        execution_time = end_time - start_time
+    origines, extremites, poids = graphe.aretes()
+    instance = {"num_vertices": graphe.nombre_sommets, "origines": origines, "extremites": extremites,
+                "poids": poids, "requetes": [(graphe.indice(start_vertex), graphe.indice(end_vertex))]}
+    contexte = {"graphe": graphe, "start_vertex": start_vertex, "end_vertex": end_vertex}
+    return instance, contexte
 
-        # Création d'une nouvelle fenêtre pour afficher les résultats
-        result_window = Toplevel(gui)
-        result_window.geometry("800x600")
-        result_window.title(f"Résultats de Dijkstra ({start_vertex} -> {end_vertex})")
-        
-        # Affichage des résultats dans la nouvelle fenêtre
-        result_label = Label(result_window, text=f"Distance minimale : {length}\n"
-                                                f"Chemin le plus court : {' -> '.join(path)}\n"
-                                                f"Temps d'exécution : {execution_time:.4f} secondes",
-                             font=("Helvetica", 12), justify="left", padx=20, pady=20)
-        result_label.pack()
+def afficher_dijkstra(gui, output_label, contexte, resultat):
+    """Affiche le plus court chemin calculé par `solve_dijkstra`."""
+    graphe = contexte["graphe"]
+    start_vertex, end_vertex = contexte["start_vertex"], contexte["end_vertex"]
+    reponse = resultat["resultats"][0]
 
-        # Création de la figure pour le graphe
-        fig, ax = plt.subplots(figsize=(8, 6))
-        pos = nx.spring_layout(G)
-        edge_colors = ['red' if (u, v) in zip(path[:-1], path[1:]) or (v, u) in zip(path[:-1], path[1:]) else 'gray' for u, v in G.edges()]
-        nx.draw(G, pos, with_labels=True, node_color="lightblue", edge_color=edge_colors, node_size=500, font_size=10, ax=ax)
-        edge_labels = nx.get_edge_attributes(G, 'weight')
-        nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, ax=ax)
-        ax.set_title("Graphe avec chemin le plus court (Dijkstra)")
-
-        # Convertir le graphe en image et l'afficher dans Tkinter
-        canvas = FigureCanvasTkAgg(fig, master=result_window)  # Créer un canvas matplotlib pour Tkinter
-        canvas.draw()  # Dessiner le graphe
-        canvas.get_tk_widget().pack(pady=20)  # Ajouter le canvas à la fenêtre
-
-    except nx.NetworkXNoPath:
+    if reponse["chemin"] is None:
         # Cas où il n'y a pas de chemin entre les sommets
         result_window = Toplevel(gui)
         result_window.geometry("600x400")
@@ -87,3 +163,41 @@ def dijkstra(gui, output_label):
         result_label.pack()
 
         messagebox.showerror("Erreur", f"Aucun chemin entre {start_vertex} et {end_vertex}.")
+        return
+
+    path = [graphe.nom(i) for i in reponse["chemin"]]
+    length = reponse["distance"]
+    length = int(length) if length.is_integer() else length
+
+    # Création d'une nouvelle fenêtre pour afficher les résultats
+    result_window = Toplevel(gui)
+    result_window.geometry("800x600")
+    result_window.title(f"Résultats de Dijkstra ({start_vertex} -> {end_vertex})")
+
+    # Affichage des résultats dans la nouvelle fenêtre
+    result_label = Label(result_window, text=f"Distance minimale : {length}\n"
+                                            f"Chemin le plus court : {' -> '.join(path)}\n"
+                                            f"Temps d'exécution : {resultat['duree']:.4f} secondes",
+                         font=("Helvetica", 12), justify="left", padx=20, pady=20)
+    result_label.pack()
+
+    # Création de la figure pour le graphe
+    fig, ax = plt.subplots(figsize=(8, 6))
+    G = graphe.to_networkx()
+    edge_labels = nx.get_edge_attributes(G, 'weight')
+    dessiner_graphe(G, ax, aretes_importantes=list(zip(path[:-1], path[1:])), etiquettes=edge_labels,
+                    node_color="lightblue", couleur_fond="gray", node_size=500, font_size=10)
+    ax.set_title("Graphe avec chemin le plus court (Dijkstra)")
+
+    # Convertir le graphe en image et l'afficher dans Tkinter
+    canvas = FigureCanvasTkAgg(fig, master=result_window)  # Créer un canvas matplotlib pour Tkinter
+    canvas.draw()  # Dessiner le graphe
+    canvas.get_tk_widget().pack(pady=20)  # Ajouter le canvas à la fenêtre
+
+def dijkstra(gui, output_label):
+    """Fonction principale pour exécuter l'algorithme de Dijkstra via l'interface graphique."""
+    preparation = preparer_dijkstra(gui, output_label)
+    if preparation is None:
+        return
+    instance, contexte = preparation
+    afficher_dijkstra(gui, output_label, contexte, solve_dijkstra(**instance))
@@ -0,0 +1,196 @@
+"""Distances entre tous les couples de sommets, écrites dans une matrice memmap float32.
+
+Deux moteurs :
+
+    floyd_warshall   Floyd-Warshall par blocs, vectorisé avec NumPy : pour graphes
+                     denses (les générateurs de l'interface produisent des graphes
+                     complets) ou à poids négatifs ;
+    dijkstra         un Dijkstra par source, réparti sur un pool de processus
+                     quand `processus` > 1 est demandé : pour graphes creux à poids positifs ou nuls. L'adjacence est
+                     placée une fois en mémoire partagée (voir MemoirePartagee.py)
+                     et chaque processus écrit directement ses lignes dans la matrice.
+
+Avec un fichier de sortie, la matrice n x n est un fichier .npy ouvert en memmap
+(np.load(..., mmap_mode="r") le relit) : elle n'a jamais besoin de tenir en
+mémoire, et le fichier appartient à l'appelant. Sans fichier, c'est un tableau
+en mémoire. Le moteur "auto" choisit
+Floyd-Warshall quand le graphe a au moins SEUIL_DENSE * n² arcs ou des poids négatifs.
+"""
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Dijkstra import dijkstra_csr
+from Graphe import Graphe
+from MemoirePartagee import TableauxPartages, initialiser, tableaux_partages
+
+TAILLE_BLOC = 1 << 22    # Cases de la matrice traitées à la fois (bandes de lignes)
+PIVOTS_BLOC = 256        # Sommets intermédiaires par étape de Floyd-Warshall
+SEUIL_DENSE = 0.1        # Densité à partir de laquelle "auto" choisit Floyd-Warshall
+TACHES_PAR_PROCESSUS = 8
+
+def ouvrir_matrice(n, sortie=None):
+    """Crée la matrice n x n float32 : memmap du fichier .npy `sortie`, tableau en mémoire si None."""
+    if sortie is None:
+        return np.empty((n, n), dtype=np.float32)
+    return np.lib.format.open_memmap(sortie, mode="w+", dtype=np.float32, shape=(n, n))
+
+def _bandes(n, taille_bloc):
+    pas = max(1, taille_bloc // max(1, n))
+    return [(r0, min(r0 + pas, n)) for r0 in range(0, n, pas)]
+
+def floyd_warshall_blocs(adjacence, distances, pivots_bloc=PIVOTS_BLOC, taille_bloc=TAILLE_BLOC, progression=None):
+    """Floyd-Warshall par blocs sur la matrice `distances` (n x n, memmap possible).
+
+    Pour chaque bloc K de sommets intermédiaires, les lignes K sont d'abord
+    fermées entre elles, puis chaque bande de lignes I reçoit
+    D[I, :] = min(D[I, :], D[I, k] + D[k, :]) pour k dans K, en opérations
+    vectorisées sur toute la bande. La matrice est donc lue et écrite n / pivots_bloc
+    fois, par bandes de `taille_bloc` cases. Retourne True si un cycle de poids
+    négatif existe (distance négative d'un sommet à lui-même).
+    """
+    debut, tete, poids = adjacence
+    n = len(debut) - 1
+    bandes = _bandes(n, taille_bloc)
+
+    # Initialisation : arcs directs (le plus léger en cas d'arcs parallèles), 0 sur la diagonale
+    for r0, r1 in bandes:
+        bande = np.full((r1 - r0, n), np.inf, dtype=distances.dtype)
+        bande[np.arange(r1 - r0), np.arange(r0, r1)] = 0
+        k0, k1 = debut[r0], debut[r1]
+        lignes = np.repeat(np.arange(r1 - r0), np.diff(debut[r0:r1 + 1]))
+        np.minimum.at(bande, (lignes, tete[k0:k1]), poids[k0:k1] if poids is not None else 1)
+        distances[r0:r1] = bande
+
+    blocs = [(k0, min(k0 + pivots_bloc, n)) for k0 in range(0, n, pivots_bloc)]
+    tampon = np.empty(max(pivots_bloc, bandes[0][1]) * n, dtype=distances.dtype)
+    for b, (k0, k1) in enumerate(blocs):
+        # Lignes K fermées pour les intermédiaires de K (bloc diagonal compris)
+        pivots = np.array(distances[k0:k1])
+        somme = tampon[:pivots.size].reshape(pivots.shape)
+        for k in range(k0, k1):
+            np.add(pivots[:, k, None], pivots[k - k0], out=somme)
+            np.minimum(pivots, somme, out=pivots)
+        distances[k0:k1] = pivots
+
+        # Autres lignes, bande par bande
+        for r0, r1 in bandes:
+            debut_bande, fin_bande = max(r0, k0), min(r1, k1)
+            bande = np.array(distances[r0:r1])
+            if debut_bande < fin_bande:
+                bande[debut_bande - r0:fin_bande - r0] = pivots[debut_bande - k0:fin_bande - k0]
+            somme = tampon[:bande.size].reshape(bande.shape)
+            for k in range(k0, k1):
+                np.add(bande[:, k, None], pivots[k - k0], out=somme)
+                np.minimum(bande, somme, out=bande)
+            distances[r0:r1] = bande
+        if progression is not None:
+            progression(blocs=b + 1, total=len(blocs))
+
+    diagonale = np.arange(n)
+    return bool(n) and bool((distances[diagonale, diagonale] < 0).any())
+
+# État des processus du pool : adjacence en listes et matrice de sortie
+_ADJACENCE = None
+_SORTIE = None
+
+def _initialiser_dijkstra(descripteurs, chemin):
+    global _ADJACENCE, _SORTIE
+    initialiser(descripteurs)
+    tableaux = tableaux_partages()
+    _ADJACENCE = tuple(tableaux[nom].tolist() for nom in ("debut", "tete", "poids"))
+    _SORTIE = np.load(chemin, mmap_mode="r+")
+
+def _lignes_dijkstra(sources):
+    """Tâche d'un processus : lignes de la matrice pour les sources données."""
+    for source in sources:
+        _SORTIE[source], _ = dijkstra_csr(_ADJACENCE, source)
+    _SORTIE.flush()
+    return len(sources)
+
+def dijkstra_tous(adjacence, distances, processus=None, progression=None):
+    """Un Dijkstra par source, les lignes étant écrites directement dans `distances`.
+
+    Un seul processus par défaut : un pool n'est créé que si `processus` > 1
+    est demandé. Avec plus d'un processus, les processus ouvrent eux-mêmes le fichier .npy
+    de `distances` (memmap, voir ouvrir_matrice) et y écrivent des lignes
+    disjointes ; un tableau en mémoire passe par un fichier temporaire,
+    supprimé à la fin. Les poids doivent être positifs ou nuls.
+    """
+    debut, tete, poids = adjacence
+    n = len(debut) - 1
+    poids = np.ones(len(tete)) if poids is None else poids
+    if len(poids) and np.min(poids) < 0:
+        raise ValueError("Dijkstra demande des poids positifs ou nuls : utiliser Floyd-Warshall.")
+    processus = processus or 1
+    if processus == 1 or n < 2:
+        listes = (np.asarray(debut).tolist(), np.asarray(tete).tolist(), np.asarray(poids).tolist())
+        for source in range(n):
+            distances[source], _ = dijkstra_csr(listes, source)
+            if progression is not None and (source + 1) % 100 == 0:
+                progression(sources=source + 1, total=n)
+        return
+
+    if getattr(distances, "filename", None) is None:
+        descripteur, temporaire = tempfile.mkstemp(prefix="distances_", suffix=".npy")
+        os.close(descripteur)
+        try:
+            fichier = ouvrir_matrice(n, temporaire)
+            dijkstra_tous(adjacence, fichier, processus, progression)
+            distances[...] = fichier
+            del fichier
+        finally:
+            os.remove(temporaire)
+        return
+
+    distances.flush()
+    pas = max(1, -(-n // (processus * TACHES_PAR_PROCESSUS)))
+    lots = [range(s, min(s + pas, n)) for s in range(0, n, pas)]
+    with TableauxPartages(debut=debut, tete=tete, poids=poids) as partage, \
+            ProcessPoolExecutor(max_workers=processus, initializer=_initialiser_dijkstra,
+                                initargs=(partage.descripteurs, distances.filename)) as pool:
+        taches = [pool.submit(_lignes_dijkstra, lot) for lot in lots]
+        try:
+            faites = 0
+            for tache in taches:
+                faites += tache.result()
+                if progression is not None:
+                    progression(sources=faites, total=n)
+        except BaseException:
+            for tache in taches:
+                tache.cancel()
+            raise
+
+def solve_distances(num_vertices, origines, extremites, poids, oriente=False, methode="auto", sortie=None,
+                    processus=None, progression=None):
+    """Matrice des distances entre tous les couples de sommets, sans interface graphique.
+
+    `methode` vaut "auto", "floyd_warshall" ou "dijkstra" (sur `processus`
+    processus, un seul par défaut) ; `sortie` est le
+    fichier .npy de la matrice, laissé à l'appelant (None : matrice en
+    mémoire, sans fichier). Retourne {"distances" (float32, inf si
+    inaccessible ; memmap avec `sortie`), "fichier" (None sans `sortie`),
+    "methode", "cycle_negatif"}. Le résultat n'est pas mis dans le cache des
+    solve_* (la matrice peut dépasser la mémoire).
+    """
+    graphe = Graphe.depuis_aretes(num_vertices, origines, extremites, poids, oriente=oriente)
+    n = graphe.nombre_sommets
+    if methode == "auto":
+        negatifs = graphe.poids is not None and len(graphe.poids) and graphe.poids.min() < 0
+        methode = "floyd_warshall" if negatifs or graphe.nombre_arcs >= SEUIL_DENSE * n * n else "dijkstra"
+    distances = ouvrir_matrice(n, sortie)
+    cycle_negatif = False
+    if methode == "floyd_warshall":
+        cycle_negatif = floyd_warshall_blocs(graphe.adjacence, distances, progression=progression)
+    elif methode == "dijkstra":
+        dijkstra_tous(graphe.adjacence, distances, processus, progression)
+    else:
+        raise ValueError(f"Méthode inconnue : {methode}")
+    fichier = None
+    if sortie is not None:
+        distances.flush()
+        fichier = str(distances.filename)
+    return {"distances": distances, "fichier": fichier, "methode": methode,
+            "cycle_negatif": cycle_negatif}
@@ -1,20 +1,18 @@
-import random
-import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
 from collections import deque
-from tkinter import simpledialog, messagebox
+from tkinter import simpledialog
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import tkinter as tk
+from Rendu import dessiner_graphe
+from Generateurs import gnp
+from Graphe import Graphe, type_indice
+from Cache import avec_cache
 
-def generate_random_graph(num_vertices, max_capacity=10):
-    """Génère un graphe aléatoire avec des capacités aléatoires."""
-    G = nx.DiGraph()
-    for i in range(num_vertices):
-        for j in range(num_vertices):
-            if i != j:  # Pas d'arcs auto-bouclants
-                capacity = random.randint(1, max_capacity)
-                G.add_edge(i, j, capacity=capacity)
-    return G
+def generate_random_graph(num_vertices, max_capacity=10, densite=1.0, graine=None):
+    """Génère un Graphe orienté aux capacités aléatoires (densite = 1 : tous les arcs i != j)."""
+    origines, extremites, capacites = gnp(num_vertices, densite, graine, oriente=True, poids_max=max_capacity)
+    return Graphe.depuis_aretes(num_vertices, origines, extremites, capacites, oriente=True, attribut="capacity")
 
 def bfs(capacity, flow, source, sink):
     """Recherche en largeur (BFS) pour trouver un chemin augmentant."""
@@ -50,6 +48,429 @@ def ford_fulkerson(capacity, source, sink):
             v = u
     return max_flow, flow
 
+def construire_reseau_residuel(num_vertices, origines, extremites, capacites):
+    """Construit le graphe résiduel compact (CSR) d'un réseau donné par ses arcs.
+
+    Chaque arc (u, v, c) donne un arc direct de capacité c et un arc inverse de
+    capacité 0, rangés par origine. Retourne (debut, tete, capacite, inverse, position) :
+    les arcs sortant de u sont debut[u]:debut[u+1], inverse[k] est l'indice de l'arc
+    apparié à k et position[e] l'indice de l'arc direct de l'arc d'entrée e.
+    """
+    origines = np.asarray(origines)
+    extremites = np.asarray(extremites)
+    m = len(origines)
+    itype = type_indice(max(2 * m, num_vertices + 1))
+
+    queues = np.concatenate([origines, extremites]).astype(itype, copy=False)
+    tetes = np.concatenate([extremites, origines]).astype(itype, copy=False)
+    capacite = np.concatenate([np.asarray(capacites), np.zeros(m, dtype=np.asarray(capacites).dtype)])
+    paire = np.concatenate([np.arange(m, 2 * m, dtype=itype), np.arange(m, dtype=itype)])
+
+    ordre = np.argsort(queues, kind="stable")
+    rang = np.empty(2 * m, dtype=itype)
+    rang[ordre] = np.arange(2 * m, dtype=itype)
+
+    debut = np.zeros(num_vertices + 1, dtype=itype)
+    np.cumsum(np.bincount(queues, minlength=num_vertices), out=debut[1:])
+    return debut, tetes[ordre], capacite[ordre], rang[paire[ordre]], rang[:m]
+
+def dinic(reseau, source, sink, progression=None):
+    """Algorithme de Dinic : BFS par niveaux puis DFS itératif avec arcs courants.
+
+    Retourne le flot maximal et les capacités résiduelles de chaque arc.
+    `progression` est appelé après chaque chemin augmentant.
+    """
+    debut, tete, capacite, inverse, _ = reseau
+    residuel = capacite.tolist()
+    max_flow, _ = _dinic(debut.tolist(), tete.tolist(), inverse.tolist(), residuel, source, sink, progression)
+    return max_flow, np.asarray(residuel, dtype=capacite.dtype)
+
+def _dinic(debut, tete, inverse, residuel, source, sink, progression=None):
+    """Cœur de Dinic sur des listes ; `residuel` est modifié sur place (départ possible d'un flot existant).
+
+    Retourne le flot ajouté et les niveaux de la dernière recherche, qui n'atteint
+    pas le puits : les sommets de niveau >= 0 forment le côté source de la coupe minimale.
+    """
+    n = len(debut) - 1
+    max_flow = 0
+    augmentations = 0
+
+    while True:
+        # Graphe de niveaux
+        niveau = [-1] * n
+        niveau[source] = 0
+        queue = deque([source])
+        while queue and niveau[sink] < 0:
+            u = queue.popleft()
+            for k in range(debut[u], debut[u + 1]):
+                v = tete[k]
+                if residuel[k] > 0 and niveau[v] < 0:
+                    niveau[v] = niveau[u] + 1
+                    queue.append(v)
+        if niveau[sink] < 0:
+            break
+
+        # Flot bloquant : DFS itératif, chaque arc courant n'avance que vers l'avant
+        courant = debut[:-1]
+        noeuds, arcs = [source], []
+        while noeuds:
+            u = noeuds[-1]
+            if u == sink:
+                path_flow = min(residuel[k] for k in arcs)
+                for k in arcs:
+                    residuel[k] -= path_flow
+                    residuel[inverse[k]] += path_flow
+                max_flow += path_flow
+                augmentations += 1
+                if progression is not None:
+                    progression(augmentations=augmentations, flot=max_flow)
+                # Reprendre depuis l'origine du premier arc saturé
+                premier = next(i for i, k in enumerate(arcs) if residuel[k] == 0)
+                del noeuds[premier + 1:], arcs[premier:]
+                continue
+
+            k = courant[u]
+            fin = debut[u + 1]
+            while k < fin and (residuel[k] == 0 or niveau[tete[k]] != niveau[u] + 1):
+                k += 1
+            courant[u] = k
+            if k < fin:
+                noeuds.append(tete[k])
+                arcs.append(k)
+            else:
+                # Impasse : retirer u du graphe de niveaux et reculer
+                niveau[u] = -1
+                noeuds.pop()
+                if arcs:
+                    courant[noeuds[-1]] += 1
+                    arcs.pop()
+
+    return max_flow, niveau
+
+def push_relabel(reseau, source, sink, progression=None):
+    """Algorithme préflot (push-relabel) avec sélection du plus haut label et heuristique de trou.
+
+    Retourne le flot maximal et les capacités résiduelles de chaque arc.
+    `progression` est appelé toutes les 1000 décharges.
+    """
+    debut, tete, capacite, inverse, _ = reseau
+    n = len(debut) - 1
+    debut, tete, inverse = debut.tolist(), tete.tolist(), inverse.tolist()
+    residuel = capacite.tolist()
+    decharges = 0
+
+    # Étiquetage global initial : distance au puits dans le graphe résiduel
+    hauteur = [n] * n
+    hauteur[sink] = 0
+    queue = deque([sink])
+    while queue:
+        v = queue.popleft()
+        for k in range(debut[v], debut[v + 1]):
+            u = tete[k]
+            if hauteur[u] == n and u != sink and residuel[inverse[k]] > 0:
+                hauteur[u] = hauteur[v] + 1
+                queue.append(u)
+    hauteur[source] = n
+
+    compte = [0] * (2 * n + 1)
+    for h in hauteur:
+        compte[h] += 1
+    exces = [0] * n
+    actifs = [[] for _ in range(2 * n + 1)]
+    plus_haut = 0
+
+    # Saturer les arcs sortant de la source
+    for k in range(debut[source], debut[source + 1]):
+        v, c = tete[k], residuel[k]
+        if c > 0:
+            residuel[k] = 0
+            residuel[inverse[k]] += c
+            if exces[v] == 0 and v != sink and v != source:
+                actifs[hauteur[v]].append(v)
+                plus_haut = max(plus_haut, hauteur[v])
+            exces[v] += c
+
+    courant = debut[:-1]
+    while plus_haut >= 0:
+        if not actifs[plus_haut]:
+            plus_haut -= 1
+            continue
+        u = actifs[plus_haut].pop()
+        if hauteur[u] != plus_haut:
+            # Sommet relevé par une heuristique de trou depuis son insertion
+            actifs[hauteur[u]].append(u)
+            plus_haut = max(plus_haut, hauteur[u])
+            continue
+
+        # Décharger u
+        decharges += 1
+        if progression is not None and decharges % 1000 == 0:
+            progression(decharges=decharges, flot=exces[sink])
+        while exces[u] > 0:
+            k = courant[u]
+            if k == debut[u + 1]:
+                # Relabel
+                ancienne = hauteur[u]
+                nouvelle = 2 * n
+                for a in range(debut[u], debut[u + 1]):
+                    if residuel[a] > 0 and hauteur[tete[a]] + 1 < nouvelle:
+                        nouvelle = hauteur[tete[a]] + 1
+                compte[ancienne] -= 1
+                if compte[ancienne] == 0 and ancienne < n:
+                    # Heuristique de trou : les sommets au-dessus ne peuvent plus atteindre le puits
+                    for w in range(n):
+                        if ancienne < hauteur[w] < n and w != source:
+                            compte[hauteur[w]] -= 1
+                            hauteur[w] = n + 1
+                            compte[n + 1] += 1
+                    nouvelle = max(nouvelle, n + 1)
+                hauteur[u] = nouvelle
+                compte[nouvelle] += 1
+                courant[u] = debut[u]
+                if nouvelle >= 2 * n:
+                    break
+                continue
+
+            v = tete[k]
+            if residuel[k] > 0 and hauteur[u] == hauteur[v] + 1:
+                delta = min(exces[u], residuel[k])
+                residuel[k] -= delta
+                residuel[inverse[k]] += delta
+                exces[u] -= delta
+                if exces[v] == 0 and v != sink and v != source:
+                    actifs[hauteur[v]].append(v)
+                    plus_haut = max(plus_haut, hauteur[v])
+                exces[v] += delta
+            else:
+                courant[u] = k + 1
+
+    return exces[sink], np.asarray(residuel, dtype=capacite.dtype)
+
+def flot_maximal_aretes(num_vertices, origines, extremites, capacites, source, sink, methode="dinic", progression=None):
+    """Flot maximal sur un réseau donné par tableaux d'arcs.
+
+    Retourne le flot maximal et le flot porté par chaque arc d'entrée.
+    """
+    capacites = np.asarray(capacites)
+    reseau = construire_reseau_residuel(num_vertices, origines, extremites, capacites)
+    if source == sink:
+        return 0, np.zeros_like(capacites)
+    moteurs = {"dinic": dinic, "push_relabel": push_relabel}
+    max_flow, residuel = moteurs[methode](reseau, source, sink, progression)
+    position = reseau[4]
+    return max_flow, capacites - residuel[position]
+
+def flot_maximal(capacity, source, sink, methode="dinic"):
+    """Même contrat que `ford_fulkerson` : (max_flow, flow) à partir d'une matrice de capacités.
+
+    `methode` vaut "dinic" ou "push_relabel" ; la matrice n'est parcourue qu'une
+    fois pour en extraire les arcs, le calcul se fait sur le graphe résiduel compact.
+    """
+    capacity = np.asarray(capacity)
+    n = len(capacity)
+    origines, extremites = np.nonzero(capacity > 0)
+    max_flow, flux = flot_maximal_aretes(n, origines, extremites, capacity[origines, extremites], source, sink, methode)
+    flow = np.zeros((n, n), dtype=capacity.dtype)
+    np.add.at(flow, (origines, extremites), flux)
+    np.subtract.at(flow, (extremites, origines), flux)
+    return int(max_flow), flow.tolist()
+
+def coupe_minimale_aretes(num_vertices, origines, extremites, capacites, flux, source):
+    """Côté source de la coupe minimale à partir du flot porté par chaque arc.
+
+    Un arc (u, v) est résiduel dans le sens u -> v s'il n'est pas saturé et dans
+    le sens v -> u s'il porte du flot. Retourne un tableau booléen des sommets
+    accessibles depuis la source.
+    """
+    non_sature = flux < capacites
+    porte = flux > 0
+    queues = np.concatenate([origines[non_sature], extremites[porte]])
+    tetes = np.concatenate([extremites[non_sature], origines[porte]])
+    ordre = np.argsort(queues, kind="stable")
+    debut = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(queues, minlength=num_vertices), out=debut[1:])
+    debut, tetes = debut.tolist(), tetes[ordre].tolist()
+
+    visited = [False] * num_vertices
+    visited[source] = True
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for v in tetes[debut[u]:debut[u + 1]]:
+            if not visited[v]:
+                visited[v] = True
+                queue.append(v)
+    return np.array(visited, dtype=bool)
+
+class FlotIncremental:
+    """Flot maximal gardé d'un appel à l'autre et réparé après des changements de capacités.
+
+    Le graphe résiduel et le flot courant sont conservés. Une hausse de capacité
+    ne relance la recherche de chemins augmentants que si l'arc traverse la coupe
+    minimale courante. Une baisse sous le flot porté retire l'excédent de l'arc :
+    il est d'abord redirigé vers l'extrémité de l'arc par d'autres chemins
+    résiduels, le reste est renvoyé vers la source (et le déficit comblé depuis
+    le puits). Dinic repart ensuite du flot réparé ; sa dernière recherche en
+    largeur, limitée au côté source, donne la nouvelle coupe.
+    """
+
+    def __init__(self, num_vertices, origines, extremites, capacites, source, sink, progression=None):
+        self.origines = np.asarray(origines)
+        self.extremites = np.asarray(extremites)
+        self.capacites = np.asarray(capacites).tolist()
+        self.source, self.sink = int(source), int(sink)
+        debut, tete, capacite, inverse, position = construire_reseau_residuel(
+            num_vertices, self.origines, self.extremites, np.asarray(capacites))
+        self.debut, self.tete, self.inverse = debut.tolist(), tete.tolist(), inverse.tolist()
+        self.position = position.tolist()
+        self.residuel = capacite.tolist()
+        self._entrants_puits = np.flatnonzero(self.extremites == self.sink).tolist()
+        self._sortants_puits = np.flatnonzero(self.origines == self.sink).tolist()
+        self._coupe = [True] * num_vertices
+        self.max_flow = 0
+        if self.source != self.sink:
+            self._reaugmenter(progression)
+
+    def _flux_arc(self, e):
+        return self.capacites[e] - self.residuel[self.position[e]]
+
+    def _reaugmenter(self, progression=None):
+        _, niveau = _dinic(self.debut, self.tete, self.inverse, self.residuel, self.source, self.sink, progression)
+        self._coupe = [h >= 0 for h in niveau]
+        self.max_flow = (sum(self._flux_arc(e) for e in self._entrants_puits)
+                         - sum(self._flux_arc(e) for e in self._sortants_puits))
+
+    def _pousser(self, depart, arrivee, quantite):
+        """Pousse jusqu'à `quantite` unités de depart vers arrivee par chemins résiduels (BFS) ; retourne la quantité poussée."""
+        poussee = 0
+        while poussee < quantite:
+            parent = {depart: -1}
+            queue = deque([depart])
+            while queue and arrivee not in parent:
+                u = queue.popleft()
+                for k in range(self.debut[u], self.debut[u + 1]):
+                    v = self.tete[k]
+                    if self.residuel[k] > 0 and v not in parent:
+                        parent[v] = k
+                        queue.append(v)
+            if arrivee not in parent:
+                break
+            chemin = []
+            v = arrivee
+            while v != depart:
+                k = parent[v]
+                chemin.append(k)
+                v = self.tete[self.inverse[k]]
+            delta = min(quantite - poussee, min(self.residuel[k] for k in chemin))
+            for k in chemin:
+                self.residuel[k] -= delta
+                self.residuel[self.inverse[k]] += delta
+            poussee += delta
+        return poussee
+
+    def arc(self, u, v):
+        """Indice du premier arc d'entrée u -> v (KeyError s'il n'existe pas)."""
+        trouves = np.flatnonzero((self.origines == u) & (self.extremites == v))
+        if len(trouves) == 0:
+            raise KeyError(f"Arc ({u}, {v}) absent du réseau.")
+        return int(trouves[0])
+
+    def modifier(self, changements, progression=None):
+        """Applique des changements [(u, v, capacité), ...] et répare le flot ; retourne le nouveau flot maximal."""
+        return self.modifier_arcs([(self.arc(u, v), c) for u, v, c in changements], progression)
+
+    def modifier_arcs(self, changements, progression=None):
+        """Comme `modifier`, les arcs étant désignés par leur indice d'entrée : [(e, capacité), ...]."""
+        a_reaugmenter = False
+        for e, nouvelle in changements:
+            e = int(e)
+            nouvelle = nouvelle.item() if isinstance(nouvelle, np.generic) else nouvelle
+            if nouvelle < 0:
+                raise ValueError(f"Capacité négative pour l'arc {e}.")
+            k = self.position[e]
+            u, v = int(self.origines[e]), int(self.extremites[e])
+            flux = self._flux_arc(e)
+            hausse = nouvelle > self.capacites[e]
+            self.capacites[e] = nouvelle
+            if nouvelle >= flux:
+                self.residuel[k] = nouvelle - flux
+                # Une hausse ne compte que si l'arc traverse la coupe ; une baisse
+                # absorbée peut seulement réduire le côté source
+                if hausse:
+                    a_reaugmenter |= self._coupe[u] and not self._coupe[v]
+                else:
+                    a_reaugmenter |= self._coupe[u] and self._coupe[v] and self.residuel[k] == 0
+                continue
+
+            # Baisse sous le flot porté : excédent en u, déficit en v
+            excedent = flux - nouvelle
+            self.residuel[k] = 0
+            self.residuel[self.inverse[k]] -= excedent
+            reste = excedent - (self._pousser(u, v, excedent) if u != v else excedent)
+            if reste:
+                if u not in (self.source, self.sink):
+                    self._pousser(u, self.source, reste)
+                if v not in (self.source, self.sink):
+                    self._pousser(self.sink, v, reste)
+            a_reaugmenter = True
+
+        if a_reaugmenter and self.source != self.sink:
+            self._reaugmenter(progression)
+        return self.max_flow
+
+    @property
+    def flux(self):
+        """Flot porté par chaque arc d'entrée."""
+        return np.array([self._flux_arc(e) for e in range(len(self.position))])
+
+    @property
+    def coupe(self):
+        """Côté source de la coupe minimale (tableau booléen)."""
+        return np.array(self._coupe, dtype=bool)
+
+    def aretes_coupe(self):
+        """Arcs saturés de la coupe : [(u, v, capacité), ...] triés."""
+        coupe = self.coupe
+        capacites = np.asarray(self.capacites)
+        traverse = np.flatnonzero(coupe[self.origines] & ~coupe[self.extremites] & (capacites > 0))
+        traverse = traverse[np.lexsort((self.extremites[traverse], self.origines[traverse]))]
+        return [(int(self.origines[k]), int(self.extremites[k]), self.capacites[k]) for k in traverse]
+
+@avec_cache("flot_maximal")
+def solve_flot_maximal(num_vertices, origines, extremites, capacites, source, sink, methode="dinic", progression=None):
+    """Flot maximal et coupe minimale sans interface graphique.
+
+    Retourne {"max_flow", "flux" (par arc d'entrée), "coupe" (côté source),
+    "aretes_coupe": [(u, v, capacité), ...]}.
+    """
+    origines = np.asarray(origines)
+    extremites = np.asarray(extremites)
+    capacites = np.asarray(capacites)
+    max_flow, flux = flot_maximal_aretes(num_vertices, origines, extremites, capacites, source, sink, methode, progression)
+    coupe = coupe_minimale_aretes(num_vertices, origines, extremites, capacites, flux, source)
+
+    traverse = np.flatnonzero(coupe[origines] & ~coupe[extremites] & (capacites > 0))
+    traverse = traverse[np.lexsort((extremites[traverse], origines[traverse]))]
+    aretes_coupe = [(int(origines[k]), int(extremites[k]), capacites[k].item()) for k in traverse]
+    return {"max_flow": max_flow, "flux": flux, "coupe": coupe, "aretes_coupe": aretes_coupe}
+
+@avec_cache("flot_incremental")
+def solve_flot_incremental(num_vertices, origines, extremites, capacites, source, sink, lots, progression=None):
+    """Flot maximal puis réparation après chaque lot de changements de capacités.
+
+    `lots` est une liste de lots [(u, v, capacité), ...]. Retourne
+    {"max_flow_initial", "lots": [{"max_flow", "aretes_coupe"}, ...], "flux", "coupe"}
+    (flux et coupe après le dernier lot).
+    """
+    flot = FlotIncremental(num_vertices, origines, extremites, capacites, source, sink)
+    resultat = {"max_flow_initial": flot.max_flow, "lots": []}
+    for k, lot in enumerate(lots):
+        resultat["lots"].append({"max_flow": flot.modifier(lot), "aretes_coupe": flot.aretes_coupe()})
+        if progression is not None:
+            progression(lots=k + 1, total=len(lots))
+    resultat.update(flux=flot.flux, coupe=flot.coupe)
+    return resultat
+
 def find_min_cut(capacity, flow, source):
     """Trouve la coupe minimale en utilisant un BFS."""
     visited = [False] * len(capacity)
@@ -63,26 +484,20 @@ def find_min_cut(capacity, flow, source):
                 queue.append(v)
     return visited
 
-def draw_graph_with_cut(G, capacity, flow, min_cut, source, sink):
-    """Affiche le graphe avec la coupe minimale."""
-    pos = nx.spring_layout(G)
+def draw_graph_with_cut(G, min_cut, source, sink):
+    """Affiche le graphe avec la coupe minimale (capacités lues dans l'attribut 'capacity')."""
     fig, ax = plt.subplots(figsize=(8, 8))
     
     node_colors = ['green' if min_cut[u] else 'blue' for u in G.nodes()]
-    edge_colors = []
-    for u, v in G.edges():
-        if min_cut[u] and not min_cut[v]:
-            edge_colors.append('red')
-        else:
-            edge_colors.append('black')
-    nx.draw(G, pos, with_labels=True, node_color=node_colors, edge_color=edge_colors, node_size=500, font_size=16, font_weight='bold', ax=ax)
-    nx.draw_networkx_edge_labels(
-        G, pos,
-        edge_labels={(u, v): f"{capacity[u][v]}" for u, v in G.edges()},
-        font_color='black', ax=ax
+    cut_edges = [(u, v) for u, v in G.edges() if min_cut[u] and not min_cut[v]]
+    pos = dessiner_graphe(
+        G, ax, aretes_importantes=cut_edges,
+        etiquettes={(u, v): f"{c}" for u, v, c in G.edges(data='capacity')},
+        node_color=node_colors, couleur_fond='black', node_size=500, font_size=16, font_weight='bold'
     )
-    plt.text(pos[source][0], pos[source][1], "Source", color='red', fontsize=12, ha='center', fontweight='bold')
-    plt.text(pos[sink][0], pos[sink][1], "Puits", color='purple', fontsize=12, ha='center', fontweight='bold')
+    if pos is not None:
+        ax.text(pos[source][0], pos[source][1], "Source", color='red', fontsize=12, ha='center', fontweight='bold')
+        ax.text(pos[sink][0], pos[sink][1], "Puits", color='purple', fontsize=12, ha='center', fontweight='bold')
     ax.set_title(f"Graphe avec coupe minimale (Source: {source}, Puits: {sink})")
     return fig
 
@@ -95,44 +510,49 @@ def display_min_cut_edges(capacity, flow, min_cut):
                 cut_edges.append((u, v))
     return cut_edges
 
-def ford_fulkerson_gui(gui, output_label):
-    """Fonction principale pour exécuter l'algorithme de Ford-Fulkerson via l'interface graphique."""
+def preparer_ford_fulkerson(gui, output_label):
+    """Génère le réseau ; retourne (instance, contexte) ou None si l'action est annulée."""
     num_vertices = simpledialog.askinteger("Entrée", "Entrez le nombre de sommets :", parent=gui, minvalue=2)
     if num_vertices is None:  # Si l'utilisateur annule
         output_label.config(text="Action annulée par l'utilisateur.")
-        return
+        return None
+
+    densite = simpledialog.askfloat("Entrée", "Entrez la densité des arcs (0 à 1, 1 = graphe complet) :",
+                                    parent=gui, minvalue=0.0, maxvalue=1.0, initialvalue=1.0)
+    if densite is None:
+        output_label.config(text="Action annulée par l'utilisateur.")
+        return None
 
     # Génération du graphe
-    G = generate_random_graph(num_vertices)
+    graphe = generate_random_graph(num_vertices, densite=densite)
 
     # Choix de la source et du puits
     source = 0  # Source par défaut
     sink = num_vertices - 1  # Puits par défaut
 
-    # Création d'une matrice de capacité
-    capacity = [[0] * num_vertices for _ in range(num_vertices)]
-    for u, v, data in G.edges(data=True):
-        capacity[u][v] = data['capacity']
+    # Tableaux d'arcs (pas de matrice de capacité dense)
+    origines, extremites, capacites = graphe.aretes()
+    instance = {"num_vertices": num_vertices, "origines": origines, "extremites": extremites,
+                "capacites": capacites, "source": source, "sink": sink}
+    return instance, {"graphe": graphe}
 
-    # Calcul du flot maximal avec Ford-Fulkerson
-    max_flow, flow = ford_fulkerson(capacity, source, sink)
+def afficher_ford_fulkerson(gui, output_label, contexte, resultat):
+    """Affiche le flot maximal et la coupe minimale calculés par `solve_flot_maximal`."""
+    graphe = contexte["graphe"]
+    source, sink = 0, graphe.nombre_sommets - 1
 
     # Affichage du flot maximal
-    output = f"Flot maximal : {max_flow}\n"
-
-    # Trouver la coupe minimale
-    min_cut = find_min_cut(capacity, flow, source)
+    output = f"Flot maximal : {resultat['max_flow']}\n"
 
     # Affichage des arêtes de la coupe minimale
-    cut_edges = display_min_cut_edges(capacity, flow, min_cut)
     output += "Arêtes de la coupe minimale :\n"
-    for u, v in cut_edges:
-        output += f"({u}, {v}) avec capacité {capacity[u][v]}\n"
+    for u, v, capacite in resultat["aretes_coupe"]:
+        output += f"({u}, {v}) avec capacité {capacite}\n"
 
     output_label.config(text=output)
 
     # Affichage du graphe avec la coupe minimale dans une nouvelle fenêtre
-    fig = draw_graph_with_cut(G, capacity, flow, min_cut, source, sink)
+    fig = draw_graph_with_cut(graphe.to_networkx(), resultat["coupe"], source, sink)
 
     # Création d'une fenêtre pour afficher le graphe
     graph_window = tk.Toplevel(gui)
@@ -142,3 +562,13 @@ def ford_fulkerson_gui(gui, output_label):
     canvas = FigureCanvasTkAgg(fig, master=graph_window)
     canvas.draw()
     canvas.get_tk_widget().pack()
+
+def ford_fulkerson_gui(gui, output_label):
+    """Fonction principale pour exécuter l'algorithme de Ford-Fulkerson via l'interface graphique."""
+    preparation = preparer_ford_fulkerson(gui, output_label)
+    if preparation is None:
+        return
+    instance, contexte = preparation
+
+    # Calcul du flot maximal (Dinic sur le graphe résiduel compact)
+    afficher_ford_fulkerson(gui, output_label, contexte, solve_flot_maximal(**instance))
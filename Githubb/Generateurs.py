@@ -0,0 +1,162 @@
+"""Générateurs d'instances aléatoires sous forme de tableaux d'arêtes.
+
+Chaque famille retourne directement des tableaux NumPy (origines, extremites,
+poids), sans boucle Python par arête : un million d'arêtes se génère en une
+fraction de seconde. Le paramètre `graine` accepte un entier (instance
+reproductible), un np.random.Generator ou None.
+
+    gnp                 G(n, p) : chaque paire présente avec probabilité p
+    gnm                 G(n, m) : m paires distinctes tirées uniformément
+    geometrique         graphe géométrique aléatoire dans le carré unité
+    grille              grille (réseau routier), chaque arête gardée avec probabilité `densite`
+    dag_en_couches      graphe orienté sans circuit en couches successives
+"""
+from itertools import combinations, count, islice
+import string
+
+import numpy as np
+
+POIDS_MIN = 1
+POIDS_MAX = 100
+
+def _poids(rng, m, poids_min, poids_max):
+    return rng.integers(poids_min, poids_max + 1, m)
+
+def _paires(n, oriente):
+    """Nombre de paires possibles sans boucle."""
+    return n * (n - 1) if oriente else n * (n - 1) // 2
+
+def _decoder_paires(n, k, oriente):
+    """Indices linéaires de paires -> (origines, extremites).
+
+    Orienté : k parcourt les n(n-1) couples (i, j), i != j. Non orienté : k
+    parcourt les paires i < j ligne par ligne (inversion du nombre triangulaire).
+    """
+    k = np.asarray(k, dtype=np.int64)
+    if oriente:
+        i = k // (n - 1)
+        j = k % (n - 1)
+        return i, j + (j >= i)
+    # Début de la ligne i : i*n - i(i+1)/2
+    i = np.floor((2 * n - 1 - np.sqrt((2 * n - 1) ** 2 - 8.0 * k)) / 2).astype(np.int64)
+    debut_ligne = lambda i: i * n - i * (i + 1) // 2
+    # Correction des erreurs d'arrondi sur les très grands n
+    i -= debut_ligne(i) > k
+    i += debut_ligne(i + 1) <= k
+    return i, k - debut_ligne(i) + i + 1
+
+def _uniques_tries(valeurs):
+    """Valeurs distinctes triées (tri + comparaison des voisins, plus rapide que np.unique)."""
+    valeurs = np.sort(valeurs)
+    if len(valeurs) == 0:
+        return valeurs
+    return valeurs[np.concatenate([[True], valeurs[1:] != valeurs[:-1]])]
+
+def _tirer_distincts(rng, total, m):
+    """m entiers distincts de [0, total) tirés uniformément, triés."""
+    if m > total:
+        raise ValueError(f"Impossible de tirer {m} paires distinctes parmi {total}.")
+    if 2 * m > total:
+        # Graphe dense : on tire le complément (ou une permutation si total est petit)
+        if total <= 10 ** 7:
+            return np.sort(rng.permutation(total)[:m])
+        return np.setdiff1d(np.arange(total), _tirer_distincts(rng, total, total - m), assume_unique=True)
+    tires = np.zeros(0, dtype=np.int64)
+    while len(tires) < m:
+        # Tirages supplémentaires compensant les doublons attendus
+        manque = m - len(tires)
+        tirage = int(manque * total / (total - len(tires)) * 1.1) + 16
+        tires = _uniques_tries(np.concatenate([tires, rng.integers(0, total, tirage)]))
+    return np.sort(tires[rng.permutation(len(tires))[:m]])
+
+def gnm(n, m, graine=None, oriente=False, poids_min=POIDS_MIN, poids_max=POIDS_MAX):
+    """G(n, m) : m arêtes distinctes sans boucle. Non orienté : origines < extremites."""
+    rng = np.random.default_rng(graine)
+    if n < 2:
+        m = 0
+    k = _tirer_distincts(rng, _paires(n, oriente), m) if m else np.zeros(0, dtype=np.int64)
+    origines, extremites = _decoder_paires(n, k, oriente)
+    return origines, extremites, _poids(rng, len(k), poids_min, poids_max)
+
+def gnp(n, p, graine=None, oriente=False, poids_min=POIDS_MIN, poids_max=POIDS_MAX):
+    """G(n, p) : chaque paire présente avec probabilité p (p = 1 : graphe complet)."""
+    rng = np.random.default_rng(graine)
+    total = _paires(n, oriente)
+    m = total if p >= 1 else int(rng.binomial(total, p))
+    return gnm(n, m, rng, oriente, poids_min, poids_max)
+
+def geometrique(n, degre_moyen=6, graine=None, poids_min=POIDS_MIN, poids_max=POIDS_MAX):
+    """Graphe géométrique aléatoire : n points du carré unité reliés à moins d'un rayon.
+
+    Le rayon est choisi pour obtenir `degre_moyen` voisins en moyenne ; le poids
+    croît avec la longueur de l'arête. Les voisins sont cherchés par cases de
+    côté égal au rayon, en ne comparant que les cases adjacentes.
+    """
+    rng = np.random.default_rng(graine)
+    points = rng.random((n, 2))
+    rayon = min(1.0, np.sqrt(degre_moyen / (np.pi * max(n, 1))))
+    cotes = max(1, int(1 / rayon))
+
+    case = np.minimum((points / rayon).astype(np.int64), cotes - 1)
+    identifiant = case[:, 0] * cotes + case[:, 1]
+    ordre = np.argsort(identifiant, kind="stable")
+    points, identifiant, case = points[ordre], identifiant[ordre], case[ordre]
+    debut = np.searchsorted(identifiant, np.arange(cotes * cotes + 1))
+
+    origines, extremites, longueurs = [], [], []
+    # Case elle-même et la moitié des voisines : chaque paire de cases vue une fois
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        cx, cy = case[:, 0] + dx, case[:, 1] + dy
+        a = np.flatnonzero((cx >= 0) & (cx < cotes) & (cy >= 0) & (cy < cotes))
+        voisine = cx[a] * cotes + cy[a]
+        taille = debut[voisine + 1] - debut[voisine]
+        # b parcourt les points de la case voisine de chaque a
+        decalage = np.arange(taille.sum()) - np.repeat(np.cumsum(taille) - taille, taille)
+        a, b = np.repeat(a, taille), np.repeat(debut[voisine], taille) + decalage
+        longueur = np.sqrt(np.sum((points[a] - points[b]) ** 2, axis=1))
+        garder = longueur <= rayon
+        if dx == 0 and dy == 0:
+            garder &= a < b
+        origines.append(ordre[a[garder]])
+        extremites.append(ordre[b[garder]])
+        longueurs.append(longueur[garder])
+
+    longueur = np.concatenate(longueurs)
+    poids = poids_min + np.rint(longueur / rayon * (poids_max - poids_min)).astype(np.int64)
+    return np.concatenate(origines), np.concatenate(extremites), poids
+
+def grille(lignes, colonnes, densite=1.0, graine=None, diagonales=False, poids_min=POIDS_MIN, poids_max=POIDS_MAX):
+    """Grille lignes x colonnes (sommet i*colonnes + j), chaque arête gardée avec probabilité `densite`."""
+    rng = np.random.default_rng(graine)
+    indices = np.arange(lignes * colonnes).reshape(lignes, colonnes)
+    paires = [(indices[:, :-1], indices[:, 1:]), (indices[:-1, :], indices[1:, :])]
+    if diagonales:
+        paires += [(indices[:-1, :-1], indices[1:, 1:]), (indices[:-1, 1:], indices[1:, :-1])]
+    origines = np.concatenate([u.ravel() for u, _ in paires])
+    extremites = np.concatenate([v.ravel() for _, v in paires])
+    if densite < 1:
+        garder = rng.random(len(origines)) < densite
+        origines, extremites = origines[garder], extremites[garder]
+    return origines, extremites, _poids(rng, len(origines), poids_min, poids_max)
+
+def dag_en_couches(n, couches, p, graine=None, poids_min=POIDS_MIN, poids_max=POIDS_MAX):
+    """Graphe orienté sans circuit : n sommets répartis en `couches` couches consécutives,
+    chaque arc d'une couche vers la suivante présent avec probabilité p."""
+    rng = np.random.default_rng(graine)
+    bornes = np.linspace(0, n, couches + 1).astype(np.int64)
+    origines, extremites = [], []
+    for k in range(couches - 1):
+        a, b = bornes[k + 1] - bornes[k], bornes[k + 2] - bornes[k + 1]
+        total = int(a * b)
+        m = total if p >= 1 else int(rng.binomial(total, p))
+        arcs = _tirer_distincts(rng, total, m)
+        origines.append(bornes[k] + arcs // b)
+        extremites.append(bornes[k + 1] + arcs % b)
+    origines = np.concatenate(origines) if origines else np.zeros(0, dtype=np.int64)
+    extremites = np.concatenate(extremites) if extremites else np.zeros(0, dtype=np.int64)
+    return origines, extremites, _poids(rng, len(origines), poids_min, poids_max)
+
+def noms_lettres(n):
+    """n noms de sommets AB, AC, ..., YZ, puis ABC, ABD... (sans limite de nombre)."""
+    tous = (''.join(comb) for taille in count(2) for comb in combinations(string.ascii_uppercase, taille))
+    return list(islice(tous, n))
@@ -0,0 +1,173 @@
+"""Représentation compacte et immuable des graphes, commune aux algorithmes.
+
+Un Graphe stocke son adjacence au format CSR dans des tableaux NumPy : les
+arcs sortant de u sont tete[debut[u]:debut[u+1]], de poids poids[...]. Avec
+des indices int32 et des poids entiers ou flottants, un arc coûte 12 octets,
+contre plusieurs centaines pour un graphe networkx avec un dictionnaire
+d'attributs par arête. Les noms des sommets sont gardés dans une seule table ;
+le graphe networkx n'est construit que pour le dessin, à la demande.
+"""
+import sys
+
+import numpy as np
+import networkx as nx
+
+def type_indice(taille):
+    """Choisit le plus petit type entier capable d'indexer `taille` éléments."""
+    return np.int32 if taille < 2**31 else np.int64
+
+def _lecture_seule(tableau):
+    """Vue en lecture seule d'un tableau (sans copie, le tableau d'origine reste modifiable)."""
+    if tableau is None:
+        return None
+    vue = tableau.view()
+    vue.flags.writeable = False
+    return vue
+
+def construire_adjacence(num_vertices, origines, extremites, poids, oriente=False):
+    """Construit une adjacence compacte (CSR) : (debut, tete, poids).
+
+    Les arcs sortant de u sont debut[u]:debut[u+1]. Un graphe non orienté
+    stocke chaque arête dans les deux sens. Avec poids=None (graphe non
+    pondéré), le troisième élément retourné est None. Si les arcs d'un graphe
+    orienté sont déjà triés par origine et de type adapté, `tete` et `poids`
+    sont les tableaux d'entrée eux-mêmes (aucune copie).
+    """
+    itype = type_indice(num_vertices)
+    # Types entiers imposés : une liste vide donnerait des float64, refusés par bincount
+    origines = np.asarray(origines, dtype=np.int64)
+    extremites = np.asarray(extremites, dtype=itype)
+    if not oriente:
+        origines, extremites = np.concatenate([origines, extremites]), np.concatenate([extremites, origines])
+    if poids is not None:
+        poids = np.asarray(poids)
+        if not oriente:
+            poids = np.concatenate([poids, poids])
+
+    debut = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(origines, minlength=num_vertices), out=debut[1:])
+    if len(origines) and np.any(origines[1:] < origines[:-1]):
+        ordre = np.argsort(origines, kind="stable")
+        extremites = extremites[ordre]
+        poids = poids[ordre] if poids is not None else None
+    return debut, extremites, poids
+
+def graphe_vers_aretes(G, attribut='weight'):
+    """Convertit un graphe networkx en tableaux d'arêtes : (noms, origines, extremites, poids)."""
+    noms = list(G.nodes())
+    indice = {nom: i for i, nom in enumerate(noms)}
+    origines = np.fromiter((indice[u] for u, _ in G.edges()), dtype=np.int64, count=G.number_of_edges())
+    extremites = np.fromiter((indice[v] for _, v in G.edges()), dtype=np.int64, count=G.number_of_edges())
+    poids = np.array([d.get(attribut, 1) for _, _, d in G.edges(data=True)])
+    return noms, origines, extremites, poids
+
+class Graphe:
+    """Graphe immuable au format CSR, avec table des noms et conversion networkx paresseuse."""
+
+    __slots__ = ("debut", "tete", "poids", "noms", "oriente", "attribut", "_indice", "_networkx")
+
+    def __init__(self, debut, tete, poids=None, noms=None, oriente=False, attribut="weight"):
+        """Enveloppe une adjacence CSR existante, sans copie des tableaux."""
+        if noms is not None:
+            noms = tuple(sys.intern(nom) if isinstance(nom, str) else nom for nom in noms)
+            if len(noms) != len(debut) - 1:
+                raise ValueError(f"{len(noms)} noms pour {len(debut) - 1} sommets.")
+        poids = np.asarray(poids) if poids is not None else None
+        object.__setattr__(self, "debut", _lecture_seule(np.asarray(debut)))
+        object.__setattr__(self, "tete", _lecture_seule(np.asarray(tete)))
+        object.__setattr__(self, "poids", _lecture_seule(poids))
+        object.__setattr__(self, "noms", noms)
+        object.__setattr__(self, "oriente", bool(oriente))
+        object.__setattr__(self, "attribut", attribut)
+        object.__setattr__(self, "_indice", None)
+        object.__setattr__(self, "_networkx", None)
+
+    def __setattr__(self, nom, valeur):
+        raise AttributeError("Un Graphe est immuable.")
+
+    @classmethod
+    def depuis_aretes(cls, num_vertices, origines, extremites, poids=None, noms=None, oriente=False,
+                      attribut="weight"):
+        """Graphe à partir de tableaux d'arêtes (indices 0..n-1)."""
+        debut, tete, poids = construire_adjacence(num_vertices, origines, extremites, poids, oriente)
+        return cls(debut, tete, poids, noms, oriente, attribut)
+
+    @classmethod
+    def depuis_networkx(cls, G, attribut="weight"):
+        """Graphe à partir d'un graphe networkx (poids lus dans `attribut`, 1 par défaut)."""
+        noms, origines, extremites, poids = graphe_vers_aretes(G, attribut)
+        return cls.depuis_aretes(len(noms), origines, extremites, poids, noms, G.is_directed(), attribut)
+
+    @property
+    def nombre_sommets(self):
+        return len(self.debut) - 1
+
+    @property
+    def nombre_arcs(self):
+        """Nombre d'arcs stockés (deux par arête d'un graphe non orienté)."""
+        return len(self.tete)
+
+    def __len__(self):
+        return self.nombre_sommets
+
+    def __contains__(self, nom):
+        return nom in self._table_indices()
+
+    def __repr__(self):
+        nature = "orienté" if self.oriente else "non orienté"
+        return f"Graphe({nature}, {self.nombre_sommets} sommets, {self.nombre_arcs} arcs)"
+
+    def _table_indices(self):
+        if self._indice is None:
+            noms = self.noms if self.noms is not None else range(self.nombre_sommets)
+            object.__setattr__(self, "_indice", {nom: i for i, nom in enumerate(noms)})
+        return self._indice
+
+    def indice(self, nom):
+        """Indice du sommet `nom` (KeyError s'il n'existe pas)."""
+        return self._table_indices()[nom]
+
+    def nom(self, i):
+        """Nom du sommet d'indice i (l'indice lui-même sans table de noms)."""
+        return self.noms[i] if self.noms is not None else int(i)
+
+    @property
+    def adjacence(self):
+        """Triplet (debut, tete, poids) attendu par les algorithmes sur CSR."""
+        return self.debut, self.tete, self.poids
+
+    def degres(self):
+        return np.diff(self.debut)
+
+    def voisins(self, u):
+        return self.tete[self.debut[u]:self.debut[u + 1]]
+
+    def aretes(self):
+        """Tableaux (origines, extremites, poids), chaque arête d'un graphe non orienté une seule fois
+        (les boucles u-u d'un graphe non orienté sont ignorées)."""
+        origines = np.repeat(np.arange(self.nombre_sommets, dtype=self.tete.dtype), self.degres())
+        if self.oriente:
+            return origines, self.tete, self.poids
+        garder = origines < self.tete
+        return origines[garder], self.tete[garder], self.poids[garder] if self.poids is not None else None
+
+    @property
+    def nbytes(self):
+        """Mémoire occupée par les tableaux CSR, en octets."""
+        return sum(t.nbytes for t in (self.debut, self.tete, self.poids) if t is not None)
+
+    def to_networkx(self):
+        """Graphe networkx équivalent, construit au premier appel puis gardé (pour le dessin)."""
+        if self._networkx is None:
+            G = nx.DiGraph() if self.oriente else nx.Graph()
+            noms = self.noms if self.noms is not None else range(self.nombre_sommets)
+            G.add_nodes_from(noms)
+            origines, extremites, poids = self.aretes()
+            paires = zip((noms[u] for u in origines.tolist()), (noms[v] for v in extremites.tolist()))
+            if poids is None:
+                G.add_edges_from(paires)
+            else:
+                G.add_weighted_edges_from(((u, v, p) for (u, v), p in zip(paires, poids.tolist())),
+                                          weight=self.attribut)
+            object.__setattr__(self, "_networkx", G)
+        return self._networkx
@@ -1,14 +1,15 @@
 from tkinter import *
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
-from WelshPowell import welsh_powell
-from Kruskal import kruskal
-from PotentielMetra import potentiel_metra
-from BellmanFord import bellman_ford
-from SteppingStone import stepping_stone_gui
-from Dijkstra import dijkstra
-from FordFulkerson import ford_fulkerson_gui
-from Nord_west_Moindre_Cout import transport_gui
+from WelshPowell import preparer_welsh_powell, solve_welsh_powell, afficher_welsh_powell
+from Kruskal import preparer_kruskal, solve_kruskal, afficher_kruskal
+from PotentielMetra import preparer_potentiel_metra, solve_potentiel_metra, afficher_potentiel_metra
+from BellmanFord import preparer_bellman_ford, solve_bellman_ford, afficher_bellman_ford
+from SteppingStone import preparer_stepping_stone, solve_stepping_stone, afficher_stepping_stone
+from Dijkstra import preparer_dijkstra, solve_dijkstra, afficher_dijkstra
+from FordFulkerson import preparer_ford_fulkerson, solve_flot_maximal, afficher_ford_fulkerson
+from Nord_west_Moindre_Cout import preparer_transport, solve_transport, afficher_transport
+from Taches import Tache
 
 # Couleurs pastel
 bg_color = "Brown"  # Fond clair
@@ -72,32 +73,76 @@ def algorithme():
     progress = ttk.Progressbar(guiA, orient=HORIZONTAL, length=400, mode='indeterminate', style="TProgressbar")
     progress.pack(pady=10)
 
-    # Fonction pour exécuter les algorithmes
-    def run_algorithm(algorithm, name):
+    # Cadre des calculs en cours (une ligne par tâche)
+    jobs_frame = Frame(guiA, bg=frame_color)
+    jobs_frame.pack(pady=10)
+    taches = []
+
+    def format_progression(tache):
+        compteurs = ", ".join(f"{cle} = {valeur}" for cle, valeur in tache.progression.items())
+        return f"{tache.nom} : {tache.duree:.1f} s" + (f" ({compteurs})" if compteurs else "")
+
+    # Scrutation d'une tâche depuis le fil de Tkinter
+    def suivre(tache, ligne, etat, afficher, contexte):
+        if not tache.terminee:
+            etat.config(text=format_progression(tache))
+            guiA.after(100, suivre, tache, ligne, etat, afficher, contexte)
+            return
+        ligne.destroy()
+        taches.remove(tache)
+        if not taches:
+            progress.stop()
+        if tache.annulee:
+            output_label.config(text=f"Algorithme {tache.nom} annulé.")
+        elif tache.erreur is not None:
+            messagebox.showerror("Erreur", f"Une erreur s'est produite : {str(tache.erreur)}")
+        else:
+            try:
+                afficher(guiA, output_label, contexte, tache.resultat)
+                if tache.resultat.get("cache") == "hit":
+                    output_label.config(text=f"Algorithme {tache.nom} : résultat repris du cache.")
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Une erreur s'est produite : {str(e)}")
+
+    # Fonction pour exécuter les algorithmes : saisie sur le fil de Tkinter,
+    # calcul en arrière-plan, affichage au retour
+    def run_algorithm(preparer, solve, afficher, name):
         try:
-            output_label.config(text=f"Exécution de l'algorithme {name}...")
-            progress.start(10)
-            guiA.update_idletasks()
-            algorithm(guiA, output_label)
+            preparation = preparer(guiA, output_label)
         except Exception as e:
             messagebox.showerror("Erreur", f"Une erreur s'est produite : {str(e)}")
-        finally:
-            progress.stop()
+            return
+        if preparation is None:
+            return
+        instance, contexte = preparation
+
+        tache = Tache(name, solve, instance).demarrer()
+        taches.append(tache)
+        ligne = Frame(jobs_frame, bg=frame_color)
+        ligne.pack(fill=X, pady=2)
+        etat = Label(ligne, text=f"{name} : démarrage...", font=("Segoe UI", 11), fg=text_color, bg=frame_color)
+        etat.pack(side=LEFT, padx=10)
+        ttk.Button(ligne, text="Annuler", command=tache.annuler).pack(side=RIGHT, padx=10)
+
+        output_label.config(text=f"Exécution de l'algorithme {name}...")
+        progress.start(10)
+        guiA.after(100, suivre, tache, ligne, etat, afficher, contexte)
 
     # Création des boutons
     algorithms = [
-        ("Welsh Powell", welsh_powell),
-        ("Kruskal", kruskal),
-        ("Potentiel Métra", potentiel_metra),
-        ("Bellman-Ford", bellman_ford),
-        ("Stepping Stone", stepping_stone_gui),
-        ("Dijkstra", dijkstra),
-        ("Ford-Fulkerson", ford_fulkerson_gui),
-        ("MN", transport_gui)
+        ("Welsh Powell", preparer_welsh_powell, solve_welsh_powell, afficher_welsh_powell),
+        ("Kruskal", preparer_kruskal, solve_kruskal, afficher_kruskal),
+        ("Potentiel Métra", preparer_potentiel_metra, solve_potentiel_metra, afficher_potentiel_metra),
+        ("Bellman-Ford", preparer_bellman_ford, solve_bellman_ford, afficher_bellman_ford),
+        ("Stepping Stone", preparer_stepping_stone, solve_stepping_stone, afficher_stepping_stone),
+        ("Dijkstra", preparer_dijkstra, solve_dijkstra, afficher_dijkstra),
+        ("Ford-Fulkerson", preparer_ford_fulkerson, solve_flot_maximal, afficher_ford_fulkerson),
+        ("MN", preparer_transport, solve_transport, afficher_transport)
     ]
 
-    for idx, (name, func) in enumerate(algorithms):
-        button = ttk.Button(button_frame, text=name, command=lambda f=func, n=name: run_algorithm(f, n))
+    for idx, (name, preparer, solve, afficher) in enumerate(algorithms):
+        button = ttk.Button(button_frame, text=name,
+                            command=lambda p=preparer, s=solve, a=afficher, n=name: run_algorithm(p, s, a, n))
         button.grid(row=idx // 4, column=idx % 4, padx=30, pady=20)
 
 # Récupérer la largeur et la hauteur de la fenêtre
@@ -1,17 +1,26 @@
+import numpy as np
 import networkx as nx
-import random
-import string
 import matplotlib.pyplot as plt
-from itertools import combinations
-from tkinter import simpledialog, Toplevel, Label
+from tkinter import simpledialog, Toplevel
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # Importer pour Tkinter
+from Rendu import dessiner_graphe
+from Generateurs import gnp, noms_lettres
+from Graphe import Graphe
+from Cache import avec_cache
+from Boruvka import boruvka_aretes
+from Visionneuse import ModeleListe, panneau_table
+
+METHODES = ("auto", "prim", "kruskal", "boruvka")
+SEUIL_BORUVKA = 1 << 17      # Arêtes à partir desquelles "auto" choisit Borůvka (graphes creux)
+SOMMETS_MAX_PRIM = 1 << 12   # Au-delà, "auto" écarte Prim dense (matrices n x n de 16 octets par case)
+INDICE_MAX = np.iinfo(np.int64).max
 
 def generer_graphe_pondere_gui(gui):
     while True:
         try:
             n = simpledialog.askinteger(
                 "Entrée",
-                "Entrez le nombre de sommets (max {}): ".format(len(string.ascii_uppercase) * (len(string.ascii_uppercase) - 1) // 2),
+                "Entrez le nombre de sommets :",
                 parent=gui,
                 minvalue=1
             )
@@ -21,76 +30,198 @@ def generer_graphe_pondere_gui(gui):
         except ValueError:
             print("Entrée invalide. Veuillez entrer un nombre entier.")
     
-    sommets = [''.join(comb) for comb in combinations(string.ascii_uppercase, 2)][:n]
-    G = nx.Graph()
-    G.add_nodes_from(sommets)
-    
-    for i in range(n):
-        for j in range(i + 1, n):
-            poids = random.randint(1, 100)
-            G.add_edge(sommets[i], sommets[j], weight=poids)
-    
-    return G
+    densite = simpledialog.askfloat("Entrée", "Entrez la densité des arêtes (0 à 1, 1 = graphe complet) :",
+                                    parent=gui, minvalue=0.0, maxvalue=1.0, initialvalue=1.0)
+    if densite is None:
+        return None
+
+    sommets = noms_lettres(n)
+    origines, extremites, poids = gnp(n, densite)
+    return Graphe.depuis_aretes(n, origines, extremites, poids, noms=sommets)
+
+def kruskal_aretes(num_vertices, origines, extremites, poids, progression=None):
+    """Kruskal vectorisé : tri des poids par argsort et union-find itératif sur tableaux.
+
+    Retourne les indices des arêtes retenues (dans l'ordre de sélection) et le coût total.
+    `progression` est appelé toutes les 10000 arêtes examinées.
+    """
+    ordre = np.argsort(poids, kind="stable")
+    origines, extremites = origines[ordre].tolist(), extremites[ordre].tolist()
+    parent = list(range(num_vertices))
+    rank = [0] * num_vertices
+    retenues = []
 
-def kruskal(gui, output_label):
-    # Générer d'abord le graphe
-    G = generer_graphe_pondere_gui(gui)
-    if G is None:
-        return
-    
-    # Exécuter l'algorithme de Kruskal
-    edges = sorted(G.edges(data=True), key=lambda x: x[2]['weight'])
-    parent = {node: node for node in G.nodes()}
-    rank = {node: 0 for node in G.nodes()}
-    
     def find(v):
-        if parent[v] != v:
-            parent[v] = find(parent[v])
-        return parent[v]
-    
-    def union(u, v):
-        root_u = find(u)
-        root_v = find(v)
-        
-        if root_u != root_v:
-            if rank[root_u] > rank[root_v]:
-                parent[root_v] = root_u
-            elif rank[root_u] < rank[root_v]:
-                parent[root_u] = root_v
-            else:
-                parent[root_v] = root_u
-                rank[root_u] += 1
-    
-    mst_edges = []
-    total_cost = 0
-    
-    for u, v, data in edges:
-        if find(u) != find(v):
-            union(u, v)
-            mst_edges.append((u, v, data['weight']))
-            total_cost += data['weight']
-    
-    # Afficher les résultats dans l'interface graphique
-    output = f"Coût total de l'arbre couvrant : {total_cost}\n"
-    output += "Les arêtes de l'arbre couvrant avec leurs poids :\n"
-    for u, v, weight in mst_edges:
-        output += f"({u}, {v}) avec poids {weight}\n"
-    
-    output_label.config(text=output)
-    
+        racine = v
+        while parent[racine] != racine:
+            racine = parent[racine]
+        while parent[v] != racine:  # Compression de chemin
+            parent[v], v = racine, parent[v]
+        return racine
+
+    for k, (u, v) in enumerate(zip(origines, extremites)):
+        if progression is not None and k % 10000 == 0:
+            progression(aretes_examinees=k, aretes_retenues=len(retenues))
+        root_u, root_v = find(u), find(v)
+        if root_u == root_v:
+            continue
+        if rank[root_u] < rank[root_v]:
+            root_u, root_v = root_v, root_u
+        parent[root_v] = root_u
+        if rank[root_u] == rank[root_v]:
+            rank[root_u] += 1
+        retenues.append(k)
+        if len(retenues) == num_vertices - 1:
+            break
+
+    retenues = ordre[retenues]
+    return retenues, poids[retenues].sum()
+
+def prim_dense(matrice, progression=None, numero=None):
+    """Prim en O(n²) sur une matrice de poids (np.inf en l'absence d'arête).
+
+    `numero` donne l'indice de l'arête de chaque case : à poids égal, l'arête
+    d'indice le plus petit est préférée, comme dans kruskal_aretes (tri stable).
+    Retourne les arêtes (parent, sommet) de la forêt couvrante minimale et le coût total.
+    `progression` est appelé tous les 1000 sommets ajoutés.
+    """
+    n = len(matrice)
+    if numero is None:
+        numero = np.broadcast_to(np.arange(n * n, dtype=np.int64).reshape(n, n), (n, n))
+    dans_arbre = np.zeros(n, dtype=bool)
+    cle = np.full(n, np.inf)
+    cle_indice = np.full(n, INDICE_MAX, dtype=np.int64)
+    parent = np.full(n, -1)
+    aretes = []
+    total = 0
+
+    for k in range(n):
+        if progression is not None and k % 1000 == 0:
+            progression(sommets=k, total=n)
+        candidats = np.where(dans_arbre, np.inf, cle)
+        u = int(np.argmin(candidats))
+        if candidats[u] == np.inf:
+            # Nouvelle composante : démarrer depuis le premier sommet hors de l'arbre
+            u = int(np.argmin(dans_arbre))
+        else:
+            # Poids minimal : départager par l'indice de l'arête
+            egaux = np.flatnonzero(candidats == candidats[u])
+            u = int(egaux[np.argmin(cle_indice[egaux])])
+            if parent[u] >= 0:
+                aretes.append((int(parent[u]), u))
+                total += matrice[parent[u], u]
+        dans_arbre[u] = True
+
+        # Mise à jour vectorisée des clés des sommets voisins, ordonnées par (poids, indice)
+        ligne, indices = matrice[u], numero[u]
+        meilleur = ~dans_arbre & ((ligne < cle) | ((ligne == cle) & (ligne < np.inf) & (indices < cle_indice)))
+        cle[meilleur] = ligne[meilleur]
+        cle_indice[meilleur] = indices[meilleur]
+        parent[meilleur] = u
+
+    return aretes, total
+
+def matrice_poids(n, origines, extremites, poids):
+    """Matrice des poids (np.inf sans arête) et des indices d'arêtes d'un graphe non orienté.
+
+    Entre deux sommets reliés par plusieurs arêtes, seule la plus légère est
+    gardée (à poids égal, celle d'indice le plus petit).
+    """
+    matrice = np.full((n, n), np.inf)
+    numero = np.full((n, n), INDICE_MAX, dtype=np.int64)
+    indices = np.arange(len(poids))
+    for u, v in ((origines, extremites), (extremites, origines)):
+        np.minimum.at(matrice, (u, v), poids)
+    for u, v in ((origines, extremites), (extremites, origines)):
+        egales = poids == matrice[u, v]
+        np.minimum.at(numero, (u[egales], v[egales]), indices[egales])
+    return matrice, numero
+
+def arbre_couvrant_minimal(num_vertices, origines, extremites, poids, seuil_densite=0.5, methode="auto",
+                           processus=None, progression=None):
+    """Calcule l'arbre couvrant minimal d'un graphe donné par ses arêtes.
+
+    `methode` vaut "prim", "kruskal", "boruvka" (réparti sur `processus`
+    processus s'il est donné, un seul sinon ; voir Boruvka.py) ou "auto" : Prim dense au-delà de
+    `seuil_densite` (les graphes générés sont complets) tant que le nombre de
+    sommets ne dépasse pas SOMMETS_MAX_PRIM, Borůvka à partir de
+    SEUIL_BORUVKA arêtes, Kruskal vectorisé sinon. Les égalités de poids étant
+    départagées par l'indice de l'arête, les trois donnent le même arbre, dans
+    l'ordre de sélection de Kruskal. Retourne les indices des arêtes retenues et le coût total.
+    """
+    n = num_vertices
+    origines = np.asarray(origines)
+    extremites = np.asarray(extremites)
+    poids = np.asarray(poids)
+    densite = 2 * len(poids) / (n * (n - 1)) if n > 1 else 0
+    if methode == "auto":
+        if densite > seuil_densite and n <= SOMMETS_MAX_PRIM:
+            methode = "prim"
+        else:
+            methode = "boruvka" if len(poids) >= SEUIL_BORUVKA else "kruskal"
+
+    if methode == "prim":
+        matrice, numero = matrice_poids(n, origines, extremites, poids)
+        aretes, _ = prim_dense(matrice, progression, numero)
+        retenues = np.array([numero[u, v] for u, v in aretes], dtype=np.int64)
+        # Même ordre que Kruskal : par poids, puis par indice
+        retenues = retenues[np.lexsort((retenues, poids[retenues]))]
+    elif methode == "kruskal":
+        retenues, _ = kruskal_aretes(n, origines, extremites, poids, progression)
+    elif methode == "boruvka":
+        retenues, _ = boruvka_aretes(n, origines, extremites, poids, processus, progression)
+    else:
+        raise ValueError(f"Méthode inconnue : {methode} (choix : {', '.join(METHODES)})")
+
+    return retenues, poids[retenues].sum()
+
+@avec_cache("kruskal")
+def solve_kruskal(num_vertices, origines, extremites, poids, noms=None, seuil_densite=0.5, methode="auto",
+                  processus=None, progression=None):
+    """Arbre couvrant minimal sans interface graphique.
+
+    `methode` et `processus` : voir arbre_couvrant_minimal. Retourne
+    {"mst_edges": [(u, v, poids), ...], "total_cost"} ; les sommets sont
+    désignés par `noms` s'ils sont fournis, par leur indice sinon.
+    """
+    noms = noms if noms is not None else range(num_vertices)
+    origines = np.asarray(origines)
+    extremites = np.asarray(extremites)
+    poids = np.asarray(poids)
+    retenues, _ = arbre_couvrant_minimal(num_vertices, origines, extremites, poids, seuil_densite, methode,
+                                         processus, progression)
+    mst_edges = [(noms[origines[k]], noms[extremites[k]], poids[k].item()) for k in retenues]
+    total_cost = sum(weight for _, _, weight in mst_edges)
+    return {"mst_edges": mst_edges, "total_cost": total_cost}
+
+def preparer_kruskal(gui, output_label):
+    """Génère le graphe ; retourne (instance, contexte) ou None si l'action est annulée."""
+    graphe = generer_graphe_pondere_gui(gui)
+    if graphe is None:
+        return None
+    origines, extremites, poids = graphe.aretes()
+    instance = {"num_vertices": graphe.nombre_sommets, "origines": origines, "extremites": extremites,
+                "poids": poids, "noms": graphe.noms}
+    return instance, {"graphe": graphe}
+
+def afficher_kruskal(gui, output_label, contexte, resultat):
+    """Affiche l'arbre couvrant minimal calculé par `solve_kruskal`."""
+    G = contexte["graphe"].to_networkx()
+    mst_edges, total_cost = resultat["mst_edges"], resultat["total_cost"]
+
+    # Résumé seulement : la liste des arêtes est dans une table virtualisée
+    resume = f"Coût total de l'arbre couvrant : {total_cost}\n{len(mst_edges)} arêtes dans l'arbre couvrant"
+    output_label.config(text=resume)
+
     # Créer une nouvelle fenêtre pour afficher le graphe et les résultats
     result_window = Toplevel(gui)
     result_window.geometry("800x600")
     result_window.title("Graphe Pondéré et Arbre Couvrant")
-    
-    # Afficher le résultat textuel dans la nouvelle fenêtre
-    result_text = f"Coût total de l'arbre couvrant : {total_cost}\n"
-    result_text += "Les arêtes de l'arbre couvrant avec leurs poids :\n"
-    for u, v, weight in mst_edges:
-        result_text += f"({u}, {v}) avec poids {weight}\n"
-    
-    result_label = Label(result_window, text=result_text, font=("Helvetica", 12), justify="left", padx=20, pady=20)
-    result_label.pack()
+
+    # Arêtes de l'arbre couvrant : seules les lignes visibles sont dessinées
+    aretes = ModeleListe(["Origine", "Extrémité", "Poids"], [[u for u, _, _ in mst_edges], [v for _, v, _ in mst_edges],
+                                                            [weight for _, _, weight in mst_edges]])
+    panneau_table(result_window, "Arbre couvrant", aretes, resume).pack(fill="x", padx=20, pady=10)
 
     # Dessiner le graphe avec l'arbre couvrant minimal
     fig = plot_graphe_gui(G, mst_edges)
@@ -100,24 +231,26 @@ def kruskal(gui, output_label):
     canvas.draw()  # Dessiner le graphe
     canvas.get_tk_widget().pack(pady=20)  # Ajouter le canvas à la fenêtre Tkinter
 
+def kruskal(gui, output_label):
+    # Générer d'abord le graphe
+    preparation = preparer_kruskal(gui, output_label)
+    if preparation is None:
+        return
+    instance, contexte = preparation
+
+    # Exécuter l'algorithme (Kruskal ou Prim selon la densité)
+    afficher_kruskal(gui, output_label, contexte, solve_kruskal(**instance))
+
 def plot_graphe_gui(G, mst_edges=None):
     """Fonction pour dessiner un graphe avec Matplotlib et NetworkX."""
-    pos = nx.spring_layout(G)
     plt.clf()
     
-    # Dessiner le graphe normal
-    nx.draw(G, pos, with_labels=True, node_color='skyblue', 
-            edge_color='gray', node_size=2000, font_size=10, 
-            font_weight='bold')
-    
-    # Si des arêtes d'arbre couvrant sont fournies, les dessiner
-    if mst_edges is not None:
-        mst_graph = nx.Graph()
-        mst_graph.add_weighted_edges_from(mst_edges)
-        nx.draw_networkx_edges(mst_graph, pos, edge_color='red', width=2)
-    
+    # Dessiner le graphe : les arêtes de l'arbre couvrant en entier, les autres allégées
+    mst_pairs = [(u, v) for u, v, _ in mst_edges] if mst_edges is not None else []
     edge_labels = nx.get_edge_attributes(G, 'weight')
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels)
+    dessiner_graphe(G, plt.gca(), aretes_importantes=mst_pairs, etiquettes=edge_labels,
+                    node_color='skyblue', couleur_fond='gray', node_size=2000,
+                    font_size=10, font_weight='bold')
     
     plt.title("Graphe Pondéré et Arbre Couvrant (MST)")
     
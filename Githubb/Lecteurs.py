@@ -0,0 +1,260 @@
+"""Lecture de graphes réels : DIMACS, listes d'arêtes CSV/TSV et format binaire CSR.
+
+Les lecteurs texte analysent le fichier par blocs de lignes et remplissent
+des tableaux NumPy au fur et à mesure, sans liste Python par arête. Le format
+binaire (.csr) écrit l'adjacence d'un Graphe telle quelle ; il s'ouvre avec
+np.memmap en quelques millisecondes, quelle que soit sa taille, et plusieurs
+processus qui ouvrent le même fichier partagent les mêmes pages en lecture.
+
+    lire_dimacs         .gr (plus courts chemins) et .max (flot maximal)
+    lire_liste_aretes   .csv / .tsv / .txt : "u v [poids]" par ligne
+    ecrire_csr          enregistre un Graphe au format binaire
+    ouvrir_csr          ouvre un fichier .csr (tableaux en lecture seule, sans copie)
+    charger_graphe      choisit le lecteur selon l'extension
+"""
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from Graphe import Graphe, type_indice
+
+TAILLE_BLOC = 1 << 22     # Octets lus par bloc de lignes (indicatif)
+
+MAGIQUE = b"GRAPHCSR"
+VERSION = 1
+ALIGNEMENT = 64
+# magique, version, drapeaux, n, m, type de tete, type de poids,
+# puis position et longueur de chaque section (debut, tete, poids, noms)
+ENTETE = struct.Struct("<8sII qq 8s8s 8q")
+ORIENTE, PONDERE, NOMME = 1, 2, 4
+
+class _Tampon:
+    """Tableau extensible rempli par blocs (capacité doublée si nécessaire)."""
+
+    def __init__(self, dtype, capacite=1024):
+        self.donnees = np.empty(max(capacite, 1), dtype=dtype)
+        self.taille = 0
+
+    def ajouter(self, valeurs):
+        fin = self.taille + len(valeurs)
+        if fin > len(self.donnees):
+            self.donnees = np.resize(self.donnees, max(fin, 2 * len(self.donnees)))
+        if valeurs.dtype.kind == "f" and self.donnees.dtype.kind != "f":
+            self.donnees = self.donnees.astype(np.float64)
+        self.donnees[self.taille:fin] = valeurs
+        self.taille = fin
+
+    def tableau(self):
+        return self.donnees[:self.taille]
+
+def _entiers(jetons):
+    return np.fromiter(map(int, jetons), dtype=np.int64, count=len(jetons))
+
+def _nombres(jetons):
+    """Colonne numérique : entiers si possible, flottants sinon."""
+    try:
+        return _entiers(jetons)
+    except ValueError:
+        return np.fromiter(map(float, jetons), dtype=np.float64, count=len(jetons))
+
+def _blocs(fichier, taille_bloc):
+    """Blocs de lignes complètes d'environ `taille_bloc` octets."""
+    while True:
+        lignes = fichier.readlines(taille_bloc)
+        if not lignes:
+            return
+        yield lignes
+
+def lire_dimacs(chemin, taille_bloc=TAILLE_BLOC):
+    """Lit un fichier DIMACS .gr (plus courts chemins) ou .max (flot maximal).
+
+    Les sommets numérotés à partir de 1 sont ramenés à 0..n-1. Retourne les
+    paramètres des fonctions solve_* : {"num_vertices", "origines", "extremites",
+    "poids", "oriente": True} pour "p sp", et {"num_vertices", "origines",
+    "extremites", "capacites", "source", "sink"} pour "p max".
+    """
+    probleme, n, m = None, 0, 0
+    noeuds = {}
+    with open(chemin, encoding="ascii") as f:
+        for lignes in _blocs(f, taille_bloc):
+            arcs = []
+            for ligne in lignes:
+                code = ligne[:1]
+                if code == "a":
+                    arcs.append(ligne[1:])
+                elif code == "p":
+                    _, probleme, n, m = ligne.split()[:4]
+                    n, m = int(n), int(m)
+                    origines, extremites = _Tampon(type_indice(n), m), _Tampon(type_indice(n), m)
+                    valeurs = _Tampon(np.int64, m)
+                elif code == "n":
+                    _, sommet, role = ligne.split()[:3]
+                    noeuds[role] = int(sommet) - 1
+            if not arcs:
+                continue
+            if probleme is None:
+                raise ValueError(f"{chemin} : arc avant la ligne 'p'.")
+            jetons = "".join(arcs).split()
+            origines.ajouter(_entiers(jetons[0::3]) - 1)
+            extremites.ajouter(_entiers(jetons[1::3]) - 1)
+            valeurs.ajouter(_nombres(jetons[2::3]))
+
+    if probleme is None:
+        raise ValueError(f"{chemin} : ligne 'p' absente.")
+    if origines.taille != m:
+        raise ValueError(f"{chemin} : {origines.taille} arcs lus, {m} annoncés.")
+    parametres = {"num_vertices": n, "origines": origines.tableau(), "extremites": extremites.tableau()}
+    if probleme == "max":
+        if "s" not in noeuds or "t" not in noeuds:
+            raise ValueError(f"{chemin} : source ('n ... s') ou puits ('n ... t') absent.")
+        parametres.update(capacites=valeurs.tableau(), source=noeuds["s"], sink=noeuds["t"])
+    else:
+        parametres.update(poids=valeurs.tableau(), oriente=True)
+    return parametres
+
+def _separateur(chemin):
+    return {".csv": ",", ".tsv": "\t"}.get(Path(chemin).suffix.lower())
+
+def lire_liste_aretes(chemin, separateur=None, entete=None, taille_bloc=TAILLE_BLOC):
+    """Lit une liste d'arêtes "u v [poids]" (CSV, TSV ou séparée par des espaces).
+
+    Si toutes les étiquettes du premier bloc sont des entiers, elles servent
+    directement d'indices ; sinon chaque étiquette reçoit un indice dans l'ordre
+    d'apparition et la table des noms est retournée. Sans colonne de poids, les
+    poids valent 1. `entete=None` saute la première ligne si sa colonne de poids
+    n'est pas numérique, ou si ses deux étiquettes ne sont pas des entiers alors
+    que celles de la ligne suivante le sont. Les étiquettes entières doivent
+    être positives ou nulles. Retourne {"num_vertices", "origines", "extremites",
+    "poids", "noms"} (noms None pour des étiquettes entières).
+    """
+    separateur = separateur or _separateur(chemin)
+    origines, extremites, poids = _Tampon(np.int64), _Tampon(np.int64), _Tampon(np.int64)
+    colonnes = None
+    entiers = None  # Étiquettes entières (True) ou textuelles (False), fixé au premier bloc
+    indices = {}    # {étiquette: indice} en mode étiquettes textuelles
+    with open(chemin, encoding="utf-8") as f:
+        for lignes in _blocs(f, taille_bloc):
+            champs = [ligne.strip().split(separateur) for ligne in lignes]
+            champs = [c for c in champs if c and c[0] and not c[0].startswith("#")]
+            if colonnes is None and champs:
+                colonnes = len(champs[0])
+                if entete or (entete is None and _est_entete(champs)):
+                    champs = champs[1:]
+            if not champs:
+                continue
+            if any(len(c) != colonnes for c in champs):
+                raise ValueError(f"{chemin} : nombre de colonnes variable (attendu {colonnes}).")
+
+            u = [c[0].strip() for c in champs]
+            v = [c[1].strip() for c in champs]
+            if entiers is None:
+                entiers = all(_est_entier(x) for x in u + v)
+            if entiers:
+                u, v = _entiers(u), _entiers(v)
+                if len(u) and min(u.min(), v.min()) < 0:
+                    raise ValueError(f"{chemin} : étiquette de sommet négative ({min(u.min(), v.min())}).")
+                origines.ajouter(u)
+                extremites.ajouter(v)
+            else:
+                origines.ajouter(np.fromiter((indices.setdefault(x, len(indices)) for x in u), np.int64, len(u)))
+                extremites.ajouter(np.fromiter((indices.setdefault(x, len(indices)) for x in v), np.int64, len(v)))
+            poids.ajouter(_nombres([c[2] for c in champs]) if colonnes >= 3 else np.ones(len(champs), np.int64))
+
+    origines, extremites = origines.tableau(), extremites.tableau()
+    if entiers is not False:
+        n = int(max(origines.max(initial=-1), extremites.max(initial=-1))) + 1
+        noms = None
+    else:
+        n, noms = len(indices), list(indices)
+    itype = type_indice(n)
+    return {"num_vertices": n, "origines": origines.astype(itype), "extremites": extremites.astype(itype),
+            "poids": poids.tableau(), "noms": noms}
+
+def _est_entier(texte):
+    return texte.lstrip("-").isdigit()
+
+def _est_entete(champs):
+    """La première ligne est-elle un en-tête (poids non numérique, ou étiquettes textuelles au-dessus d'entiers) ?"""
+    premiere = champs[0]
+    if len(premiere) >= 3 and not _est_nombre(premiere[2]):
+        return True
+    etiquettes = [x.strip() for x in premiere[:2]]
+    return (len(champs) > 1 and not all(_est_entier(x) for x in etiquettes)
+            and all(_est_entier(x.strip()) for x in champs[1][:2]))
+
+def _est_nombre(texte):
+    try:
+        float(texte)
+        return True
+    except ValueError:
+        return False
+
+def _aligner(position):
+    return -(-position // ALIGNEMENT) * ALIGNEMENT
+
+def ecrire_csr(chemin, graphe):
+    """Enregistre un Graphe au format binaire CSR (en-tête fixe, sections alignées sur 64 octets)."""
+    noms = json.dumps(list(graphe.noms), ensure_ascii=False).encode("utf-8") if graphe.noms is not None else b""
+    sections = [np.ascontiguousarray(graphe.debut, dtype=np.int64), np.ascontiguousarray(graphe.tete),
+                np.ascontiguousarray(graphe.poids) if graphe.poids is not None else np.zeros(0, np.int64)]
+    positions = []
+    position = _aligner(ENTETE.size)
+    for donnees in [*sections, noms]:
+        longueur = donnees.nbytes if isinstance(donnees, np.ndarray) else len(donnees)
+        positions += [position, longueur]
+        position = _aligner(position + longueur)
+
+    drapeaux = (ORIENTE * graphe.oriente) | (PONDERE * (graphe.poids is not None)) | (NOMME * (graphe.noms is not None))
+    entete = ENTETE.pack(MAGIQUE, VERSION, drapeaux, graphe.nombre_sommets, graphe.nombre_arcs,
+                         sections[1].dtype.str.encode(), sections[2].dtype.str.encode(), *positions)
+    with open(chemin, "wb") as f:
+        f.write(entete)
+        for (debut_section, _), donnees in zip(zip(positions[::2], positions[1::2]), [*sections, noms]):
+            f.seek(debut_section)
+            f.write(donnees.tobytes() if isinstance(donnees, np.ndarray) else donnees)
+        f.truncate(position)
+
+def ouvrir_csr(chemin, attribut="weight"):
+    """Ouvre un fichier .csr : Graphe dont les tableaux sont des np.memmap en lecture seule."""
+    with open(chemin, "rb") as f:
+        entete = f.read(ENTETE.size)
+    if len(entete) < ENTETE.size or entete[:8] != MAGIQUE:
+        raise ValueError(f"{chemin} : ce n'est pas un fichier CSR.")
+    magique, version, drapeaux, n, m, type_tete, type_poids, *positions = ENTETE.unpack(entete)
+    if version != VERSION:
+        raise ValueError(f"{chemin} : version {version} du format CSR non prise en charge.")
+
+    def section(k, dtype, nombre):
+        if nombre == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(chemin, dtype=dtype, mode="r", offset=positions[2 * k], shape=(nombre,))
+
+    debut = section(0, np.int64, n + 1)
+    tete = section(1, np.dtype(type_tete.rstrip(b"\0").decode()), m)
+    poids = section(2, np.dtype(type_poids.rstrip(b"\0").decode()), m) if drapeaux & PONDERE else None
+    noms = None
+    if drapeaux & NOMME:
+        with open(chemin, "rb") as f:
+            f.seek(positions[6])
+            noms = json.loads(f.read(positions[7]).decode("utf-8"))
+    return Graphe(debut, tete, poids, noms, oriente=bool(drapeaux & ORIENTE), attribut=attribut)
+
+def charger_graphe(chemin, oriente=None):
+    """Charge un graphe selon l'extension (.gr, .max, .csr, .csv, .tsv, .txt).
+
+    Retourne un Graphe ; pour .max, les capacités sont ses poids (attribut
+    "capacity"). Les listes d'arêtes sont non orientées sauf `oriente=True`.
+    """
+    suffixe = Path(chemin).suffix.lower()
+    if suffixe == ".csr":
+        return ouvrir_csr(chemin)
+    if suffixe in (".gr", ".max"):
+        parametres = lire_dimacs(chemin)
+        valeurs = parametres.get("poids", parametres.get("capacites"))
+        return Graphe.depuis_aretes(parametres["num_vertices"], parametres["origines"], parametres["extremites"],
+                                    valeurs, oriente=True, attribut="capacity" if suffixe == ".max" else "weight")
+    parametres = lire_liste_aretes(chemin)
+    return Graphe.depuis_aretes(parametres["num_vertices"], parametres["origines"], parametres["extremites"],
+                                parametres["poids"], parametres["noms"], oriente=bool(oriente))
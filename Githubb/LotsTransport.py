@@ -0,0 +1,151 @@
+"""Résolution parallèle de nombreux problèmes de transport.
+
+Les instances (couts, capacites, demandes) sont lues au fil de l'eau (liste ou
+générateur) et regroupées en lots : les tableaux d'un lot sont mis bout à bout
+dans des segments de mémoire partagée (voir MemoirePartagee.py), si bien que
+seuls quelques descripteurs sont sérialisés vers les processus du pool. Les
+instances d'un lot ont les mêmes types de tableaux ; une grande instance forme
+un lot à elle seule. Au plus LOTS_PAR_PROCESSUS lots par processus sont en
+cours à la fois : la mémoire reste bornée même pour un flux sans fin.
+
+Les résultats sont rendus dans l'ordre des instances ; une instance en erreur
+donne {"erreur": message} sans interrompre les autres.
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from MemoirePartagee import TableauxPartages, attacher, liberer
+from SteppingStone import simplexe_transport_creux
+from Transport import cout_total, equilibrer, formater_allocation, moindre_cout_creux, nord_ouest_creux
+
+CASES_LOT = 1 << 20          # Cases de coûts par lot
+INSTANCES_LOT = 256          # Instances par lot au plus
+LOTS_PAR_PROCESSUS = 2
+METHODES = ("stepping_stone", "moindre_cout", "nord_ouest")
+
+def resoudre_instance(couts, capacites, demandes, methode="stepping_stone"):
+    """Une instance : {"allocation", "cout"} (plus "pivots" pour Stepping Stone).
+
+    Même traitement que solve_transport / solve_stepping_stone (équilibrage,
+    allocation creuse au-delà de SEUIL_CREUX cases), sans le cache.
+    """
+    capacites, demandes = equilibrer(capacites, demandes)
+    forme = (len(capacites), len(demandes))
+    if methode == "nord_ouest":
+        allocation = nord_ouest_creux(capacites, demandes)
+    else:
+        allocation = moindre_cout_creux(couts, capacites, demandes)
+    resultat = {}
+    if methode == "stepping_stone":
+        allocation, _, resultat["pivots"] = simplexe_transport_creux(couts, allocation, forme)
+    resultat.update(allocation=formater_allocation(allocation, forme), cout=cout_total(couts, allocation))
+    return resultat
+
+def _resoudre_sans_erreur(couts, capacites, demandes, methode):
+    try:
+        return resoudre_instance(couts, capacites, demandes, methode)
+    except Exception as e:
+        return {"erreur": f"{type(e).__name__}: {e}"}
+
+def _lots(instances):
+    """Regroupe les instances en lots de tableaux bout à bout (couts, capacites, demandes, formes)."""
+    lot, cases, types_lot = [], 0, None
+    for instance in instances:
+        couts, capacites, demandes = (np.asarray(tableau) for tableau in instance)
+        types = (couts.dtype, capacites.dtype, demandes.dtype)
+        if lot and (types != types_lot or cases + couts.size > CASES_LOT or len(lot) == INSTANCES_LOT):
+            yield lot
+            lot, cases = [], 0
+        lot.append((couts, capacites, demandes))
+        cases += couts.size
+        types_lot = types
+    if lot:
+        yield lot
+
+def _partager(lot):
+    """Copie un lot en mémoire partagée."""
+    return TableauxPartages(
+        couts=np.concatenate([couts.ravel() for couts, _, _ in lot]),
+        capacites=np.concatenate([capacites for _, capacites, _ in lot]),
+        demandes=np.concatenate([demandes for _, _, demandes in lot]),
+        formes=np.array([couts.shape for couts, _, _ in lot], dtype=np.int64).reshape(len(lot), 2))
+
+def _resoudre_vues(tableaux, methode):
+    formes = tableaux["formes"].tolist()
+    resultats = []
+    o_couts = o_lignes = o_colonnes = 0
+    for m, n in formes:
+        couts = tableaux["couts"][o_couts:o_couts + m * n].reshape(m, n)
+        resultats.append(_resoudre_sans_erreur(couts, tableaux["capacites"][o_lignes:o_lignes + m],
+                                               tableaux["demandes"][o_colonnes:o_colonnes + n], methode))
+        o_couts, o_lignes, o_colonnes = o_couts + m * n, o_lignes + m, o_colonnes + n
+    return resultats
+
+def _resoudre_lot(descripteurs, methode):
+    """Tâche d'un processus : résout un lot lu en mémoire partagée."""
+    segments = []
+    try:
+        return _resoudre_vues(attacher(descripteurs, segments), methode)
+    finally:
+        liberer(segments)
+
+def resoudre_en_lots(instances, methode="stepping_stone", processus=None, progression=None):
+    """Générateur des résultats de `instances` (itérable de (couts, capacites, demandes)), dans l'ordre.
+
+    `methode` vaut "stepping_stone", "moindre_cout" ou "nord_ouest".
+    `progression` est appelé après chaque lot avec le nombre d'instances résolues.
+    """
+    if methode not in METHODES:
+        raise ValueError(f"Méthode inconnue : {methode}")
+    processus = processus or os.cpu_count() or 1
+    faites = 0
+    if processus == 1:
+        for couts, capacites, demandes in instances:
+            yield _resoudre_sans_erreur(np.asarray(couts), capacites, demandes, methode)
+            faites += 1
+            if progression is not None:
+                progression(instances=faites)
+        return
+
+    en_cours = deque()
+    with ProcessPoolExecutor(max_workers=processus) as pool:
+        try:
+            lots = _lots(instances)
+            while True:
+                # File d'attente remplie jusqu'à LOTS_PAR_PROCESSUS lots par processus
+                while len(en_cours) < LOTS_PAR_PROCESSUS * processus:
+                    lot = next(lots, None)
+                    if lot is None:
+                        break
+                    partage = _partager(lot)
+                    en_cours.append((partage, pool.submit(_resoudre_lot, partage.descripteurs, methode)))
+                if not en_cours:
+                    break
+                partage, tache = en_cours[0]
+                resultats = tache.result()
+                en_cours.popleft()
+                partage.fermer()
+                faites += len(resultats)
+                if progression is not None:
+                    progression(instances=faites)
+                yield from resultats
+        finally:
+            for partage, tache in en_cours:
+                tache.cancel()
+            for partage, _ in en_cours:
+                partage.fermer()
+
+def solve_transport_lots(instances, methode="stepping_stone", processus=None, progression=None):
+    """Résout une liste (ou un flux) d'instances de transport sur un pool de processus.
+
+    Retourne {"resultats": [{"allocation", "cout"} ou {"erreur"}, ...] dans
+    l'ordre des instances, "duree": secondes}. Pour traiter les résultats au fur
+    et à mesure sans les garder tous, utiliser `resoudre_en_lots`.
+    """
+    start = time.perf_counter()
+    resultats = list(resoudre_en_lots(instances, methode, processus, progression))
+    return {"resultats": resultats, "duree": time.perf_counter() - start}
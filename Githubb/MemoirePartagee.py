@@ -0,0 +1,102 @@
+"""Tableaux NumPy en mémoire partagée pour les pools de processus.
+
+Le processus principal copie une seule fois les tableaux (adjacence d'un
+graphe, matrice de coûts...) dans des segments multiprocessing.shared_memory ;
+les processus du pool s'y attachent par leur nom au démarrage, sans copie ni
+sérialisation des données à chaque tâche :
+
+    with TableauxPartages(debut=debut, tete=tete) as partage:
+        with ProcessPoolExecutor(initializer=initialiser, initargs=(partage.descripteurs,)) as pool:
+            ...  # dans les tâches : tableaux_partages()["tete"]
+
+Des données propres à chaque tâche s'attachent et se referment dans la tâche
+elle-même avec `attacher(descripteurs, segments)` puis `liberer(segments)`.
+
+Les segments sont détruits à la sortie du bloc `with` (ou par `fermer`).
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+class TableauxPartages:
+    """Copie de tableaux nommés en mémoire partagée ; `descripteurs` se transmet aux processus.
+
+    `tableaux` donne les vues du processus principal sur les segments, pour
+    modifier des données partagées entre deux séries de tâches.
+    """
+
+    def __init__(self, **tableaux):
+        self._segments = []
+        self.descripteurs = {}
+        self.tableaux = {}
+        try:
+            for nom, tableau in tableaux.items():
+                if tableau is None:
+                    self.descripteurs[nom] = None
+                    continue
+                tableau = np.ascontiguousarray(tableau)
+                segment = shared_memory.SharedMemory(create=True, size=max(1, tableau.nbytes))
+                self._segments.append(segment)
+                vue = np.ndarray(tableau.shape, tableau.dtype, buffer=segment.buf)
+                vue[...] = tableau
+                self.tableaux[nom] = vue
+                self.descripteurs[nom] = (segment.name, tableau.shape, tableau.dtype.str)
+        except BaseException:
+            self.fermer()
+            raise
+
+    def fermer(self):
+        """Détruit les segments (les processus attachés doivent avoir terminé)."""
+        self.tableaux = {}
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+# Segments ouverts par ce processus : gardés tant que les vues sont utilisées
+_SEGMENTS = []
+_TABLEAUX = {}
+
+def attacher(descripteurs, segments=None, modifiables=()):
+    """Vues NumPy (lecture seule) sur des segments créés par TableauxPartages dans un autre processus.
+
+    Les tableaux nommés dans `modifiables` restent accessibles en écriture :
+    aux tâches de n'y écrire que des parties disjointes.
+
+    Les segments ouverts sont ajoutés à la liste `segments` s'il y en a une (à
+    refermer par `liberer` une fois les vues abandonnées), gardés jusqu'à la fin
+    du processus sinon.
+    """
+    segments = _SEGMENTS if segments is None else segments
+    tableaux = {}
+    for nom, descripteur in descripteurs.items():
+        if descripteur is None:
+            tableaux[nom] = None
+            continue
+        nom_segment, forme, dtype = descripteur
+        segment = shared_memory.SharedMemory(name=nom_segment)
+        segments.append(segment)
+        vue = np.ndarray(forme, np.dtype(dtype), buffer=segment.buf)
+        vue.flags.writeable = nom in modifiables
+        tableaux[nom] = vue
+    return tableaux
+
+def liberer(segments):
+    """Referme des segments ouverts par `attacher` (aucune vue ne doit plus y faire référence)."""
+    while segments:
+        segments.pop().close()
+
+def initialiser(descripteurs, modifiables=()):
+    """Initialiseur de pool : attache les tableaux, lus ensuite par `tableaux_partages`."""
+    _TABLEAUX.clear()
+    _TABLEAUX.update(attacher(descripteurs, modifiables=modifiables))
+
+def tableaux_partages():
+    """Tableaux attachés par `initialiser` dans le processus courant."""
+    return _TABLEAUX
@@ -1,6 +1,10 @@
 import numpy as np
-from tabulate import tabulate
-from tkinter import simpledialog, messagebox, Toplevel, Text, Scrollbar
+from tkinter import simpledialog, messagebox
+
+from Transport import (cout_total, cout_total_dense, densifier, equilibrer, formater_allocation,
+                       moindre_cout_creux, nord_ouest_creux, tableau_couts)
+from Cache import avec_cache
+from Visionneuse import afficher_plans_transport
 
 def generate_data(nb_usines, nb_magasins, min_cost=1, max_cost=20, min_cap=10, max_cap=50):
     """Génère des données aléatoires pour les coûts, capacités et demandes."""
@@ -18,98 +22,80 @@ def generate_data(nb_usines, nb_magasins, min_cost=1, max_cost=20, min_cap=10, m
     return couts, capacites, demandes
 
 def calculer_cout_total(couts, allocation):
-    """Calcule le coût total pour une allocation donnée."""
-    return np.sum(couts * allocation)
+    """Calcule le coût total pour une allocation donnée (par blocs de lignes)."""
+    return cout_total_dense(couts, allocation)
 
 def nord_ouest(capacites, demandes):
     """Applique l'algorithme Nord-Ouest pour une allocation initiale."""
-    allocation = np.zeros((len(capacites), len(demandes)), dtype=int)
-    i, j = 0, 0
-    while i < len(capacites) and j < len(demandes):
-        alloc = min(capacites[i], demandes[j])
-        allocation[i, j] = alloc
-        capacites[i] -= alloc
-        demandes[j] -= alloc
-        if capacites[i] == 0:
-            i += 1
-        if demandes[j] == 0:
-            j += 1
-    return allocation
+    return densifier(nord_ouest_creux(capacites, demandes), (len(capacites), len(demandes)))
 
 def moindre_cout(couts, capacites, demandes):
-    """Applique l'algorithme des moindres coûts pour une allocation initiale."""
-    allocation = np.zeros_like(couts, dtype=int)
-    couts_temp = couts.astype(float)
-    while np.any(capacites) and np.any(demandes):
-        i, j = np.unravel_index(np.argmin(couts_temp, axis=None), couts_temp.shape)
-        alloc = min(capacites[i], demandes[j])
-        allocation[i, j] = alloc
-        capacites[i] -= alloc
-        demandes[j] -= alloc
-        if capacites[i] == 0:
-            couts_temp[i, :] = np.inf
-        if demandes[j] == 0:
-            couts_temp[:, j] = np.inf
-    return allocation
+    """Applique l'algorithme des moindres coûts pour une allocation initiale.
+
+    Les cases sont parcourues une seule fois par coût croissant (ordre d'un tri
+    stable, même départage que np.argmin) ; les cases d'une ligne ou d'une
+    colonne épuisée sont simplement sautées. Voir Transport.moindre_cout_creux.
+    """
+    return densifier(moindre_cout_creux(couts, capacites, demandes), (len(capacites), len(demandes)))
+
+@avec_cache("transport")
+def solve_transport(couts, capacites, demandes, progression=None):
+    """Résout un problème de transport sans interface graphique.
+
+    Retourne un dictionnaire avec les clés "nord_ouest" et "moindre_cout", chacune
+    associée à {"allocation", "cout"}. Les tableaux d'entrée ne sont pas modifiés.
+    Un problème déséquilibré reçoit une ligne ou colonne fictive (dernière de
+    l'allocation). Au-delà de SEUIL_CREUX cases, les allocations sont données
+    sous forme creuse {"lignes", "colonnes", "quantites"}.
+    """
+    couts = tableau_couts(couts)
+    capacites, demandes = equilibrer(capacites, demandes)
+    forme = (len(capacites), len(demandes))
 
-def transport_gui(gui, output_label):
-    """Fonction principale pour exécuter les algorithmes de transport via l'interface graphique."""
+    # Résolution avec Nord-Ouest
+    allocation_nord_ouest = nord_ouest_creux(capacites, demandes)
+    resultat = {"nord_ouest": {"allocation": formater_allocation(allocation_nord_ouest, forme),
+                               "cout": cout_total(couts, allocation_nord_ouest)}}
+
+    # Résolution avec Moindres Coûts
+    if progression is not None:
+        progression(etape="moindres coûts")
+    allocation_moindre_cout = moindre_cout_creux(couts, capacites, demandes)
+    resultat["moindre_cout"] = {"allocation": formater_allocation(allocation_moindre_cout, forme),
+                                "cout": cout_total(couts, allocation_moindre_cout)}
+    return resultat
+
+def preparer_transport(gui, output_label):
+    """Demande la taille du problème et génère les données ; None si l'action est annulée."""
     nb_usines = simpledialog.askinteger("Entrée", "Entrez le nombre d'usines :", parent=gui, minvalue=1)
     if nb_usines is None:  # Si l'utilisateur annule
         output_label.config(text="Action annulée par l'utilisateur.")
-        return
+        return None
 
     nb_magasins = simpledialog.askinteger("Entrée", "Entrez le nombre de magasins :", parent=gui, minvalue=1)
     if nb_magasins is None:  # Si l'utilisateur annule
         output_label.config(text="Action annulée par l'utilisateur.")
-        return
+        return None
 
     couts, capacites, demandes = generate_data(nb_usines, nb_magasins)
+    instance = {"couts": couts, "capacites": capacites, "demandes": demandes}
+    return instance, instance
 
-    # Afficher les coûts, capacités et demandes
-    output = "Coûts unitaires :\n"
-    output += tabulate(couts, 
-                       headers=[f"Magasin {j+1}" for j in range(nb_magasins)], 
-                       showindex=[f"Usine {i+1}" for i in range(nb_usines)], 
-                       tablefmt="fancy_grid")
-    output += "\n\nCapacités des usines : " + str(capacites)
-    output += "\nDemandes des magasins : " + str(demandes)
+def afficher_transport(gui, output_label, contexte, resultat):
+    """Affiche les allocations calculées par `solve_transport` dans une visionneuse à onglets.
 
-    # Résolution avec Nord-Ouest
-    allocation_nord_ouest = nord_ouest(capacites.copy(), demandes.copy())
-    cout_nord_ouest = calculer_cout_total(couts, allocation_nord_ouest)
-    output += "\n\nAllocation (Nord-Ouest) :\n"
-    output += tabulate(allocation_nord_ouest, 
-                       headers=[f"Magasin {j+1}" for j in range(nb_magasins)], 
-                       showindex=[f"Usine {i+1}" for i in range(nb_usines)], 
-                       tablefmt="fancy_grid")
-    output += f"\nCoût total (Nord-Ouest) : {cout_nord_ouest}"
+    Seules les cellules visibles sont dessinées : une instance de plusieurs
+    centaines d'usines et de magasins reste lisible et s'exporte en .npz / CSV.
+    """
+    afficher_plans_transport(gui, "Résultats des Calculs de Transport", contexte["couts"], contexte["capacites"],
+                             contexte["demandes"],
+                             [("Nord-Ouest", resultat["nord_ouest"]), ("Moindres Coûts", resultat["moindre_cout"])])
 
-    # Résolution avec Moindres Coûts
-    allocation_moindre_cout = moindre_cout(couts, capacites.copy(), demandes.copy())
-    cout_moindre_cout = calculer_cout_total(couts, allocation_moindre_cout)
-    output += "\n\nAllocation (Moindres Coûts) :\n"
-    output += tabulate(allocation_moindre_cout, 
-                       headers=[f"Magasin {j+1}" for j in range(nb_magasins)], 
-                       showindex=[f"Usine {i+1}" for i in range(nb_usines)], 
-                       tablefmt="fancy_grid")
-    output += f"\nCoût total (Moindres Coûts) : {cout_moindre_cout}"
-
-    # Création d'une nouvelle fenêtre pour afficher les résultats avec une barre de défilement
-    result_window = Toplevel(gui)
-    result_window.title("Résultats des Calculs de Transport")
-    
-    # Ajouter une barre de défilement
-    scrollbar = Scrollbar(result_window)
-    scrollbar.pack(side="right", fill="y")
-
-    # Créer un widget Text pour afficher les résultats
-    text_widget = Text(result_window, wrap="word", yscrollcommand=scrollbar.set, width=100, height=30)
-    text_widget.pack(side="left", fill="both", expand=True)
-
-    # Insérer les résultats dans le widget Text
-    text_widget.insert("1.0", output)
-    text_widget.config(state="disabled")  # Empêche l'édition du texte
-
-    # Lier la barre de défilement au widget Text
-    scrollbar.config(command=text_widget.yview)
+
+def transport_gui(gui, output_label):
+    """Fonction principale pour exécuter les algorithmes de transport via l'interface graphique."""
+    preparation = preparer_transport(gui, output_label)
+    if preparation is None:
+        return
+    instance, contexte = preparation
+    afficher_transport(gui, output_label, contexte, solve_transport(**instance))
@@ -1,8 +1,11 @@
 import random
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 from tkinter import simpledialog, Toplevel, Label
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # Importation correcte pour Tkinter
+from Rendu import dessiner_graphe
+from Cache import avec_cache
 
 def generate_task_table(num_tasks):
     """Générer un tableau de tâches avec durées et antériorités."""
@@ -13,30 +16,345 @@ def generate_task_table(num_tasks):
         tasks[f"T{i}"] = {"duration": duration, "predecessors": [f"T{p}" for p in predecessors]}
     return tasks
 
+def indexer_taches(tasks):
+    """Indexe les tâches : noms, durées et antériorités en tableaux (CSR).
+
+    Les durées gardent leur type : entières, ou flottantes si l'une d'elles l'est.
+    Retourne (noms, durees, debut_pred, predecesseurs) ; les prédécesseurs de la
+    tâche k sont predecesseurs[debut_pred[k]:debut_pred[k+1]].
+    """
+    noms = list(tasks)
+    indice = {nom: k for k, nom in enumerate(noms)}
+    durees = np.asarray([tasks[t]["duration"] for t in noms])
+    nb_pred = np.fromiter((len(tasks[t]["predecessors"]) for t in noms), dtype=np.int64, count=len(noms))
+    debut_pred = np.zeros(len(noms) + 1, dtype=np.int64)
+    np.cumsum(nb_pred, out=debut_pred[1:])
+    try:
+        predecessors = np.fromiter((indice[p] for t in noms for p in tasks[t]["predecessors"]),
+                                   dtype=np.int64, count=int(debut_pred[-1]))
+    except KeyError as e:
+        raise ValueError(f"Antériorité inconnue : {e.args[0]}") from None
+    return noms, durees, debut_pred, predecessors
+
+def ordre_topologique(n, debut_pred, predecessors):
+    """Ordre topologique (Kahn) avec index des successeurs ; lève ValueError en cas de cycle.
+
+    Retourne l'ordre et l'index des successeurs (debut_succ, successeurs).
+    """
+    taches = np.repeat(np.arange(n), np.diff(debut_pred))
+    ordre_succ = np.argsort(predecessors, kind="stable")
+    successeurs = taches[ordre_succ]
+    debut_succ = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(predecessors, minlength=n), out=debut_succ[1:])
+
+    degre = np.diff(debut_pred).tolist()
+    ds, succ = debut_succ.tolist(), successeurs.tolist()
+    ordre = [k for k in range(n) if degre[k] == 0]
+    for k in ordre:  # La liste grandit pendant le parcours
+        for s in succ[ds[k]:ds[k + 1]]:
+            degre[s] -= 1
+            if degre[s] == 0:
+                ordre.append(s)
+    if len(ordre) < n:
+        raise ValueError("Le graphe des antériorités contient un cycle.")
+    return ordre, debut_succ, successeurs
+
+def calculer_cpm(durees, debut_pred, predecessors):
+    """Méthode du chemin critique sur tableaux indexés, en deux balayages linéaires.
+
+    Retourne les tableaux des dates au plus tôt et au plus tard, les marges
+    totales, la durée totale et l'ordre topologique utilisé.
+    """
+    n = len(durees)
+    ordre, debut_succ, successeurs = ordre_topologique(n, debut_pred, predecessors)
+    d = durees.tolist()
+    dp, pred = debut_pred.tolist(), predecessors.tolist()
+    ds, succ = debut_succ.tolist(), successeurs.tolist()
+
+    # Balayage avant : dates au plus tôt
+    early = [0] * n
+    for k in ordre:
+        early[k] = max([early[p] + d[p] for p in pred[dp[k]:dp[k + 1]]], default=0)
+    total_duration = max((early[k] + d[k] for k in range(n)), default=0)
+
+    # Balayage arrière : dates au plus tard
+    late = [0] * n
+    for k in reversed(ordre):
+        late[k] = min([late[s] for s in succ[ds[k]:ds[k + 1]]], default=total_duration) - d[k]
+
+    early = np.array(early, dtype=durees.dtype)
+    late = np.array(late, dtype=durees.dtype)
+    return early, late, late - early, total_duration, ordre
+
 def calculate_potential_metra(tasks):
     """Calculer les dates au plus tôt, au plus tard, la durée totale et le chemin critique."""
-    early_start = {}
-    late_start = {}
+    noms, durees, debut_pred, predecessors = indexer_taches(tasks)
+    early, late, marges, total_duration, _ = calculer_cpm(durees, debut_pred, predecessors)
 
-    # Calcul des dates au plus tôt
-    for task in tasks:
-        predecessors = tasks[task]["predecessors"]
-        early_start[task] = max([early_start[p] + tasks[p]["duration"] for p in predecessors] + [0])
+    early_start = dict(zip(noms, early.tolist()))
+    late_start = dict(zip(noms, late.tolist()))
 
-    # Durée totale du projet
-    total_duration = max(early_start[task] + tasks[task]["duration"] for task in tasks)
+    # Chemin critique : tâches de marge nulle (à l'arrondi près pour des durées fractionnaires)
+    if np.issubdtype(marges.dtype, np.integer):
+        critiques = marges == 0
+    else:
+        critiques = np.abs(marges) <= 1e-9 * max(abs(total_duration), 1)
+    critical_path = [noms[k] for k in np.flatnonzero(critiques)]
 
-    # Calcul des dates au plus tard
-    late_start = {task: total_duration - tasks[task]["duration"] for task in tasks}
-    for task in sorted(tasks, key=lambda x: -early_start[x]):
-        successors = [t for t in tasks if task in tasks[t]["predecessors"]]
-        if successors:
-            late_start[task] = min([late_start[s] - tasks[task]["duration"] for s in successors])
+    return early_start, late_start, total_duration, critical_path
 
-    # Chemin critique
-    critical_path = [task for task in tasks if early_start[task] == late_start[task]]
+# --- Simulation de Monte Carlo (PERT stochastique) ------------------------------
 
-    return early_start, late_start, total_duration, critical_path
+LOIS = ("triangulaire", "beta_pert", "lognormale")
+QUANTILES = (0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95)
+TAILLE_BLOC = 1 << 20         # Cases (tâches x scénarios) simulées à la fois
+
+def indexer_lois(tasks, noms, durees):
+    """Lois des durées : code de loi par tâche (-1 : durée fixe) et paramètres (a, b, c).
+
+    Une tâche peut porter une clé "distribution" :
+        {"loi": "triangulaire" ou "beta_pert", "min": a, "mode": m, "max": b}
+        {"loi": "lognormale", "moyenne": mu, "ecart_type": sigma}   (de la durée elle-même)
+    sans elle, sa durée "duration" est fixe. Les paramètres sont (a, m, b) pour
+    les deux premières lois et (mu, sigma, 0) du logarithme pour la lognormale.
+    """
+    n = len(noms)
+    codes = np.full(n, -1, dtype=np.int64)
+    parametres = np.zeros((n, 3))
+    for k, nom in enumerate(noms):
+        distribution = tasks[nom].get("distribution")
+        if distribution is None:
+            continue
+        loi = distribution.get("loi")
+        if loi not in LOIS:
+            raise ValueError(f"Loi inconnue pour {nom} : {loi}")
+        if loi == "lognormale":
+            moyenne, ecart_type = float(distribution["moyenne"]), float(distribution["ecart_type"])
+            if moyenne <= 0 or ecart_type < 0:
+                raise ValueError(f"Paramètres lognormaux invalides pour {nom}.")
+            sigma2 = np.log1p((ecart_type / moyenne) ** 2)
+            parametres[k] = (np.log(moyenne) - sigma2 / 2, np.sqrt(sigma2), 0)
+        else:
+            a, m, b = float(distribution["min"]), float(distribution["mode"]), float(distribution["max"])
+            if not a <= m <= b or a < 0:
+                raise ValueError(f"Il faut 0 <= min <= mode <= max pour {nom}.")
+            if a == b:
+                durees[k] = a
+                continue
+            parametres[k] = (a, m, b)
+        codes[k] = LOIS.index(loi)
+    return codes, parametres
+
+def niveaux_topologiques(n, debut_pred, predecessors, ordre):
+    """Niveau de chaque tâche : 0 sans antériorité, 1 + le plus haut niveau de ses prédécesseurs."""
+    dp, pred = debut_pred.tolist(), predecessors.tolist()
+    niveau = [0] * n
+    for k in ordre:
+        niveau[k] = max([niveau[p] + 1 for p in pred[dp[k]:dp[k + 1]]], default=0)
+    return np.array(niveau, dtype=np.int64)
+
+def _rangs(taches, debut, voisins):
+    """Voisins des `taches` rangés par rang : [(lignes, voisins), ...].
+
+    Le rang j contient le j-ième voisin de chaque tâche qui en a au moins j + 1
+    (`lignes` indexe `taches`). Les degrés étant faibles, un max ou un min sur
+    les voisins se fait en quelques opérations sur des lignes entières.
+    """
+    longueurs = debut[taches + 1] - debut[taches]
+    rangs = []
+    for j in range(int(longueurs.max(initial=0))):
+        lignes = np.flatnonzero(longueurs > j)
+        rangs.append((lignes, voisins[debut[taches[lignes]] + j]))
+    return rangs
+
+def construire_index(n, taches, voisins):
+    """Index CSR (debut, voisins) des `voisins` de chaque tâche, triés par tâche."""
+    ordre = np.argsort(taches, kind="stable")
+    debut = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(taches, minlength=n), out=debut[1:])
+    return debut, voisins[ordre]
+
+class _Simulation:
+    """Tâches renumérotées par niveau topologique, puis par loi et par forme.
+
+    Chaque niveau occupe des lignes contiguës des matrices tâches x scénarios
+    (les balayages travaillent sur des tranches, sans copie), et à l'intérieur
+    d'un niveau chaque loi aussi (un seul tirage par groupe de lignes). Une
+    ligne supplémentaire (indice n) sert de successeur fictif aux tâches
+    finales : son début au plus tard est la durée du projet.
+    """
+
+    def __init__(self, durees, codes, parametres, debut_pred, predecessors):
+        n = len(durees)
+        ordre, _, _ = ordre_topologique(n, debut_pred, predecessors)
+        niveau = niveaux_topologiques(n, debut_pred, predecessors, ordre)
+
+        # Forme (alpha, beta) des lois bêta-PERT : un tirage gamma par forme
+        a, m, b = parametres.T
+        etendue = np.where(codes >= 0, b - a, 1)
+        formes = np.zeros((n, 2))
+        beta = codes == LOIS.index("beta_pert")
+        formes[beta, 0] = 1 + 4 * (m[beta] - a[beta]) / etendue[beta]
+        formes[beta, 1] = 1 + 4 * (b[beta] - m[beta]) / etendue[beta]
+
+        # Renumérotation : ancien indice de la ligne r = permutation[r]
+        cles = np.lexsort((formes[:, 1], formes[:, 0], codes, niveau))
+        self.permutation = cles
+        rang = np.empty(n, dtype=np.int64)
+        rang[cles] = np.arange(n)
+        self.n = n
+        self.durees = np.asarray(durees, dtype=np.float32)[cles, None]
+        self.parametres = parametres[cles]
+        self.formes = formes[cles]
+        codes, niveau = codes[cles], niveau[cles]
+
+        # Groupes de lignes tirées ensemble : même niveau, même loi, même forme bêta
+        change = (np.diff(niveau) != 0) | (np.diff(codes) != 0)
+        change |= (codes[1:] == LOIS.index("beta_pert")) & np.any(np.diff(self.formes, axis=0) != 0, axis=1)
+        coupures = np.r_[0, np.flatnonzero(change) + 1, n].tolist()
+        self.groupes = [(r0, r1, int(codes[r0])) for r0, r1 in zip(coupures[:-1], coupures[1:]) if r1 > r0]
+
+        # Adjacence dans la nouvelle numérotation ; les tâches finales ont pour successeur la ligne n
+        taches = np.repeat(np.arange(n), np.diff(debut_pred))
+        debut_pred_r, pred_r = construire_index(n, rang[taches], rang[predecessors])
+        finales = np.flatnonzero(np.bincount(rang[predecessors], minlength=n) == 0)
+        debut_succ_r, succ_r = construire_index(n, np.r_[rang[predecessors], finales],
+                                                np.r_[rang[taches], np.full(len(finales), n)])
+        bornes = np.searchsorted(niveau, np.arange(int(niveau.max(initial=-1)) + 2)).tolist()
+        self.niveaux = []
+        for l, (t0, t1) in enumerate(zip(bornes[:-1], bornes[1:])):
+            lignes = np.arange(t0, t1)
+            self.niveaux.append((t0, t1, _rangs(lignes, debut_pred_r, pred_r) if l else None,
+                                 _rangs(lignes, debut_succ_r, succ_r)))
+
+    def tirer(self, rng, D, tampon):
+        """Durées d'un bloc de scénarios, écrites dans D (tâches x scénarios, float32)."""
+        for r0, r1, code in self.groupes:
+            X = D[r0:r1]
+            if code < 0:
+                X[:] = self.durees[r0:r1]
+                continue
+            a, m, b = (self.parametres[r0:r1, i, None].astype(np.float32) for i in range(3))
+            Y = tampon[:r1 - r0]
+            if code == 0:
+                # Triangulaire de mode relatif c : c max(U, V) + (1 - c) min(U, V)
+                rng.random(out=X, dtype=np.float32)
+                rng.random(out=Y, dtype=np.float32)
+                c = (m - a) / (b - a)
+                minimum = np.minimum(X, Y)
+                np.maximum(X, Y, out=X)
+                X -= minimum
+                X *= c
+                X += minimum
+                X *= b - a
+                X += a
+            elif code == 1:
+                # Bêta-PERT : a + (b - a) G1 / (G1 + G2), G1 et G2 de loi gamma
+                alpha, beta = self.formes[r0]
+                rng.standard_gamma(alpha, out=X, dtype=np.float32)
+                rng.standard_gamma(beta, out=Y, dtype=np.float32)
+                Y += X
+                X /= Y
+                X *= b - a
+                X += a
+            else:
+                rng.standard_normal(out=X, dtype=np.float32)
+                X *= m
+                X += a
+                np.exp(X, out=X)
+
+    def balayer(self, D, F, duree, tampon):
+        """Dates au plus tôt puis au plus tard de tous les scénarios du bloc, niveau par niveau.
+
+        En entrée D contient les durées ; en sortie D contient les dates de début
+        au plus tard et F les marges totales, `duree` la durée de chaque scénario.
+        `tampon` a au moins autant de lignes que le plus grand niveau.
+        """
+        # Balayage avant : fin au plus tôt = max des fins des prédécesseurs + durée
+        for t0, t1, preds, _ in self.niveaux:
+            fin = F[t0:t1]
+            if preds is None:
+                fin[:] = D[t0:t1]
+                continue
+            (_, premiers), *autres = preds
+            np.take(F, premiers, axis=0, out=fin, mode="clip")
+            for lignes, voisins in autres:
+                fin[lignes] = np.maximum(fin[lignes], F[voisins])
+            fin += D[t0:t1]
+        np.max(F[:self.n], axis=0, out=duree, initial=0)
+        D[self.n] = duree
+
+        # Balayage arrière : début au plus tard (écrit dans D) = min des débuts au plus
+        # tard des successeurs - durée ; la marge (écrite dans F, dont les fins au plus
+        # tôt ne servent plus) vaut fin au plus tard - fin au plus tôt
+        for t0, t1, _, succ in reversed(self.niveaux):
+            fin_tard = tampon[:t1 - t0]
+            (_, premiers), *autres = succ
+            np.take(D, premiers, axis=0, out=fin_tard, mode="clip")
+            for lignes, voisins in autres:
+                fin_tard[lignes] = np.minimum(fin_tard[lignes], D[voisins])
+            np.subtract(fin_tard, F[t0:t1], out=F[t0:t1])
+            np.subtract(fin_tard, D[t0:t1], out=D[t0:t1])
+
+def simuler_pert(durees, codes, parametres, debut_pred, predecessors, scenarios, graine=None,
+                 taille_bloc=TAILLE_BLOC, progression=None):
+    """Simulation de Monte Carlo du projet par blocs de scénarios.
+
+    Chaque bloc tire les durées de toutes les tâches pour un groupe de scénarios
+    (matrice tâches x scénarios en float32) puis calcule dates au plus tôt et au
+    plus tard par opérations vectorisées, niveau topologique par niveau : le
+    nombre d'opérations NumPy dépend de la profondeur du graphe et des degrés,
+    pas du nombre de scénarios. Retourne (durées du projet par scénario, nombre de scénarios
+    où chaque tâche est critique).
+    """
+    simulation = _Simulation(durees, codes, parametres, debut_pred, predecessors)
+    n = simulation.n
+    rng = np.random.default_rng(graine)
+    durees_projet = np.empty(scenarios)
+    critiques = np.zeros(n, dtype=np.int64)
+    pas = max(1, taille_bloc // (n + 1))
+    D = None
+    for s0 in range(0, scenarios, pas):
+        s1 = min(s0 + pas, scenarios)
+        if D is None or D.shape[1] != s1 - s0:
+            D, F = np.empty((n + 1, s1 - s0), dtype=np.float32), np.empty((n, s1 - s0), dtype=np.float32)
+            tampon = np.empty((max((t1 - t0 for t0, t1, _, _ in simulation.niveaux), default=0), s1 - s0),
+                              dtype=np.float32)
+            duree = np.empty(s1 - s0, dtype=np.float32)
+        simulation.tirer(rng, D, tampon)
+        simulation.balayer(D, F, duree, tampon)
+        durees_projet[s0:s1] = duree
+        # Marge nulle à l'arrondi float32 près : tâche critique dans ce scénario
+        critiques += np.count_nonzero(F <= 1e-5 * np.maximum(duree, 1), axis=1)
+        if progression is not None:
+            progression(scenarios=s1, total=scenarios)
+    resultat = np.empty(n, dtype=np.int64)
+    resultat[simulation.permutation] = critiques
+    return durees_projet, resultat
+
+@avec_cache("pert_monte_carlo", condition=lambda parametres: parametres["graine"] is not None)
+def solve_pert_monte_carlo(tasks, scenarios=10000, graine=0, quantiles=QUANTILES, progression=None):
+    """PERT stochastique : distribution de la durée du projet et indice de criticité des tâches.
+
+    Les tâches portent une "distribution" (voir indexer_lois) ou une durée fixe.
+    Retourne {"durees" (durée du projet par scénario), "moyenne", "ecart_type",
+    "quantiles": {p: durée tenue avec la probabilité p}, "criticite": {tâche:
+    part des scénarios où elle est critique}, "duree_deterministe"} ; cette
+    dernière est la durée du calcul classique sur les durées "duration".
+    La graine rend le résultat reproductible, et donc mis en cache ; avec
+    graine=None, chaque appel est une nouvelle simulation, jamais mise en cache.
+    """
+    noms, durees, debut_pred, predecessors = indexer_taches(tasks)
+    _, _, _, duree_deterministe, _ = calculer_cpm(durees, debut_pred, predecessors)
+    durees = durees.astype(float)
+    codes, parametres = indexer_lois(tasks, noms, durees)
+    durees_projet, critiques = simuler_pert(durees, codes, parametres, debut_pred, predecessors, scenarios,
+                                            graine, progression=progression)
+    return {"durees": durees_projet, "moyenne": float(durees_projet.mean()),
+            "ecart_type": float(durees_projet.std()),
+            "quantiles": {float(p): float(q) for p, q in zip(quantiles, np.quantile(durees_projet, quantiles))},
+            "criticite": dict(zip(noms, (critiques / scenarios).tolist())),
+            "duree_deterministe": duree_deterministe}
 
 def plot_potential_metra(tasks, early_start, total_duration, critical_path):
     """Afficher un graphe du potentiel Métra avec NetworkX."""
@@ -45,22 +363,24 @@ def plot_potential_metra(tasks, early_start, total_duration, critical_path):
         for predecessor in details["predecessors"]:
             G.add_edge(predecessor, task)
 
-    pos = nx.spring_layout(G)
-    node_colors = ["red" if node in critical_path else "skyblue" for node in G.nodes]
-    edge_colors = [
-        "red" if (u in critical_path and v in critical_path and early_start[v] == early_start[u] + tasks[u]["duration"]) else "black"
-        for u, v in G.edges
+    critiques = set(critical_path)
+    node_colors = ["red" if node in critiques else "skyblue" for node in G.nodes]
+    critical_edges = [
+        (u, v) for u, v in G.edges
+        if u in critiques and v in critiques and early_start[v] == early_start[u] + tasks[u]["duration"]
     ]
     labels = {node: f"{node}\n{early_start[node]}" for node in G.nodes}
 
+    # Disposition en couches topologiques, mise en cache par instance
     plt.figure(figsize=(12, 8))
-    nx.draw(
+    dessiner_graphe(
         G,
-        pos,
-        with_labels=True,
+        plt.gca(),
+        aretes_importantes=critical_edges,
+        structure="dag",
         labels=labels,
         node_color=node_colors,
-        edge_color=edge_colors,
+        couleur_fond="black",
         node_size=3000,
         font_size=10,
         font_weight="bold"
@@ -70,17 +390,33 @@ def plot_potential_metra(tasks, early_start, total_duration, critical_path):
     # Renvoie la figure pour intégration dans Tkinter
     return plt
 
-def potentiel_metra(gui, output_label):
-    """Fonction principale pour exécuter l'algorithme du Potentiel Métra via l'interface graphique."""
+@avec_cache("potentiel_metra")
+def solve_potentiel_metra(tasks, progression=None):
+    """Potentiel Métra sans interface graphique à partir d'une table de tâches.
+
+    Retourne {"early_start", "late_start", "total_duration", "critical_path"}.
+    """
+    if progression is not None:
+        progression(taches=len(tasks))
+    early_start, late_start, total_duration, critical_path = calculate_potential_metra(tasks)
+    return {"early_start": early_start, "late_start": late_start,
+            "total_duration": total_duration, "critical_path": critical_path}
+
+def preparer_potentiel_metra(gui, output_label):
+    """Génère la table des tâches ; retourne (instance, contexte) ou None si l'action est annulée."""
     num_tasks = simpledialog.askinteger("Entrée", "Entrez le nombre de tâches :", parent=gui, minvalue=1)
     if num_tasks is None:  # Si l'utilisateur annule
         output_label.config(text="Action annulée par l'utilisateur.")
-        return
+        return None
 
     tasks = generate_task_table(num_tasks)
+    return {"tasks": tasks}, {"tasks": tasks}
 
-    # Calcul du potentiel Métra
-    early_start, late_start, total_duration, critical_path = calculate_potential_metra(tasks)
+def afficher_potentiel_metra(gui, output_label, contexte, resultat):
+    """Affiche les résultats calculés par `solve_potentiel_metra`."""
+    tasks = contexte["tasks"]
+    early_start, late_start = resultat["early_start"], resultat["late_start"]
+    total_duration, critical_path = resultat["total_duration"], resultat["critical_path"]
 
     # Créer une nouvelle fenêtre pour afficher les résultats
     result_window = Toplevel(gui)
@@ -103,3 +439,13 @@ def potentiel_metra(gui, output_label):
     canvas = FigureCanvasTkAgg(fig.gcf(), master=result_window)  # Utiliser gcf() pour obtenir la figure courante
     canvas.draw()  # Dessiner le graphe
     canvas.get_tk_widget().pack(pady=20)  # Ajouter le canvas à la fenêtre Tkinter
+
+def potentiel_metra(gui, output_label):
+    """Fonction principale pour exécuter l'algorithme du Potentiel Métra via l'interface graphique."""
+    preparation = preparer_potentiel_metra(gui, output_label)
+    if preparation is None:
+        return
+    instance, contexte = preparation
+
+    # Calcul du potentiel Métra
+    afficher_potentiel_metra(gui, output_label, contexte, solve_potentiel_metra(**instance))
@@ -0,0 +1,143 @@
+"""Rendu des graphes avec niveau de détail et dispositions en cache.
+
+Les graphes générés sont complets : dessiner toutes les arêtes et toutes les
+étiquettes coûte bien plus cher que le calcul. Ce module choisit une
+disposition selon la structure du graphe, la garde en cache, dessine en entier
+seulement les arêtes importantes (chemin, arbre couvrant, coupe) et remplace le
+dessin par une image de densité au-delà d'une certaine taille.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import networkx as nx
+
+SEUIL_DETAIL = 60        # Au-delà, sommets réduits et sans étiquettes
+SEUIL_IMAGE = 500        # Au-delà, image de densité de la matrice d'adjacence
+MAX_ARETES_FOND = 2000   # Arêtes non importantes dessinées au plus
+MAX_ETIQUETTES = 60      # Étiquettes d'arêtes dessinées au plus
+TAILLE_CACHE = 16
+
+_cache_dispositions = OrderedDict()
+
+def cle_graphe(G, structure=None):
+    """Clé de cache d'un graphe : sommets, arêtes, orientation et structure."""
+    return hash((structure, G.is_directed(), tuple(G.nodes()), tuple(G.edges())))
+
+def _disposition_en_couches(G):
+    """Disposition en couches topologiques (graphe orienté sans circuit, ex. Métra)."""
+    pos = {}
+    for x, couche in enumerate(nx.topological_generations(G)):
+        for k, node in enumerate(sorted(couche, key=str)):
+            pos[node] = np.array([x, k - (len(couche) - 1) / 2])
+    return pos
+
+def calculer_disposition(G, structure=None):
+    """Choisit et calcule une disposition selon la structure du graphe.
+
+    "dag" : couches topologiques ; petits graphes : spring ; grands graphes
+    denses : cercle ; grands graphes creux : spectrale (cercle si scipy manque).
+    """
+    n = G.number_of_nodes()
+    if structure == "dag" and nx.is_directed_acyclic_graph(G):
+        return _disposition_en_couches(G)
+    if n <= 100:
+        return nx.spring_layout(G, seed=42)
+    if nx.density(G) > 0.1:
+        return nx.circular_layout(G)
+    try:
+        return nx.spectral_layout(G)
+    except ImportError:
+        return nx.circular_layout(G)
+
+def disposition(G, structure=None):
+    """Disposition de G, calculée une seule fois par instance (cache LRU)."""
+    cle = cle_graphe(G, structure)
+    if cle in _cache_dispositions:
+        _cache_dispositions.move_to_end(cle)
+        return _cache_dispositions[cle]
+    pos = calculer_disposition(G, structure)
+    _cache_dispositions[cle] = pos
+    if len(_cache_dispositions) > TAILLE_CACHE:
+        _cache_dispositions.popitem(last=False)
+    return pos
+
+def _normaliser(G, aretes):
+    """Arêtes importantes exprimées dans l'orientation de G.edges()."""
+    if G.is_directed():
+        return [(u, v) for u, v in aretes if G.has_edge(u, v)]
+    vues = set()
+    resultat = []
+    for u, v in aretes:
+        if G.has_edge(u, v) and (u, v) not in vues:
+            vues.update({(u, v), (v, u)})
+            resultat.append((u, v))
+    return resultat
+
+def aretes_de_fond(G, importantes, maximum=MAX_ARETES_FOND, attribut="weight"):
+    """Arêtes non importantes à dessiner, limitées aux `maximum` plus légères."""
+    exclues = set(importantes)
+    if not G.is_directed():
+        exclues |= {(v, u) for u, v in importantes}
+    fond = [(u, v, d.get(attribut, 0)) for u, v, d in G.edges(data=True) if (u, v) not in exclues]
+    if len(fond) > maximum:
+        fond.sort(key=lambda arete: arete[2])
+        fond = fond[:maximum]
+    return [(u, v) for u, v, _ in fond]
+
+def dessiner_densite(G, ax, aretes_importantes=(), resolution=512, couleur_importante="red"):
+    """Image de densité de la matrice d'adjacence, arêtes importantes en surimpression."""
+    noms = list(G.nodes())
+    n = len(noms)
+    indice = {nom: i for i, nom in enumerate(noms)}
+    cases = min(n, resolution)
+    origines = np.fromiter((indice[u] for u, _ in G.edges()), dtype=np.int64)
+    extremites = np.fromiter((indice[v] for _, v in G.edges()), dtype=np.int64)
+
+    image = np.zeros((cases, cases))
+    np.add.at(image, (origines * cases // n, extremites * cases // n), 1)
+    if not G.is_directed():
+        np.add.at(image, (extremites * cases // n, origines * cases // n), 1)
+    ax.imshow(image, cmap="Greys", interpolation="nearest")
+
+    importantes = _normaliser(G, aretes_importantes)
+    if importantes:
+        x = [indice[v] * cases // n for _, v in importantes]
+        y = [indice[u] * cases // n for u, _ in importantes]
+        ax.scatter(x, y, s=4, c=couleur_importante)
+    ax.set_xlabel(f"{n} sommets, {G.number_of_edges()} arêtes")
+
+def dessiner_graphe(G, ax, aretes_importantes=(), etiquettes=None, structure=None,
+                    node_color="lightblue", couleur_importante="red", couleur_fond="gray",
+                    labels=None, node_size=500, font_size=10, font_weight="normal"):
+    """Dessine G avec niveau de détail ; retourne la disposition (None pour une image).
+
+    Les `aretes_importantes` sont toujours dessinées en entier ; les autres sont
+    allégées et plafonnées. Les `etiquettes` ({(u, v): texte}) ne sont toutes
+    affichées que pour les petits graphes, sinon seulement sur les arêtes importantes.
+    """
+    n = G.number_of_nodes()
+    if n > SEUIL_IMAGE:
+        dessiner_densite(G, ax, aretes_importantes, couleur_importante=couleur_importante)
+        return None
+
+    pos = disposition(G, structure)
+    importantes = _normaliser(G, aretes_importantes)
+    fond = aretes_de_fond(G, importantes)
+    detail = n <= SEUIL_DETAIL
+
+    nx.draw_networkx_nodes(G, pos, node_color=node_color, ax=ax,
+                           node_size=node_size if detail else max(10, node_size * SEUIL_DETAIL // n))
+    if detail:
+        nx.draw_networkx_labels(G, pos, labels=labels, font_size=font_size, font_weight=font_weight, ax=ax)
+    nx.draw_networkx_edges(G, pos, edgelist=fond, edge_color=couleur_fond, ax=ax,
+                           width=1.0 if detail else 0.3, alpha=1.0 if detail else 0.3)
+    if importantes:
+        nx.draw_networkx_edges(G, pos, edgelist=importantes, edge_color=couleur_importante, width=2, ax=ax)
+
+    if etiquettes:
+        if G.number_of_edges() > MAX_ETIQUETTES:
+            garder = set(importantes[:MAX_ETIQUETTES])
+            etiquettes = {e: t for e, t in etiquettes.items() if e in garder or e[::-1] in garder}
+        nx.draw_networkx_edge_labels(G, pos, edge_labels=etiquettes, ax=ax)
+    ax.set_axis_off()
+    return pos
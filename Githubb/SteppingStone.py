@@ -1,6 +1,11 @@
 import numpy as np
-from tabulate import tabulate
-from tkinter import simpledialog, messagebox, Toplevel, Text, Scrollbar
+from tkinter import simpledialog, messagebox
+
+from Transport import (TAILLE_BLOC, CoutsModifies, blocs_de_lignes, cases_par_cout, cout_total, couts_cases,
+                       cout_total_dense, densifier, equilibrer, formater_allocation, moindre_cout_creux, nord_ouest_creux,
+                       tableau_couts)
+from Cache import avec_cache
+from Visionneuse import afficher_plans_transport
 
 def generate_data(nb_usines, nb_magasins, min_cost=1, max_cost=20, min_cap=10, max_cap=50):
     """Génère des données aléatoires pour les coûts, capacités et demandes."""
@@ -18,189 +23,490 @@ def generate_data(nb_usines, nb_magasins, min_cost=1, max_cost=20, min_cap=10, m
     return couts, capacites, demandes
 
 def calculer_cout_total(couts, allocation):
-    """Calcule le coût total pour une allocation donnée."""
-    return np.sum(couts * allocation)
+    """Calcule le coût total pour une allocation donnée (par blocs de lignes)."""
+    return cout_total_dense(couts, allocation)
 
 def nord_ouest(capacites, demandes):
     """Applique l'algorithme Nord-Ouest pour une allocation initiale."""
-    allocation = np.zeros((len(capacites), len(demandes)), dtype=int)
-    i, j = 0, 0
-    while i < len(capacites) and j < len(demandes):
-        alloc = min(capacites[i], demandes[j])
-        allocation[i, j] = alloc
-        capacites[i] -= alloc
-        demandes[j] -= alloc
-        if capacites[i] == 0:
-            i += 1
-        if demandes[j] == 0:
-            j += 1
-    return allocation
+    return densifier(nord_ouest_creux(capacites, demandes), (len(capacites), len(demandes)))
 
 def moindre_cout(couts, capacites, demandes):
-    """Applique l'algorithme des moindres coûts pour une allocation initiale."""
-    allocation = np.zeros_like(couts, dtype=int)
-    couts_temp = couts.astype(float)
-    while np.any(capacites) and np.any(demandes):
-        i, j = np.unravel_index(np.argmin(couts_temp, axis=None), couts_temp.shape)
-        alloc = min(capacites[i], demandes[j])
-        allocation[i, j] = alloc
-        capacites[i] -= alloc
-        demandes[j] -= alloc
-        if capacites[i] == 0:
-            couts_temp[i, :] = np.inf
-        if demandes[j] == 0:
-            couts_temp[:, j] = np.inf
-    return allocation
-
-def stepping_stone(couts, allocation):
-    """Applique l'algorithme Stepping Stone pour optimiser l'allocation."""
+    """Applique l'algorithme des moindres coûts pour une allocation initiale.
+
+    Les cases sont parcourues une seule fois par coût croissant (ordre d'un tri
+    stable, même départage que np.argmin) ; les cases d'une ligne ou d'une
+    colonne épuisée sont simplement sautées. Voir Transport.moindre_cout_creux.
+    """
+    return densifier(moindre_cout_creux(couts, capacites, demandes), (len(capacites), len(demandes)))
+
+def _construire_base(couts, cases, rows, cols):
+    """Base (arbre couvrant de rows+cols-1 cases) contenant les cases allouées `cases`."""
+    parent = list(range(rows + cols))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def relier(i, j):
+        ri, rj = find(i), find(rows + j)
+        if ri == rj:
+            return False
+        parent[ri] = rj
+        base.add((i, j))
+        return True
+
+    base = set()
+    for i, j in cases:
+        if not relier(i, j):
+            raise ValueError("L'allocation initiale n'est pas une solution de base (cycle de cases allouées).")
+
+    if len(base) < rows + cols - 1:
+        # Solution dégénérée : compléter l'arbre avec des cases vides de coût minimal,
+        # puis au besoin avec les cases (de coût nul) de la ligne ou colonne fictive
+        m, n = couts.shape
+        for lot in cases_par_cout(couts):
+            for k in lot.tolist():
+                if relier(*divmod(k, n)) and len(base) == rows + cols - 1:
+                    return base
+        fictives = [(i, n) for i in range(rows)] if cols > n else [(m, j) for j in range(cols)] if rows > m else []
+        for i, j in fictives:
+            if relier(i, j) and len(base) == rows + cols - 1:
+                break
+    return base
+
+def construire_base(couts, allocation):
+    """Construit une base (arbre couvrant de m+n-1 cases) à partir d'une allocation initiale.
+
+    Les lignes sont les nœuds 0..m-1 et les colonnes les nœuds m..m+n-1 de l'arbre.
+    Les cases allouées forment la base ; si la solution est dégénérée, des cases
+    de coût minimal à allocation nulle sont ajoutées pour relier les composantes.
+    """
     rows, cols = allocation.shape
-    couts = couts.astype(float)  # S'assurer que les coûts sont en float
+    return _construire_base(couts, ((int(i), int(j)) for i, j in zip(*np.nonzero(allocation))), rows, cols)
+
+def calculer_potentiels(couts, base, rows, cols):
+    """Calcule les potentiels u (lignes) et v (colonnes) tels que u[i] + v[j] = c[i, j] sur la base."""
+    voisins = [[] for _ in range(rows + cols)]
+    for i, j in base:
+        voisins[i].append(rows + j)
+        voisins[rows + j].append(i)
+    # Coûts des cases de la base lus en une fois (la matrice peut être un memmap)
+    cases = list(base)
+    cout = dict(zip(cases, couts_cases(couts, [i for i, _ in cases], [j for _, j in cases]).tolist()))
+
+    potentiel = np.zeros(rows + cols)
+    visite = [False] * (rows + cols)
+    visite[0] = True
+    pile = [0]
+    while pile:
+        x = pile.pop()
+        for y in voisins[x]:
+            if not visite[y]:
+                visite[y] = True
+                i, j = (x, y - rows) if x < rows else (y, x - rows)
+                potentiel[y] = cout[i, j] - potentiel[x]
+                pile.append(y)
+    return potentiel[:rows], potentiel[rows:], voisins
+
+def trouver_cycle(voisins, rows, entree):
+    """Trouve le cycle créé par la case entrante en parcourant l'arbre de la base.
+
+    Retourne la liste des cases du cycle, la case entrante en premier ;
+    les cases d'indice pair reçoivent +theta, celles d'indice impair -theta.
+    """
+    i, j = entree
+    depart, arrivee = rows + j, i
+    precedent = {depart: None}
+    pile = [depart]
+    while pile:
+        x = pile.pop()
+        if x == arrivee:
+            break
+        for y in voisins[x]:
+            if y not in precedent:
+                precedent[y] = x
+                pile.append(y)
+
+    # Remonter le chemin de la ligne i jusqu'à la colonne j
+    chemin = [arrivee]
+    while precedent[chemin[-1]] is not None:
+        chemin.append(precedent[chemin[-1]])
+    chemin.reverse()  # colonne j -> ... -> ligne i
+
+    cycle = [entree]
+    for x, y in zip(chemin[:-1], chemin[1:]):
+        cycle.append((x, y - rows) if x < rows else (y, x - rows))
+    return cycle
+
+def _case_entrante(couts, u, v, rows, cols, depart, tolerance, taille_bloc):
+    """Case de coût réduit négatif, cherchée bloc de lignes par bloc de lignes.
+
+    Les blocs sont parcourus en rond à partir du bloc `depart` (celui du pivot
+    précédent) et la recherche s'arrête au premier bloc qui contient une case
+    améliorante : on prend la case de plus petit coût réduit de ce bloc. Sur une
+    petite instance il n'y a qu'un bloc et c'est la règle de Dantzig. Retourne
+    ((i, j), bloc) ou (None, depart) si la solution est optimale.
+    """
+    m, n = couts.shape
+    blocs = list(blocs_de_lignes(m, n, taille_bloc))
+    fictives = (["colonne"] if cols > n else []) + (["ligne"] if rows > m else [])
+    for t in range(len(blocs) + len(fictives)):
+        b = (depart + t) % (len(blocs) + len(fictives))
+        if b < len(blocs):
+            r0, r1 = blocs[b]
+            c = np.asarray(couts[r0:r1], dtype=float)
+            couts_reduits = c - u[r0:r1, None] - v[None, :n]
+            i, j = divmod(int(np.argmin(couts_reduits)), n)
+            if couts_reduits[i, j] < -tolerance * (1 + abs(c[i, j])):
+                return (r0 + i, j), b
+        elif fictives[b - len(blocs)] == "colonne":
+            couts_reduits = -u - v[n]  # Colonne fictive (coin fictif compris), coût nul
+            i = int(np.argmin(couts_reduits))
+            if couts_reduits[i] < -tolerance:
+                return (i, n), b
+        else:
+            couts_reduits = -u[m] - v[:n]  # Ligne fictive, coût nul
+            j = int(np.argmin(couts_reduits))
+            if couts_reduits[j] < -tolerance:
+                return (m, j), b
+    return None, depart
+
+def _simplexe(couts, flux, base, rows, cols, tolerance, progression, taille_bloc):
+    """Pivots du simplexe sur une allocation creuse `flux` ({case: quantité}, modifiée sur place)."""
+    pivots = 0
+    bloc = 0
     while True:
-        # Étape 1 : Identifier les cases non allouées
-        empty_cells = [(i, j) for i in range(rows) for j in range(cols) if allocation[i, j] == 0]
-
-        # Étape 2 : Tester chaque case vide pour des cycles d'amélioration
-        best_improvement = 0
-        best_allocation = allocation.copy()
-        
-        for cell in empty_cells:
-            # Trouver un cycle fermé pour la case vide
-            cycle, gain = find_cycle_and_gain(couts, allocation, cell)
-            if cycle and gain < best_improvement:
-                best_improvement = gain
-                best_allocation = adjust_allocation(allocation, cycle)
-
-        # Étape 3 : Appliquer la meilleure amélioration si possible
-        if best_improvement >= 0:
-            break  # Pas d'amélioration possible, la solution est optimale
-        allocation = best_allocation
+        # Étape 1 : potentiels calculés une fois par pivot sur l'arbre de la base
+        u, v, voisins = calculer_potentiels(couts, base, rows, cols)
 
-    return allocation
+        # Étape 2 : coûts réduits par blocs de lignes, sans copie de la matrice
+        entree, bloc = _case_entrante(couts, u, v, rows, cols, bloc, tolerance, taille_bloc)
+        if entree is None:
+            break  # Pas d'amélioration possible, la solution est optimale
 
-def find_cycle_and_gain(couts, allocation, start_cell):
-    """Trouve un cycle fermé et calcule le gain pour une case vide."""
+        # Étape 3 : cycle de la case entrante et quantité déplacée
+        cycle = trouver_cycle(voisins, rows, entree)
+        cases_moins = cycle[1::2]
+        sortante = min(cases_moins, key=lambda case: flux.get(case, 0))
+        theta = flux.get(sortante, 0)
+
+        for k, case in enumerate(cycle):
+            flux[case] = flux.get(case, 0) + (theta if k % 2 == 0 else -theta)
+        del flux[sortante]
+
+        base.remove(sortante)
+        base.add(entree)
+        pivots += 1
+        if progression is not None:
+            progression(pivots=pivots)
+    return pivots
+
+def simplexe_transport(couts, allocation, base=None, tolerance=1e-9, progression=None, taille_bloc=TAILLE_BLOC):
+    """Méthode du simplexe de transport (MODI / potentiels u-v).
+
+    Part d'une solution de base (Nord-Ouest ou moindres coûts) et effectue des
+    pivots tant qu'un coût réduit est négatif. Retourne l'allocation optimale,
+    la base finale et le nombre de pivots effectués. `progression`, s'il est
+    fourni, est appelé après chaque pivot avec le nombre de pivots.
+
+    La matrice des coûts peut être un np.memmap : elle n'est lue que par blocs
+    de `taille_bloc` cases. Une allocation avec une ligne ou une colonne de plus
+    que les coûts (voir Transport.equilibrer) traite celle-ci comme fictive.
+    """
     rows, cols = allocation.shape
-    visited = set()
-    cycle = []
-
-    def dfs(cell, path):
-        if cell in visited:
-            if cell == start_cell and len(path) >= 4:  # Cycle trouvé
-                return path
-            return None
-
-        visited.add(cell)
-        row, col = cell
-
-        # Explorer les cases dans la même ligne et colonne
-        for next_cell in [(row, c) for c in range(cols)] + [(r, col) for r in range(rows)]:
-            if next_cell != cell and allocation[next_cell] > 0 or next_cell == start_cell:
-                new_path = dfs(next_cell, path + [cell])
-                if new_path:
-                    return new_path
-
-        visited.remove(cell)
-        return None
-
-    # Trouver un cycle en démarrant du point
-    cycle = dfs(start_cell, [])
-
-    if not cycle:
-        return None, 0
-
-    # Calculer le gain net du cycle
-    gain = calculate_cycle_gain(couts, allocation, cycle)
-    return cycle, gain
-
-def calculate_cycle_gain(couts, allocation, cycle):
-    """Calcule le gain net pour un cycle donné."""
-    gain = 0
-    for k, (i, j) in enumerate(cycle):
-        sign = 1 if k % 2 == 0 else -1  # Alterner entre + et -
-        gain += sign * couts[i, j]
-    return gain
-
-def adjust_allocation(allocation, cycle):
-    """Ajuste l'allocation le long d'un cycle."""
-    min_alloc = min(allocation[i, j] for k, (i, j) in enumerate(cycle) if k % 2 == 1)  # Trouver la plus petite allocation
+    allocation = allocation.copy()
+    lignes, colonnes = np.nonzero(allocation)
+    resultat, base, pivots = simplexe_transport_creux(couts, (lignes, colonnes, allocation[lignes, colonnes]),
+                                                      (rows, cols), base, tolerance, progression, taille_bloc)
+    allocation[:] = 0
+    allocation[resultat[0], resultat[1]] = resultat[2]
+    return allocation, base, pivots
+
+def simplexe_transport_creux(couts, allocation, forme, base=None, tolerance=1e-9, progression=None,
+                             taille_bloc=TAILLE_BLOC):
+    """Simplexe de transport sur une allocation creuse (lignes, colonnes, quantites).
+
+    `forme` est (nombre de lignes, nombre de colonnes), ligne ou colonne fictive
+    comprise. Retourne (allocation creuse optimale, base, pivots) ; la mémoire
+    utilisée ne dépend que de m + n et de `taille_bloc`.
+    """
+    rows, cols = forme
+    flux = {(int(i), int(j)): q for i, j, q in zip(allocation[0].tolist(), allocation[1].tolist(),
+                                                    allocation[2].tolist()) if q}
+    base = _construire_base(couts, flux, rows, cols) if base is None else set(base)
+    pivots = _simplexe(couts, flux, base, rows, cols, tolerance, progression, taille_bloc)
+    cases = sorted(case for case, q in flux.items() if q)
+    quantites = [flux[case] for case in cases]
+    allocation = (np.array([i for i, _ in cases], dtype=np.int64), np.array([j for _, j in cases], dtype=np.int64),
+                  np.array(quantites) if quantites else np.zeros(0, dtype=np.int64))
+    return allocation, base, pivots
+
+def _solution_de_base(base, capacites, demandes, rows, cols):
+    """Quantités des cases de la base pour de nouveaux vecteurs (élimination des feuilles de l'arbre).
+
+    La base étant un arbre couvrant, la solution est unique ; elle peut avoir
+    des quantités négatives si les capacités ou demandes ont changé.
+    """
+    reste = list(np.asarray(capacites).tolist()) + list(np.asarray(demandes).tolist())
+    incidentes = [[] for _ in range(rows + cols)]
+    for i, j in base:
+        incidentes[i].append((i, j))
+        incidentes[rows + j].append((i, j))
+    degre = [len(cases) for cases in incidentes]
+    flux = {}
+    feuilles = [x for x in range(rows + cols) if degre[x] == 1]
+    while feuilles:
+        x = feuilles.pop()
+        if degre[x] != 1:
+            continue
+        case = next(c for c in incidentes[x] if c not in flux)
+        i, j = case
+        autre = rows + j if x == i else i
+        flux[case] = reste[x]
+        reste[autre] -= reste[x]
+        reste[x] = 0
+        degre[x] -= 1
+        degre[autre] -= 1
+        if degre[autre] == 1:
+            feuilles.append(autre)
+    return flux
+
+def _case_entrante_duale(couts, u, v, rows, cols, lignes_autre_cote, colonnes_cote, taille_bloc):
+    """Case de plus petit coût réduit allant d'une ligne de l'autre côté vers une colonne du côté de la sortante."""
+    m, n = couts.shape
+    meilleur, entree = np.inf, None
+    colonnes_reelles = colonnes_cote[:n]
+    if colonnes_reelles.any():
+        for r0, r1 in blocs_de_lignes(m, n, taille_bloc):
+            lignes = np.flatnonzero(lignes_autre_cote[r0:r1])
+            if len(lignes) == 0:
+                continue
+            couts_reduits = np.asarray(couts[r0:r1], dtype=float)[lignes] - u[r0 + lignes, None] - v[None, :n]
+            couts_reduits[:, ~colonnes_reelles] = np.inf
+            k = int(np.argmin(couts_reduits))
+            a, j = divmod(k, n)
+            if couts_reduits[a, j] < meilleur:
+                meilleur, entree = couts_reduits[a, j], (r0 + int(lignes[a]), j)
+    # Cases fictives, de coût nul
+    if cols > n and colonnes_cote[n]:
+        lignes = np.flatnonzero(lignes_autre_cote)
+        if len(lignes):
+            couts_reduits = -u[lignes] - v[n]
+            k = int(np.argmin(couts_reduits))
+            if couts_reduits[k] < meilleur:
+                meilleur, entree = couts_reduits[k], (int(lignes[k]), n)
+    if rows > m and lignes_autre_cote[m] and colonnes_reelles.any():
+        couts_reduits = np.where(colonnes_reelles, -u[m] - v[:n], np.inf)
+        k = int(np.argmin(couts_reduits))
+        if couts_reduits[k] < meilleur:
+            entree = (m, k)
+    return entree
+
+def _simplexe_dual(couts, flux, base, rows, cols, progression, taille_bloc):
+    """Pivots du simplexe dual jusqu'à ce qu'aucune case de la base ne soit négative.
+
+    La base doit être optimale pour `couts` (coûts réduits positifs ou nuls) :
+    la case la plus négative sort, la case entrante est celle de plus petit coût
+    réduit qui reconnecte les deux morceaux de l'arbre dans le bon sens.
+    """
+    pivots = 0
+    while True:
+        negatives = [(q, case) for case, q in flux.items() if q < 0]
+        if not negatives:
+            return pivots
+        _, sortante = min(negatives)
+        u, v, voisins = calculer_potentiels(couts, base, rows, cols)
+
+        # Côté de la ligne p une fois la case (p, q) retirée de l'arbre
+        p, q = sortante
+        cote = [False] * (rows + cols)
+        cote[p] = True
+        pile = [p]
+        while pile:
+            x = pile.pop()
+            for y in voisins[x]:
+                if not cote[y] and {x, y} != {p, rows + q}:
+                    cote[y] = True
+                    pile.append(y)
+        cote = np.array(cote)
+        entree = _case_entrante_duale(couts, u, v, rows, cols, ~cote[:rows], cote[rows:], taille_bloc)
+        if entree is None:
+            raise ValueError("Problème de transport sans solution réalisable (capacités ou demandes négatives ?).")
+
+        cycle = trouver_cycle(voisins, rows, entree)
+        theta = -flux[sortante]
+        for k, case in enumerate(cycle):
+            flux[case] = flux.get(case, 0) + (theta if k % 2 == 0 else -theta)
+        del flux[sortante]
+        base.remove(sortante)
+        base.add(entree)
+        pivots += 1
+        if progression is not None:
+            progression(pivots_duaux=pivots)
+
+def _vecteurs_reoptimisation(capacites, demandes, rows, cols):
+    """Vecteurs équilibrés de la taille de l'allocation (lignes et colonnes fictives comprises)."""
+    capacites, demandes = equilibrer(capacites, demandes)
+    # Ligne ou colonne fictive devenue inutile : quantité nulle
+    capacites = np.concatenate([capacites, np.zeros(rows - len(capacites), dtype=capacites.dtype)])
+    demandes = np.concatenate([demandes, np.zeros(cols - len(demandes), dtype=demandes.dtype)])
+    return capacites, demandes
+
+def _etendre_base(couts, base, rows, cols, capacites, demandes):
+    """Ajoute la ligne ou la colonne fictive que demande le nouvel équilibre ; retourne (rows, cols).
+
+    La nouvelle ligne (ou colonne) fictive entre dans l'arbre par une seule
+    case de base, de coût nul, ce qui le garde couvrant. Cette case est prise
+    dans la colonne de plus grand potentiel v (ou la ligne de plus grand u) :
+    les autres cases fictives ont alors un coût réduit positif ou nul, et la
+    base reste optimale pour les anciens coûts, comme l'exige le simplexe dual.
+    """
+    m, n = couts.shape
+    capacites, demandes = equilibrer(capacites, demandes)
+    ligne, colonne = len(capacites) > m and rows == m, len(demandes) > n and cols == n
+    if not (ligne or colonne):
+        return rows, cols
+    u, v, _ = calculer_potentiels(couts, base, rows, cols)
+    if ligne:
+        base.add((m, int(np.argmax(v))))
+        rows += 1
+    if colonne:
+        base.add((int(np.argmax(u)), n))
+        cols += 1
+    return rows, cols
+
+def reoptimiser_transport(couts, capacites, demandes, allocation, base=None, couts_modifies=None,
+                          capacites_modifiees=None, demandes_modifiees=None, tolerance=1e-9, progression=None,
+                          taille_bloc=TAILLE_BLOC):
+    """Ré-optimise un plan de transport après de petits changements, à partir de la base optimale précédente.
+
+    `couts`, `capacites` et `demandes` sont les données de la résolution
+    précédente, `allocation` (dense ou creuse) et `base` son résultat optimal.
+    Les changements sont donnés par {(i, j): coût}, {i: capacité} et {j: demande}.
+    La base est gardée : les quantités sont recalculées sur l'arbre pour les
+    nouveaux vecteurs (si l'équilibre change, une ligne ou colonne fictive
+    de coût nul s'y ajoute) ; si certaines deviennent négatives, le simplexe dual
+    (sur les anciens coûts, pour lesquels la base est optimale) rétablit la
+    réalisabilité, puis le simplexe primal reprend avec les nouveaux coûts.
+    La matrice des coûts n'est ni copiée ni modifiée.
+
+    Retourne {"allocation" (dense ou creuse comme l'entrée, avec les lignes
+    et colonnes fictives de la base), "base", "cout",
+    "pivots_duaux", "pivots", "couts", "capacites", "demandes"} : les trois
+    derniers sont les données mises à jour, à repasser lors de la
+    ré-optimisation suivante.
+    """
+    couts = tableau_couts(couts)
+    dense = isinstance(allocation, np.ndarray)
+    if dense:
+        rows, cols = allocation.shape
+        lignes, colonnes = np.nonzero(allocation)
+        allocation = (lignes, colonnes, allocation[lignes, colonnes])
+    elif base is not None:
+        # Arbre couvrant : chaque ligne et chaque colonne a au moins une case de base
+        rows, cols = max(i for i, _ in base) + 1, max(j for _, j in base) + 1
+    else:
+        anciennes_capacites, anciennes_demandes = equilibrer(capacites, demandes)
+        rows, cols = len(anciennes_capacites), len(anciennes_demandes)
+    if base is None:
+        base = _construire_base(couts, zip(allocation[0].tolist(), allocation[1].tolist()), rows, cols)
+    base = set(base)
+
+    capacites = np.array(capacites)
+    demandes = np.array(demandes)
+    for i, valeur in (capacites_modifiees or {}).items():
+        capacites[i] = valeur
+    for j, valeur in (demandes_modifiees or {}).items():
+        demandes[j] = valeur
+    rows, cols = _etendre_base(couts, base, rows, cols, capacites, demandes)
+    nouvelles_capacites, nouvelles_demandes = _vecteurs_reoptimisation(capacites, demandes, rows, cols)
+
+    flux = _solution_de_base(base, nouvelles_capacites, nouvelles_demandes, rows, cols)
+    pivots_duaux = _simplexe_dual(couts, flux, base, rows, cols, progression, taille_bloc)
+    nouveaux_couts = CoutsModifies(couts, couts_modifies) if couts_modifies else couts
+    pivots = _simplexe(nouveaux_couts, flux, base, rows, cols, tolerance, progression, taille_bloc)
+
+    cases = sorted(case for case, q in flux.items() if q)
+    resultat = (np.array([i for i, _ in cases], dtype=np.int64), np.array([j for _, j in cases], dtype=np.int64),
+                np.array([flux[case] for case in cases]) if cases else np.zeros(0, dtype=np.int64))
+    return {"allocation": densifier(resultat, (rows, cols)) if dense else resultat,
+            "base": base, "cout": cout_total(nouveaux_couts, resultat),
+            "pivots_duaux": pivots_duaux, "pivots": pivots,
+            "couts": nouveaux_couts, "capacites": capacites, "demandes": demandes}
 
-    # Ajuster les allocations le long du cycle
-    for k, (i, j) in enumerate(cycle):
-        sign = 1 if k % 2 == 0 else -1
-        allocation[i, j] += sign * min_alloc
+def stepping_stone(couts, allocation):
+    """Applique l'algorithme Stepping Stone (méthode MODI) pour optimiser l'allocation."""
+    allocation_optimale, _, _ = simplexe_transport(couts, allocation)
+    return allocation_optimale
+
+@avec_cache("stepping_stone")
+def solve_stepping_stone(couts, capacites, demandes, progression=None):
+    """Résout un problème de transport sans interface graphique.
+
+    Retourne un dictionnaire avec les clés "nord_ouest", "moindre_cout" et
+    "stepping_stone", chacune associée à {"allocation", "cout"} (plus "pivots"
+    et "base" pour Stepping Stone, à passer à reoptimiser_transport). Les
+    tableaux d'entrée ne sont pas modifiés. Un problème déséquilibré reçoit une
+    ligne ou colonne fictive (dernière de l'allocation). Au-delà de SEUIL_CREUX
+    cases, les allocations sont données sous forme creuse {"lignes", "colonnes", "quantites"}.
+    """
+    couts = tableau_couts(couts)
+    capacites, demandes = equilibrer(capacites, demandes)
+    forme = (len(capacites), len(demandes))
 
-    return allocation
+    # Résolution avec Nord-Ouest
+    allocation_nord_ouest = nord_ouest_creux(capacites, demandes)
+    resultat = {"nord_ouest": {"allocation": formater_allocation(allocation_nord_ouest, forme),
+                               "cout": cout_total(couts, allocation_nord_ouest)}}
 
-def stepping_stone_gui(gui, output_label):
-    """Fonction principale pour exécuter l'algorithme de Stepping Stone via l'interface graphique."""
+    # Résolution avec Moindres Coûts
+    if progression is not None:
+        progression(etape="moindres coûts")
+    allocation_moindre_cout = moindre_cout_creux(couts, capacites, demandes)
+    resultat["moindre_cout"] = {"allocation": formater_allocation(allocation_moindre_cout, forme),
+                                "cout": cout_total(couts, allocation_moindre_cout)}
+
+    # Optimisation avec Stepping Stone (méthode MODI)
+    allocation_optimisee, base, pivots = simplexe_transport_creux(couts, allocation_moindre_cout, forme,
+                                                                  progression=progression)
+    resultat["stepping_stone"] = {"allocation": formater_allocation(allocation_optimisee, forme),
+                                  "cout": cout_total(couts, allocation_optimisee),
+                                  "pivots": pivots, "base": sorted(base)}
+    return resultat
+
+def preparer_stepping_stone(gui, output_label):
+    """Demande la taille du problème et génère les données ; None si l'action est annulée."""
     nb_usines = simpledialog.askinteger("Entrée", "Entrez le nombre d'usines :", parent=gui, minvalue=1)
     if nb_usines is None:  # Si l'utilisateur annule
         output_label.config(text="Action annulée par l'utilisateur.")
-        return
+        return None
 
     nb_magasins = simpledialog.askinteger("Entrée", "Entrez le nombre de magasins :", parent=gui, minvalue=1)
     if nb_magasins is None:  # Si l'utilisateur annule
         output_label.config(text="Action annulée par l'utilisateur.")
-        return
+        return None
 
     couts, capacites, demandes = generate_data(nb_usines, nb_magasins)
+    instance = {"couts": couts, "capacites": capacites, "demandes": demandes}
+    return instance, instance
 
-    # Afficher les coûts, capacités et demandes
-    output = "Coûts unitaires :\n"
-    output += tabulate(couts, 
-                       headers=[f"Magasin {j+1}" for j in range(nb_magasins)], 
-                       showindex=[f"Usine {i+1}" for i in range(nb_usines)], 
-                       tablefmt="fancy_grid")
-    output += "\n\nCapacités des usines : " + str(capacites)
-    output += "\nDemandes des magasins : " + str(demandes)
+def afficher_stepping_stone(gui, output_label, contexte, resultat):
+    """Affiche les allocations calculées par `solve_stepping_stone` dans une visionneuse à onglets.
 
-    # Résolution avec Nord-Ouest
-    allocation_nord_ouest = nord_ouest(capacites.copy(), demandes.copy())
-    cout_nord_ouest = calculer_cout_total(couts, allocation_nord_ouest)
-    output += "\n\nAllocation (Nord-Ouest) :\n"
-    output += tabulate(allocation_nord_ouest, 
-                       headers=[f"Magasin {j+1}" for j in range(nb_magasins)], 
-                       showindex=[f"Usine {i+1}" for i in range(nb_usines)], 
-                       tablefmt="fancy_grid")
-    output += f"\nCoût total (Nord-Ouest) : {cout_nord_ouest}"
+    Seules les cellules visibles sont dessinées : une instance de plusieurs
+    centaines d'usines et de magasins reste lisible et s'exporte en .npz / CSV.
+    """
+    afficher_plans_transport(gui, "Résultats de l'Algorithme de Stepping Stone", contexte["couts"], contexte["capacites"],
+                             contexte["demandes"],
+                             [("Nord-Ouest", resultat["nord_ouest"]), ("Moindres Coûts", resultat["moindre_cout"]),
+                              ("Stepping Stone", resultat["stepping_stone"])])
 
-    # Résolution avec Moindres Coûts
-    allocation_moindre_cout = moindre_cout(couts, capacites.copy(), demandes.copy())
-    cout_moindre_cout = calculer_cout_total(couts, allocation_moindre_cout)
-    output += "\n\nAllocation (Moindres Coûts) :\n"
-    output += tabulate(allocation_moindre_cout, 
-                       headers=[f"Magasin {j+1}" for j in range(nb_magasins)], 
-                       showindex=[f"Usine {i+1}" for i in range(nb_usines)], 
-                       tablefmt="fancy_grid")
-    output += f"\nCoût total (Moindres Coûts) : {cout_moindre_cout}"
-
-    # Optimisation avec Stepping Stone
-    allocation_optimisee = stepping_stone(couts, allocation_moindre_cout)
-    cout_optimise = calculer_cout_total(couts, allocation_optimisee)
-    output += "\n\nAllocation Optimisée (Stepping Stone) :\n"
-    output += tabulate(allocation_optimisee, 
-                       headers=[f"Magasin {j+1}" for j in range(nb_magasins)], 
-                       showindex=[f"Usine {i+1}" for i in range(nb_usines)], 
-                       tablefmt="fancy_grid")
-    output += f"\nCoût total optimisé : {cout_optimise}"
-
-    # Créer une nouvelle fenêtre pour afficher les résultats
-    result_window = Toplevel(gui)
-    result_window.title("Résultats de l'Algorithme de Stepping Stone")
-    result_window.geometry("1200x800")
-
-    # Ajouter une barre de défilement
-    scrollbar = Scrollbar(result_window)
-    scrollbar.pack(side="right", fill="y")
-
-    # Créer un widget Text pour afficher les résultats
-    text_widget = Text(result_window, wrap="word", yscrollcommand=scrollbar.set, width=120, height=40)
-    text_widget.pack(side="left", fill="both", expand=True)
-
-    # Insérer les résultats dans le widget Text
-    text_widget.insert("1.0", output)
-    text_widget.config(state="disabled")  # Empêche l'édition du texte
-
-    # Lier la barre de défilement au widget Text
-    scrollbar.config(command=text_widget.yview)
\ No newline at end of file
+def stepping_stone_gui(gui, output_label):
+    """Fonction principale pour exécuter l'algorithme de Stepping Stone via l'interface graphique."""
+    preparation = preparer_stepping_stone(gui, output_label)
+    if preparation is None:
+        return
+    instance, contexte = preparation
+    afficher_stepping_stone(gui, output_label, contexte, solve_stepping_stone(**instance))
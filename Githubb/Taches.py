@@ -0,0 +1,57 @@
+"""Exécution des calculs en arrière-plan pour l'interface graphique.
+
+Une Tache lance une fonction solve_* sur un fil d'exécution séparé et lui
+passe un rappel `progression`. Le rappel mémorise les derniers compteurs
+(itérations, augmentations, pivots...) et interrompt le calcul si l'annulation
+a été demandée. L'interface lit l'état de la tâche par scrutation (`after()`),
+Tkinter ne devant être manipulé que depuis son propre fil.
+"""
+import threading
+import time
+
+class AnnulationDemandee(Exception):
+    """Levée dans le calcul lorsque l'utilisateur annule la tâche."""
+
+class Tache:
+    """Calcul `fonction(**instance)` exécuté sur un fil d'exécution séparé."""
+
+    def __init__(self, nom, fonction, instance):
+        self.nom = nom
+        self.progression = {}
+        self.resultat = None
+        self.erreur = None
+        self.annulee = False
+        self.debut = None
+        self._annulation = threading.Event()
+        self._fil = threading.Thread(target=self._executer, args=(fonction, instance), daemon=True)
+
+    def demarrer(self):
+        self.debut = time.perf_counter()
+        self._fil.start()
+        return self
+
+    def signaler(self, **compteurs):
+        """Rappel de progression passé au calcul ; lève AnnulationDemandee si besoin."""
+        if self._annulation.is_set():
+            raise AnnulationDemandee(self.nom)
+        self.progression = compteurs
+
+    def annuler(self):
+        """Demande l'arrêt : prise en compte au prochain appel de `signaler`."""
+        self._annulation.set()
+
+    @property
+    def terminee(self):
+        return self.debut is not None and not self._fil.is_alive()
+
+    @property
+    def duree(self):
+        return time.perf_counter() - self.debut if self.debut is not None else 0.0
+
+    def _executer(self, fonction, instance):
+        try:
+            self.resultat = fonction(**instance, progression=self.signaler)
+        except AnnulationDemandee:
+            self.annulee = True
+        except Exception as e:
+            self.erreur = e
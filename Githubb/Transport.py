@@ -0,0 +1,418 @@
+"""Instances de transport de grande taille : lecture, équilibrage et parcours par blocs.
+
+La matrice des coûts d'une instance 10 000 x 10 000 pèse 400 Mo en int32 : elle
+est ouverte en np.memmap et n'est jamais copiée ni convertie en entier. Les
+calculs qui la parcourent (coût total, moindres coûts, coûts réduits du
+simplexe) traitent des blocs de lignes d'au plus TAILLE_BLOC cases, et les
+allocations sont gardées sous forme creuse (lignes, colonnes, quantites) : une
+solution de base n'a que m + n - 1 cases non nulles.
+
+Formats lus par `lire_transport` :
+
+    .npy    tableau bordé (m+1) x (n+1) : coûts, capacités en dernière colonne,
+            demandes en dernière ligne (case en bas à droite ignorée)
+    .npz    tableaux "couts", "capacites" et "demandes" (non compressés : ouverts en memmap)
+    .csv    tableau bordé au format texte, une ligne par usine puis la ligne des demandes
+
+Un problème déséquilibré est équilibré par `equilibrer`, qui n'allonge que les
+vecteurs : la ligne ou la colonne fictive (coût nul) n'existe pas dans la
+matrice des coûts, les cases (i, j) hors de sa forme ont un coût nul.
+"""
+import struct
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+TAILLE_BLOC = 1 << 22     # Cases de la matrice des coûts traitées par bloc
+SEUIL_CREUX = 1 << 20     # Au-delà de ce nombre de cases, les allocations restent creuses
+CLASSES_MAX = 1 << 16     # Classes de l'histogramme des coûts
+
+def blocs_de_lignes(nb_lignes, nb_colonnes, taille_bloc=TAILLE_BLOC):
+    """Intervalles de lignes [r0, r1) d'au plus `taille_bloc` cases (au moins une ligne)."""
+    pas = max(1, taille_bloc // max(nb_colonnes, 1))
+    for r0 in range(0, nb_lignes, pas):
+        yield r0, min(r0 + pas, nb_lignes)
+
+def tableau_couts(couts):
+    """Matrice des coûts utilisable par les solveurs : une liste (instance JSON) est
+    convertie, un tableau NumPy ou un memmap est gardé tel quel, sans copie."""
+    return couts if hasattr(couts, "shape") else np.asarray(couts)
+
+def couts_cases(couts, lignes, colonnes):
+    """Coûts d'une liste de cases en une lecture groupée (nuls pour les cases fictives)."""
+    lignes, colonnes = np.asarray(lignes, dtype=np.int64), np.asarray(colonnes, dtype=np.int64)
+    m, n = couts.shape
+    reelles = (lignes < m) & (colonnes < n)
+    valeurs = np.zeros(len(lignes), dtype=couts.dtype)
+    valeurs[reelles] = couts[lignes[reelles], colonnes[reelles]]
+    return valeurs
+
+class CoutsModifies:
+    """Matrice de coûts dont quelques cases sont remplacées, sans copie de la matrice d'origine.
+
+    Se lit comme la matrice elle-même par blocs de lignes (couts[r0:r1]) ou par
+    listes de cases (couts[lignes, colonnes]) : seules ces formes sont utilisées
+    par les algorithmes de transport.
+    """
+
+    def __init__(self, couts, modifications):
+        self.couts = couts
+        self.shape = couts.shape
+        self.ndim = 2
+        self._table = {(int(i), int(j)): c for (i, j), c in modifications.items()}
+        cases = list(self._table)
+        self._lignes = np.array([i for i, _ in cases], dtype=np.int64)
+        self._colonnes = np.array([j for _, j in cases], dtype=np.int64)
+        self._valeurs = np.array([self._table[case] for case in cases])
+        self.dtype = np.result_type(couts.dtype, self._valeurs.dtype) if cases else couts.dtype
+
+    def __getitem__(self, cle):
+        if isinstance(cle, slice):
+            r0, r1, _ = cle.indices(self.shape[0])
+            bloc = np.array(self.couts[r0:r1], dtype=self.dtype)
+            dans = (self._lignes >= r0) & (self._lignes < r1)
+            bloc[self._lignes[dans] - r0, self._colonnes[dans]] = self._valeurs[dans]
+            return bloc
+        lignes, colonnes = cle
+        if np.isscalar(lignes):
+            return self._table.get((int(lignes), int(colonnes)), self.couts[lignes, colonnes])
+        valeurs = np.array(self.couts[lignes, colonnes], dtype=self.dtype)
+        if self._table:
+            for k, case in enumerate(zip(np.asarray(lignes).tolist(), np.asarray(colonnes).tolist())):
+                if case in self._table:
+                    valeurs[k] = self._table[case]
+        return valeurs
+
+# --- Lecture et écriture -------------------------------------------------------
+
+def _verifier_type(chemin, tableau, dtype):
+    if dtype is not None and tableau.dtype != np.dtype(dtype):
+        raise ValueError(f"{chemin} : coûts enregistrés en {tableau.dtype}, {np.dtype(dtype)} demandé "
+                         f"(convertir le fichier avec ecrire_transport).")
+
+def _borde(chemin, tableau):
+    """(couts, capacites, demandes) d'un tableau bordé ; les coûts restent une vue."""
+    if tableau.ndim != 2 or min(tableau.shape) < 2:
+        raise ValueError(f"{chemin} : tableau bordé (m+1) x (n+1) attendu, forme {tableau.shape}.")
+    return tableau[:-1, :-1], np.array(tableau[:-1, -1]), np.array(tableau[-1, :-1])
+
+def _membre_npz(chemin, nom, mmap):
+    """Tableau `nom` d'une archive .npz, en memmap s'il est stocké sans compression."""
+    with zipfile.ZipFile(chemin) as archive:
+        info = archive.getinfo(nom + ".npy")
+        if not mmap or info.compress_type != zipfile.ZIP_STORED:
+            with archive.open(info) as f:
+                return np.lib.format.read_array(f, allow_pickle=False)
+    with open(chemin, "rb") as f:
+        # En-tête local du membre : 30 octets, puis nom et champ supplémentaire
+        f.seek(info.header_offset)
+        taille_nom, taille_extra = struct.unpack("<HH", f.read(30)[26:30])
+        f.seek(info.header_offset + 30 + taille_nom + taille_extra)
+        version = np.lib.format.read_magic(f)
+        lire_entete = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        forme, fortran, dtype = lire_entete(f)
+        position = f.tell()
+    if 0 in forme:
+        return np.zeros(forme, dtype=dtype)
+    return np.memmap(chemin, dtype=dtype, mode="r", offset=position, shape=forme, order="F" if fortran else "C")
+
+def _decouper(ligne):
+    return ligne.replace(",", " ").replace(";", " ").split()
+
+def _lire_csv(chemin, dtype, sortie, taille_bloc):
+    """Tableau bordé d'un fichier texte, rempli par blocs de lignes (np.memmap si `sortie`).
+
+    Une première passe compte les lignes ; la seconde convertit le fichier par
+    blocs d'environ `taille_bloc` octets, sans jamais garder tout le texte.
+    """
+    donnee = lambda ligne: ligne.strip() and not ligne.lstrip().startswith("#")
+    nombre, premiere, derniere = 0, None, None
+    with open(chemin, encoding="utf-8") as f:
+        for ligne in f:
+            if donnee(ligne):
+                nombre += 1
+                premiere = premiere or ligne
+                derniere = ligne
+    if nombre < 2:
+        raise ValueError(f"{chemin} : au moins une ligne de coûts et la ligne des demandes sont attendues.")
+    entete = not _est_nombre(_decouper(premiere)[0])
+    nombre -= entete
+
+    with open(chemin, encoding="utf-8") as f:
+        lignes = (ligne for ligne in f if donnee(ligne))
+        if entete:
+            next(lignes)
+        premiere = _decouper(next(lignes))
+        if dtype is None:
+            dtype = np.int32 if all(x.lstrip("-").isdigit() for x in premiere) else np.float32
+        dtype = np.dtype(dtype)
+        conversion = int if dtype.kind in "iu" else float
+        forme = (nombre, len(premiere))
+        if sortie is not None:
+            tableau = np.lib.format.open_memmap(sortie, mode="w+", dtype=dtype, shape=forme)
+        else:
+            tableau = np.empty(forme, dtype=dtype)
+        tableau[0] = list(map(conversion, premiere))
+
+        pas = max(1, taille_bloc // (8 * forme[1]))
+        for r0 in range(1, nombre - 1, pas):
+            r1 = min(r0 + pas, nombre - 1)
+            texte = " ".join(next(lignes) for _ in range(r1 - r0))
+            valeurs = np.fromiter(map(conversion, _decouper(texte)), dtype=dtype)
+            if valeurs.size != (r1 - r0) * forme[1]:
+                raise ValueError(f"{chemin} : lignes {r0 + 1}-{r1} : {forme[1]} valeurs attendues par ligne.")
+            tableau[r0:r1] = valeurs.reshape(r1 - r0, forme[1])
+
+    demandes = _decouper(derniere)
+    if len(demandes) not in (forme[1] - 1, forme[1]):
+        raise ValueError(f"{chemin} : dernière ligne (demandes) de {len(demandes)} valeurs.")
+    tableau[-1, :len(demandes)] = list(map(conversion, demandes))
+    tableau[-1, len(demandes):] = 0
+    if sortie is not None:
+        tableau.flush()
+    return tableau
+
+def _est_nombre(texte):
+    try:
+        float(texte)
+        return True
+    except ValueError:
+        return False
+
+def lire_transport(chemin, dtype=None, mmap=True, sortie=None, taille_bloc=TAILLE_BLOC):
+    """Lit une instance de transport : (couts, capacites, demandes).
+
+    Les coûts d'un .npy ou d'un .npz non compressé sont ouverts en memmap en
+    lecture seule (`mmap=False` pour les charger en mémoire) ; `dtype`, s'il est
+    donné, doit être celui du fichier. Un .csv est converti en `dtype` (int32 si
+    le fichier ne contient que des entiers, float32 sinon par défaut) ; avec
+    `sortie`, il est écrit au passage dans ce fichier .npy bordé, ouvert en
+    memmap, qui servira directement aux lectures suivantes.
+    """
+    chemin = Path(chemin)
+    suffixe = chemin.suffix.lower()
+    if suffixe == ".npy":
+        tableau = np.load(chemin, mmap_mode="r" if mmap else None, allow_pickle=False)
+        _verifier_type(chemin, tableau, dtype)
+        return _borde(chemin, tableau)
+    if suffixe == ".npz":
+        couts = _membre_npz(chemin, "couts", mmap)
+        _verifier_type(chemin, couts, dtype)
+        return couts, _membre_npz(chemin, "capacites", False), _membre_npz(chemin, "demandes", False)
+    if suffixe in (".csv", ".txt", ".tsv"):
+        return _borde(chemin, _lire_csv(chemin, dtype, sortie, taille_bloc))
+    raise ValueError(f"Format d'instance de transport non reconnu : {suffixe}")
+
+def ecrire_transport(chemin, couts, capacites, demandes, dtype=None, taille_bloc=TAILLE_BLOC):
+    """Enregistre une instance en .npy bordé (écrit par blocs) ou en .npz non compressé."""
+    dtype = np.dtype(dtype) if dtype is not None else np.asarray(couts[:0]).dtype
+    m, n = couts.shape
+    if Path(chemin).suffix.lower() == ".npz":
+        np.savez(chemin, couts=np.asarray(couts, dtype=dtype), capacites=np.asarray(capacites),
+                 demandes=np.asarray(demandes))
+        return
+    tableau = np.lib.format.open_memmap(chemin, mode="w+", dtype=dtype, shape=(m + 1, n + 1))
+    for r0, r1 in blocs_de_lignes(m, n, taille_bloc):
+        tableau[r0:r1, :-1] = couts[r0:r1]
+    tableau[:-1, -1] = capacites
+    tableau[-1, :-1] = demandes
+    tableau[-1, -1] = 0
+    tableau.flush()
+    del tableau
+
+# --- Équilibrage et allocations creuses ------------------------------------------
+
+def equilibrer(capacites, demandes):
+    """Vecteurs (capacites, demandes) équilibrés, sans toucher aux coûts.
+
+    Un excédent d'offre ajoute une colonne fictive (demande = excédent), un
+    excédent de demande une ligne fictive ; les vecteurs sont convertis en
+    int64 ou float64 pour que les sommes ne débordent pas. Seuls ces vecteurs
+    sont copiés, jamais la matrice des coûts.
+    """
+    capacites = np.asarray(capacites)
+    demandes = np.asarray(demandes)
+    large = np.float64 if "f" in (capacites.dtype.kind, demandes.dtype.kind) else np.int64
+    capacites = capacites.astype(large)
+    demandes = demandes.astype(large)
+    ecart = capacites.sum() - demandes.sum()
+    if large is np.float64 and abs(ecart) <= 1e-9 * max(1.0, capacites.sum()):
+        ecart = 0
+    if ecart > 0:
+        demandes = np.append(demandes, ecart)
+    elif ecart < 0:
+        capacites = np.append(capacites, -ecart)
+    return capacites, demandes
+
+def _creuse(lignes, colonnes, quantites):
+    return (np.array(lignes, dtype=np.int64), np.array(colonnes, dtype=np.int64),
+            np.array(quantites) if quantites else np.zeros(0, dtype=np.int64))
+
+def densifier(allocation, forme):
+    """Matrice dense d'une allocation creuse (lignes, colonnes, quantites)."""
+    lignes, colonnes, quantites = allocation
+    dense = np.zeros(forme, dtype=quantites.dtype if quantites.dtype.kind == "f" else int)
+    dense[lignes, colonnes] = quantites
+    return dense
+
+def formater_allocation(allocation, forme):
+    """Allocation rendue par les solve_* : dense pour les petites instances,
+    {"lignes", "colonnes", "quantites"} au-delà de SEUIL_CREUX cases."""
+    if forme[0] * forme[1] <= SEUIL_CREUX:
+        return densifier(allocation, forme)
+    lignes, colonnes, quantites = allocation
+    return {"lignes": lignes, "colonnes": colonnes, "quantites": quantites}
+
+def cout_total(couts, allocation):
+    """Coût d'une allocation creuse (les cases fictives ont un coût nul)."""
+    lignes, colonnes, quantites = allocation
+    valeurs = couts_cases(couts, lignes, colonnes)
+    return np.sum(valeurs * quantites, dtype=np.result_type(valeurs.dtype, quantites.dtype, np.int64))
+
+def cout_total_dense(couts, allocation, taille_bloc=TAILLE_BLOC):
+    """Coût d'une allocation dense, calculé par blocs de lignes (ligne/colonne fictive ignorée)."""
+    m, n = couts.shape
+    total = 0
+    for r0, r1 in blocs_de_lignes(m, n, taille_bloc):
+        total = total + np.sum(couts[r0:r1] * allocation[r0:r1, :n])
+    return total
+
+def nord_ouest_creux(capacites, demandes):
+    """Coin Nord-Ouest : allocation creuse, sans modifier les vecteurs d'entrée."""
+    offre, demande = list(np.asarray(capacites).tolist()), list(np.asarray(demandes).tolist())
+    lignes, colonnes, quantites = [], [], []
+    i, j = 0, 0
+    while i < len(offre) and j < len(demande):
+        alloc = min(offre[i], demande[j])
+        lignes.append(i)
+        colonnes.append(j)
+        quantites.append(alloc)
+        offre[i] -= alloc
+        demande[j] -= alloc
+        if offre[i] == 0:
+            i += 1
+        if demande[j] == 0:
+            j += 1
+    return _creuse(lignes, colonnes, quantites)
+
+# --- Parcours des cases par coût croissant ---------------------------------------
+
+def _bandes(couts, taille_bloc):
+    """Intervalles de coûts [bas, haut) couvrant chacun au plus ~taille_bloc cases.
+
+    Deux passes par blocs : bornes, puis histogramme (une classe par valeur
+    pour des coûts entiers d'étendue raisonnable). Retourne [(bas, haut, unique)],
+    `unique` indiquant une bande d'une seule valeur de coût.
+    """
+    m, n = couts.shape
+    blocs = list(blocs_de_lignes(m, n, taille_bloc))
+    mini = min(couts[r0:r1].min() for r0, r1 in blocs).item()
+    maxi = max(couts[r0:r1].max() for r0, r1 in blocs).item()
+    exacte = couts.dtype.kind in "iu" and maxi - mini < CLASSES_MAX
+    if exacte:
+        bords = np.arange(mini, maxi + 2)
+        comptes = sum(np.bincount((couts[r0:r1] - mini).ravel(), minlength=len(bords) - 1) for r0, r1 in blocs)
+    else:
+        bords = np.linspace(mini, maxi, 4097) if maxi > mini else np.array([mini, np.inf])
+        comptes = sum(np.histogram(couts[r0:r1], bords)[0] for r0, r1 in blocs)
+
+    bandes = []
+    a = 0
+    comptes = comptes.tolist()
+    while a < len(comptes):
+        b, total = a, comptes[a]
+        while b + 1 < len(comptes) and total + comptes[b + 1] <= taille_bloc:
+            b += 1
+            total += comptes[b]
+        if total:
+            haut = bords[b + 1] if b + 1 < len(comptes) or exacte else np.inf
+            bandes.append((bords[a], haut, exacte and a == b))
+        a = b + 1
+    return bandes
+
+def cases_par_cout(couts, lignes_actives=None, colonnes_actives=None, taille_bloc=TAILLE_BLOC):
+    """Indices linéaires (i * n + j) des cases par coût croissant, par lots successifs.
+
+    L'ordre est celui d'un tri stable de toute la matrice (coût, puis indice),
+    sans jamais trier plus de ~taille_bloc cases à la fois : les cases sont
+    réparties en bandes de coûts et chaque bande est lue par blocs de lignes.
+    Les masques `lignes_actives` / `colonnes_actives` peuvent être modifiés par
+    l'appelant entre deux lots : les cases de lignes ou colonnes inactives ne
+    sont plus proposées (elles peuvent encore figurer dans le lot en cours).
+    """
+    m, n = couts.shape
+    if m * n <= taille_bloc:
+        yield np.argsort(couts, axis=None, kind="stable")
+        return
+    for bas, haut, unique in _bandes(couts, taille_bloc):
+        morceaux = []
+        for r0, r1 in blocs_de_lignes(m, n, taille_bloc):
+            if lignes_actives is not None and not lignes_actives[r0:r1].any():
+                continue
+            bloc = couts[r0:r1]
+            masque = (bloc >= bas) & (bloc < haut)
+            if lignes_actives is not None:
+                masque &= lignes_actives[r0:r1, None]
+            if colonnes_actives is not None:
+                masque &= colonnes_actives[None, :]
+            k = np.flatnonzero(masque)
+            if unique:
+                if len(k):
+                    yield k + r0 * n  # Coût unique : l'ordre des indices suffit
+            else:
+                morceaux.append((k + r0 * n, bloc.ravel()[k]))
+        if morceaux:
+            k = np.concatenate([k for k, _ in morceaux])
+            valeurs = np.concatenate([v for _, v in morceaux])
+            yield k[np.lexsort((k, valeurs))]
+
+def moindre_cout_creux(couts, capacites, demandes, taille_bloc=TAILLE_BLOC):
+    """Moindres coûts : allocation creuse, cases parcourues par `cases_par_cout`.
+
+    Une ligne ou colonne fictive (vecteur plus long que la matrice) n'est
+    servie qu'en dernier, avec ce qui reste une fois les cases réelles épuisées.
+    """
+    m, n = couts.shape
+    offre, demande = list(np.asarray(capacites).tolist()), list(np.asarray(demandes).tolist())
+    lignes_actives = np.array([q != 0 for q in offre[:m]], dtype=bool)
+    colonnes_actives = np.array([q != 0 for q in demande[:n]], dtype=bool)
+    lignes_restantes = int(lignes_actives.sum())
+    colonnes_restantes = int(colonnes_actives.sum())
+    lignes, colonnes, quantites = [], [], []
+    for lot in cases_par_cout(couts, lignes_actives, colonnes_actives, taille_bloc):
+        for k in lot.tolist():
+            if lignes_restantes == 0 or colonnes_restantes == 0:
+                break
+            i, j = divmod(k, n)
+            if offre[i] == 0 or demande[j] == 0:
+                continue  # Ligne ou colonne épuisée
+            alloc = min(offre[i], demande[j])
+            lignes.append(i)
+            colonnes.append(j)
+            quantites.append(alloc)
+            offre[i] -= alloc
+            demande[j] -= alloc
+            if offre[i] == 0:
+                lignes_actives[i] = False
+                lignes_restantes -= 1
+            if demande[j] == 0:
+                colonnes_actives[j] = False
+                colonnes_restantes -= 1
+        if lignes_restantes == 0 or colonnes_restantes == 0:
+            break
+
+    # Reste vers la colonne ou la ligne fictive
+    if len(demande) > n:
+        for i in range(len(offre)):
+            if offre[i]:
+                lignes.append(i)
+                colonnes.append(n)
+                quantites.append(offre[i])
+    elif len(offre) > m:
+        for j in range(len(demande)):
+            if demande[j]:
+                lignes.append(m)
+                colonnes.append(j)
+                quantites.append(demande[j])
+    return _creuse(lignes, colonnes, quantites)
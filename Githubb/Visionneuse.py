@@ -0,0 +1,291 @@
+"""Visionneuse de tableaux virtualisée pour les résultats volumineux.
+
+Au lieu de construire une chaîne de texte pour tout un tableau (tabulate,
+Label), la TableVirtuelle ne dessine sur un Canvas que les lignes et colonnes
+visibles, lues directement dans les tableaux NumPy (memmap compris) à chaque
+défilement : une matrice 5000 x 5000 s'affiche aussi vite qu'une matrice 5 x 5.
+
+Un modèle fournit les données à la table :
+
+    ModeleMatrice   tableau 2D, avec en option une ligne et une colonne de totaux
+    ModeleListe     colonnes nommées de même longueur (arêtes, cases non nulles...)
+
+La fenêtre Visionneuse regroupe plusieurs tables dans des onglets, chacune
+avec un résumé et l'export du contenu en .npz ou en CSV.
+"""
+import csv
+from tkinter import Canvas, Frame, Label, Toplevel, filedialog, messagebox, ttk
+
+import numpy as np
+
+from Transport import blocs_de_lignes, couts_cases
+
+TAILLE_BLOC = 1 << 22         # Cases lues à la fois pour les totaux et l'export
+LARGEUR_COLONNE = 90
+LARGEUR_ENTETE = 110
+HAUTEUR_LIGNE = 22
+
+def formater_valeur(valeur):
+    """Texte d'une cellule : entiers sans décimales, flottants sur 6 chiffres significatifs."""
+    if isinstance(valeur, float):
+        if valeur in (float("inf"), float("-inf")):
+            return "∞" if valeur > 0 else "-∞"
+        return str(int(valeur)) if valeur.is_integer() and abs(valeur) < 1e15 else f"{valeur:.6g}"
+    return str(valeur)
+
+def _entete(entetes, k, defaut):
+    if entetes is None:
+        return defaut
+    return entetes(k) if callable(entetes) else str(entetes[k])
+
+class ModeleMatrice:
+    """Tableau 2D (np.ndarray ou memmap) vu par blocs ; `totaux` ajoute une ligne et une colonne de sommes."""
+
+    def __init__(self, tableau, entetes_lignes=None, entetes_colonnes=None, totaux=False, taille_bloc=TAILLE_BLOC):
+        self.tableau = tableau
+        self.entetes_lignes = entetes_lignes
+        self.entetes_colonnes = entetes_colonnes
+        self.totaux = totaux
+        m, n = tableau.shape
+        self.forme = (m + 1, n + 1) if totaux else (m, n)
+        if totaux:
+            # Sommes par bandes de lignes : la matrice n'est jamais chargée en entier
+            self.totaux_lignes = np.zeros(m, dtype=np.result_type(tableau.dtype, np.int64))
+            self.totaux_colonnes = np.zeros(n, dtype=self.totaux_lignes.dtype)
+            for r0, r1 in blocs_de_lignes(m, n, taille_bloc):
+                bloc = np.asarray(tableau[r0:r1])
+                self.totaux_lignes[r0:r1] = bloc.sum(axis=1)
+                self.totaux_colonnes += bloc.sum(axis=0)
+
+    def entete_ligne(self, i):
+        if self.totaux and i == self.tableau.shape[0]:
+            return "Total"
+        return _entete(self.entetes_lignes, i, str(i))
+
+    def entete_colonne(self, j):
+        if self.totaux and j == self.tableau.shape[1]:
+            return "Total"
+        return _entete(self.entetes_colonnes, j, str(j))
+
+    def valeurs(self, r0, r1, c0, c1):
+        """Lignes r0:r1, colonnes c0:c1, en listes Python."""
+        m, n = self.tableau.shape
+        if not self.totaux:
+            return np.asarray(self.tableau[r0:r1, c0:c1]).tolist()
+        bloc = np.zeros((r1 - r0, c1 - c0), dtype=self.totaux_lignes.dtype)
+        fin_r, fin_c = min(r1, m), min(c1, n)
+        if r0 < fin_r and c0 < fin_c:
+            bloc[:fin_r - r0, :fin_c - c0] = self.tableau[r0:fin_r, c0:fin_c]
+        if r1 > m and c0 < fin_c:
+            bloc[m - r0, :fin_c - c0] = self.totaux_colonnes[c0:fin_c]
+        if c1 > n and r0 < fin_r:
+            bloc[:fin_r - r0, n - c0] = self.totaux_lignes[r0:fin_r]
+        if r1 > m and c1 > n:
+            bloc[m - r0, n - c0] = self.totaux_lignes.sum()
+        return bloc.tolist()
+
+    def tableaux(self):
+        """Tableaux à exporter en .npz."""
+        if not self.totaux:
+            return {"valeurs": self.tableau}
+        return {"valeurs": self.tableau, "totaux_lignes": self.totaux_lignes,
+                "totaux_colonnes": self.totaux_colonnes}
+
+class ModeleListe:
+    """Liste de lignes décrites par des colonnes nommées (tableaux ou listes de même longueur)."""
+
+    def __init__(self, entetes, colonnes):
+        if len(entetes) != len(colonnes):
+            raise ValueError(f"{len(entetes)} en-têtes pour {len(colonnes)} colonnes.")
+        self.entetes = list(entetes)
+        self.colonnes = [np.asarray(colonne) for colonne in colonnes]
+        longueurs = {len(colonne) for colonne in self.colonnes}
+        if len(longueurs) > 1:
+            raise ValueError("Les colonnes n'ont pas toutes la même longueur.")
+        self.forme = (longueurs.pop() if longueurs else 0, len(self.colonnes))
+
+    def entete_ligne(self, i):
+        return str(i + 1)
+
+    def entete_colonne(self, j):
+        return self.entetes[j]
+
+    def valeurs(self, r0, r1, c0, c1):
+        return [list(ligne) for ligne in zip(*(colonne[r0:r1].tolist() for colonne in self.colonnes[c0:c1]))]
+
+    def tableaux(self):
+        return dict(zip(self.entetes, self.colonnes))
+
+def exporter_npz(chemin, modele):
+    """Enregistre les tableaux du modèle dans un fichier .npz."""
+    np.savez(chemin, **modele.tableaux())
+
+def exporter_csv(chemin, modele, taille_bloc=TAILLE_BLOC):
+    """Écrit le modèle en CSV (en-têtes compris), par blocs de lignes."""
+    nb_lignes, nb_colonnes = modele.forme
+    with open(chemin, "w", newline="", encoding="utf-8") as f:
+        ecrivain = csv.writer(f)
+        ecrivain.writerow([""] + [modele.entete_colonne(j) for j in range(nb_colonnes)])
+        for r0, r1 in blocs_de_lignes(nb_lignes, nb_colonnes, taille_bloc):
+            for i, ligne in enumerate(modele.valeurs(r0, r1, 0, nb_colonnes), r0):
+                ecrivain.writerow([modele.entete_ligne(i)] + ligne)
+
+def fenetre_visible(premiere, taille, total):
+    """Intervalle [debut, fin) des indices affichés, `premiere` ramenée dans les bornes."""
+    premiere = max(0, min(premiere, total - taille))
+    return premiere, min(total, premiere + taille)
+
+class TableVirtuelle(Frame):
+    """Table défilante qui ne dessine que les cellules visibles du modèle."""
+
+    def __init__(self, parent, modele, largeur_colonne=LARGEUR_COLONNE, hauteur_ligne=HAUTEUR_LIGNE, **options):
+        super().__init__(parent, **options)
+        self.modele = modele
+        self.largeur_colonne = largeur_colonne
+        self.hauteur_ligne = hauteur_ligne
+        self.premiere_ligne = 0
+        self.premiere_colonne = 0
+
+        self.canvas = Canvas(self, bg="white", highlightthickness=0)
+        self.defilement_y = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.defilement_x = ttk.Scrollbar(self, orient="horizontal", command=self.xview)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.defilement_y.grid(row=0, column=1, sticky="ns")
+        self.defilement_x.grid(row=1, column=0, sticky="ew")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda event: self.dessiner())
+        self.canvas.bind("<MouseWheel>", lambda event: self.yview("scroll", -event.delta // 120, "units"))
+        self.canvas.bind("<Shift-MouseWheel>", lambda event: self.xview("scroll", -event.delta // 120, "units"))
+        self.canvas.bind("<Button-4>", lambda event: self.yview("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self.yview("scroll", 3, "units"))
+
+    def _visibles(self):
+        """Nombre de lignes et de colonnes qui tiennent dans le Canvas."""
+        hauteur = max(1, self.canvas.winfo_height() - self.hauteur_ligne)
+        largeur = max(1, self.canvas.winfo_width() - LARGEUR_ENTETE)
+        return max(1, hauteur // self.hauteur_ligne), max(1, largeur // self.largeur_colonne)
+
+    def _defiler(self, premiere, visibles, total, args):
+        if args[0] == "moveto":
+            return int(float(args[1]) * total)
+        pas = int(args[1]) * (visibles if args[2] == "pages" else 1)
+        return premiere + pas
+
+    def yview(self, *args):
+        lignes, _ = self._visibles()
+        self.premiere_ligne = self._defiler(self.premiere_ligne, lignes, self.modele.forme[0], args)
+        self.dessiner()
+
+    def xview(self, *args):
+        _, colonnes = self._visibles()
+        self.premiere_colonne = self._defiler(self.premiere_colonne, colonnes, self.modele.forme[1], args)
+        self.dessiner()
+
+    def dessiner(self):
+        """Redessine les seules cellules visibles."""
+        nb_lignes, nb_colonnes = self.modele.forme
+        lignes, colonnes = self._visibles()
+        r0, r1 = fenetre_visible(self.premiere_ligne, lignes, nb_lignes)
+        c0, c1 = fenetre_visible(self.premiere_colonne, colonnes, nb_colonnes)
+        self.premiere_ligne, self.premiere_colonne = r0, c0
+
+        canvas, h, w = self.canvas, self.hauteur_ligne, self.largeur_colonne
+        canvas.delete("all")
+        canvas.create_rectangle(0, 0, LARGEUR_ENTETE + (c1 - c0) * w, h, fill="#e8e8e8", outline="")
+        canvas.create_rectangle(0, 0, LARGEUR_ENTETE, h + (r1 - r0) * h, fill="#e8e8e8", outline="")
+        for k, j in enumerate(range(c0, c1)):
+            canvas.create_text(LARGEUR_ENTETE + k * w + w // 2, h // 2, text=self.modele.entete_colonne(j),
+                               font=("Segoe UI", 9, "bold"), width=w - 4)
+        for a, ligne in enumerate(self.modele.valeurs(r0, r1, c0, c1) if r1 > r0 and c1 > c0 else []):
+            y = h + a * h + h // 2
+            canvas.create_text(LARGEUR_ENTETE // 2, y, text=self.modele.entete_ligne(r0 + a),
+                               font=("Segoe UI", 9, "bold"), width=LARGEUR_ENTETE - 4)
+            for k, valeur in enumerate(ligne):
+                canvas.create_text(LARGEUR_ENTETE + k * w + w - 6, y, text=formater_valeur(valeur),
+                                   anchor="e", font=("Consolas", 9))
+            canvas.create_line(0, h + (a + 1) * h, LARGEUR_ENTETE + (c1 - c0) * w, h + (a + 1) * h, fill="#f0f0f0")
+
+        self.defilement_y.set(r0 / max(1, nb_lignes), r1 / max(1, nb_lignes))
+        self.defilement_x.set(c0 / max(1, nb_colonnes), c1 / max(1, nb_colonnes))
+
+def _exporter(parent, modele, titre, extension):
+    types = [("Archive NumPy", "*.npz")] if extension == ".npz" else [("CSV", "*.csv")]
+    chemin = filedialog.asksaveasfilename(parent=parent, defaultextension=extension, filetypes=types,
+                                          initialfile=titre.replace(" ", "_") + extension)
+    if not chemin:
+        return
+    try:
+        (exporter_npz if extension == ".npz" else exporter_csv)(chemin, modele)
+    except OSError as e:
+        messagebox.showerror("Erreur", f"Export impossible : {e}", parent=parent)
+
+def panneau_table(parent, titre, modele, resume=None):
+    """Cadre contenant le résumé, les boutons d'export et la TableVirtuelle de `modele` (à placer par l'appelant)."""
+    cadre = Frame(parent)
+    if resume:
+        Label(cadre, text=resume, font=("Helvetica", 11), justify="left", anchor="w").pack(fill="x", padx=10, pady=5)
+    boutons = Frame(cadre)
+    boutons.pack(fill="x", padx=10)
+    for texte, extension in (("Exporter .npz", ".npz"), ("Exporter CSV", ".csv")):
+        ttk.Button(boutons, text=texte,
+                   command=lambda e=extension: _exporter(cadre, modele, titre, e)).pack(side="left", padx=5)
+    TableVirtuelle(cadre, modele).pack(fill="both", expand=True, padx=10, pady=5)
+    return cadre
+
+class Visionneuse(Toplevel):
+    """Fenêtre à onglets : une table par onglet, avec résumé et export."""
+
+    def __init__(self, parent, titre, geometrie="1200x800"):
+        super().__init__(parent)
+        self.title(titre)
+        self.geometry(geometrie)
+        self.onglets = ttk.Notebook(self)
+        self.onglets.pack(fill="both", expand=True)
+
+    def ajouter(self, titre, modele, resume=None):
+        """Ajoute un onglet affichant `modele` ; `resume` est un texte placé au-dessus de la table."""
+        cadre = panneau_table(self.onglets, titre, modele, resume)
+        self.onglets.add(cadre, text=titre)
+        return cadre
+
+# --- Résultats de transport ----------------------------------------------------
+
+def _noms_transport(m, n):
+    """En-têtes des usines et magasins ; la ligne ou colonne au-delà des coûts est fictive."""
+    return (lambda i: f"Usine {i + 1}" if i < m else "Usine fictive",
+            lambda j: f"Magasin {j + 1}" if j < n else "Magasin fictif")
+
+def cases_non_nulles(couts, allocation):
+    """Liste des cases allouées d'une allocation dense ou creuse (voir Transport.formater_allocation)."""
+    m, n = couts.shape
+    if isinstance(allocation, dict):
+        lignes, colonnes, quantites = allocation["lignes"], allocation["colonnes"], allocation["quantites"]
+    else:
+        lignes, colonnes = np.nonzero(allocation)
+        quantites = allocation[lignes, colonnes]
+    usine, magasin = _noms_transport(m, n)
+    unitaires = couts_cases(couts, lignes, colonnes)
+    return ModeleListe(["Usine", "Magasin", "Quantité", "Coût unitaire", "Coût"],
+                       [[usine(i) for i in lignes.tolist()], [magasin(j) for j in colonnes.tolist()],
+                        quantites, unitaires, unitaires * quantites])
+
+def afficher_plans_transport(gui, titre, couts, capacites, demandes, plans):
+    """Fenêtre des résultats de transport : coûts, puis pour chaque plan (nom, {"allocation", "cout"})
+    l'allocation avec ses totaux et la liste de ses cases non nulles."""
+    m, n = couts.shape
+    usine, magasin = _noms_transport(m, n)
+    fenetre = Visionneuse(gui, titre)
+    fenetre.ajouter("Coûts", ModeleMatrice(couts, usine, magasin),
+                    f"{m} usines, {n} magasins — capacité totale {np.sum(capacites)}, "
+                    f"demande totale {np.sum(demandes)}")
+    for nom, plan in plans:
+        cases = cases_non_nulles(couts, plan["allocation"])
+        resume = f"Coût total ({nom}) : {formater_valeur(plan['cout'])} — {cases.forme[0]} cases allouées"
+        if "pivots" in plan:
+            resume += f", {plan['pivots']} pivots"
+        if not isinstance(plan["allocation"], dict):
+            fenetre.ajouter(nom, ModeleMatrice(plan["allocation"], usine, magasin, totaux=True), resume)
+        fenetre.ajouter(f"{nom} (cases non nulles)", cases, resume)
+    return fenetre
@@ -1,10 +1,15 @@
-import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
 from random import randint
 from randomcolor import RandomColor
+import heapq
 import time
-from tkinter import simpledialog, Tk, Label, Frame, Toplevel
+from tkinter import simpledialog, Toplevel
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # Pour intégrer matplotlib dans Tkinter
+from Rendu import dessiner_graphe
+from Generateurs import gnm
+from Graphe import Graphe
+from Cache import avec_cache
 
 # Fonction pour démarrer le chronomètre
 def tic():
@@ -24,61 +29,162 @@ def get_positive_integer_gui(prompt, gui):
     value = simpledialog.askinteger("Entrée", prompt, parent=gui, minvalue=1)
     return value
 
-# Fonction principale pour l'algorithme Welsh-Powell
-def welsh_powell(gui, output_label):
+# Au-delà de ce degré moyen, le travail par sommet est fait par tranches NumPy ;
+# en dessous, une boucle sur des listes Python coûte moins cher.
+DEGRE_VECTORISE = 16
+
+# Coloration gloutonne sur adjacence CSR (debut, tete) dans l'ordre donné.
+# Le tableau `interdit` sert de marqueur réutilisable : interdit[c] == u signifie
+# que la couleur c est prise par un voisin de u, sans ensemble créé par sommet.
+# Les voisins non coloriés (couleur -1) marquent la dernière case, jamais consultée.
+def colorier_glouton(debut, tete, ordre, progression=None):
+    n = len(debut) - 1
+    bornes = debut.tolist()
+    vectorise = len(tete) > DEGRE_VECTORISE * n
+    if vectorise:
+        couleur = np.full(n, -1, dtype=np.int64)
+        interdit = np.full(n + 1, -1, dtype=np.int64)
+    else:
+        tete = tete.tolist()
+        couleur = [-1] * n
+        interdit = [-1] * (n + 1)
+
+    for k, u in enumerate(ordre):
+        if progression is not None and k % 1000 == 0:
+            progression(sommets=k, total=n)
+        a, b = bornes[u], bornes[u + 1]
+        if vectorise:
+            interdit[couleur[tete[a:b]]] = u
+            # Première couleur libre : au plus le nombre de voisins
+            couleur[u] = np.argmax(interdit[:min(b - a + 1, n)] != u)
+        else:
+            for v in tete[a:b]:
+                interdit[couleur[v]] = u
+            c = 0
+            while interdit[c] == u:
+                c += 1
+            couleur[u] = c
+    return np.asarray(couleur, dtype=np.int64)
+
+# Coloration DSatur : on colorie toujours le sommet dont les voisins portent le plus
+# de couleurs distinctes (degré de saturation), puis le plus grand degré. Les entrées
+# du tas sont des entiers ((-saturation) * (D + 1) - degré) * n + sommet, moins
+# coûteux que des tuples ; les entrées périmées sont ignorées au dépilement. Les
+# couleurs déjà vues par chaque sommet sont les bits d'un entier `masque[v]`.
+def colorier_dsatur(debut, tete, progression=None):
+    n = len(debut) - 1
+    degre = np.diff(debut).tolist()
+    bornes = debut.tolist()
+    vectorise = len(tete) > DEGRE_VECTORISE * n
+    if vectorise:
+        couleur = np.full(n, -1, dtype=np.int64)
+        interdit = np.full(n + 1, -1, dtype=np.int64)
+    else:
+        tete = tete.tolist()
+        couleur = [-1] * n
+        interdit = [-1] * (n + 1)
+    masque = [0] * n
+    saturation = [0] * n
+    pas = max(degre, default=0) + 1
+    tas = [-degre[u] * n + u for u in range(n)]
+    heapq.heapify(tas)
+    k = 0
+    while tas:
+        cle = heapq.heappop(tas)
+        u = cle % n
+        if couleur[u] >= 0 or -(cle // n + degre[u]) // pas != saturation[u]:
+            continue
+        if progression is not None and k % 1000 == 0:
+            progression(sommets=k, total=n)
+        k += 1
+        voisins = tete[bornes[u]:bornes[u + 1]]
+        if vectorise:
+            interdit[couleur[voisins]] = u
+            c = int(np.argmax(interdit[:min(len(voisins) + 1, n)] != u))
+            voisins = voisins[couleur[voisins] < 0].tolist()
+        else:
+            for v in voisins:
+                interdit[couleur[v]] = u
+            c = 0
+            while interdit[c] == u:
+                c += 1
+        couleur[u] = c
+
+        # Saturation des voisins non coloriés pour qui la couleur c est nouvelle
+        bit = 1 << c
+        for v in voisins:
+            if not masque[v] & bit and couleur[v] < 0:
+                masque[v] |= bit
+                saturation[v] += 1
+                heapq.heappush(tas, (-saturation[v] * pas - degre[v]) * n + v)
+    return np.asarray(couleur, dtype=np.int64)
+
+METHODES = ("welsh_powell", "dsatur")
+
+# Coloration d'une adjacence CSR : Welsh-Powell (degrés décroissants) ou DSatur
+def colorier_csr(debut, tete, methode="welsh_powell", progression=None):
+    if methode == "dsatur":
+        return colorier_dsatur(debut, tete, progression)
+    if methode != "welsh_powell":
+        raise ValueError(f"Méthode inconnue : {methode} (choix : {', '.join(METHODES)})")
+    ordre = np.argsort(-np.diff(debut), kind="stable").tolist()
+    return colorier_glouton(debut, tete, ordre, progression)
+
+# Fonction pour appliquer l'algorithme Welsh-Powell à un graphe networkx (progression appelée tous les 1000 sommets)
+def welsh_powell_coloring(graph, progression=None, methode="welsh_powell"):
+    # Vérifier si le graphe contient des sommets
+    if graph.number_of_nodes() == 0:
+        return {}
+
+    graphe = Graphe.depuis_networkx(graph)
+    couleurs = colorier_csr(graphe.debut, graphe.tete, methode, progression)
+    return dict(zip(graphe.noms, couleurs.tolist()))
+
+# Coloration sans interface graphique à partir des tableaux d'arêtes
+@avec_cache("welsh_powell")
+def solve_welsh_powell(num_vertices, origines, extremites, methode="welsh_powell", progression=None):
+    """Retourne {"couleurs": couleur de chaque sommet 0..n-1, "nombre_chromatique", "duree"}."""
+    start = time.perf_counter()
+    graphe = Graphe.depuis_aretes(num_vertices, origines, extremites)
+    couleurs = colorier_csr(graphe.debut, graphe.tete, methode, progression).tolist()
+    return {
+        "couleurs": couleurs,
+        "nombre_chromatique": max(couleurs) + 1 if couleurs else 0,
+        "duree": time.perf_counter() - start,
+    }
+
+# Demander le nombre de sommets et générer le graphe ; None si l'utilisateur annule
+def preparer_welsh_powell(gui, output_label):
     # Demander à l'utilisateur de saisir le nombre de sommets via Tkinter
     n = get_positive_integer_gui("Entrez le nombre de sommets :", gui)
     if n is None:  # Si l'utilisateur annule l'action
         output_label.config(text="Action annulée par l'utilisateur.")
-        return
-
-    # Créer un générateur de couleurs aléatoires
-    rand_color = RandomColor()
+        return None
 
     # Créer un graphe aléatoire
-    G = nx.gnm_random_graph(n, randint(n, n * (n - 1) // 2))
-
-    # Fonction pour appliquer l'algorithme Welsh-Powell
-    def welsh_powell_coloring(graph):
-        # Vérifier si le graphe contient des sommets
-        if graph.number_of_nodes() == 0:
-            output_label.config(text="Le graphe est vide.")
-            return {}
-
-        # Trier les sommets par degré décroissant
-        sorted_nodes = sorted(graph.degree, key=lambda x: x[1], reverse=True)
-        # Dictionnaire pour stocker les couleurs de chaque sommet
-        color_map = {}
-        
-        for node, _ in sorted_nodes:
-            # Trouver les couleurs des voisins du sommet courant
-            neighbor_colors = {color_map.get(neigh) for neigh in graph.neighbors(node)}
-            # Déterminer la première couleur disponible
-            current_color = 0
-            while current_color in neighbor_colors:
-                current_color += 1
-            color_map[node] = current_color
-
-        # Calculer et afficher le nombre chromatique
-        chromatic_number = max(color_map.values()) + 1
-        output_label.config(text=f"Le nombre chromatique du graphe est : {chromatic_number}")
-
-        return color_map
-
-    # Démarrer le chronomètre avant la coloration
-    tic()
-    # Obtenir la coloration des sommets
-    color_map = welsh_powell_coloring(G)
-    # Arrêter le chronomètre après la coloration
-    toc()
+    max_aretes = n * (n - 1) // 2
+    origines, extremites, _ = gnm(n, randint(min(n, max_aretes), max_aretes))
+    instance = {"num_vertices": n, "origines": origines, "extremites": extremites}
+    return instance, {"graphe": Graphe.depuis_aretes(n, origines, extremites)}
+
+# Afficher le graphe colorié calculé par solve_welsh_powell
+def afficher_welsh_powell(gui, output_label, contexte, resultat):
+    graphe = contexte["graphe"]
+    color_map = dict(enumerate(resultat["couleurs"]))
+    if color_map:
+        output_label.config(text=f"Le nombre chromatique du graphe est : {resultat['nombre_chromatique']}")
 
     # Vérifier si le graphe a des sommets avant de générer les couleurs
-    if G.number_of_nodes() > 0 and color_map:
+    if graphe.nombre_sommets > 0 and color_map:
+        # Créer un générateur de couleurs aléatoires
+        rand_color = RandomColor()
+
         # Générer une couleur aléatoire pour chaque index de couleur
         unique_colors = len(set(color_map.values()))
         color_palette = rand_color.generate(count=unique_colors, luminosity="light")
 
         # Assurez-vous que tous les nœuds ont une couleur dans color_map
+        G = graphe.to_networkx()
         node_colors = [color_palette[color_map.get(node, 0)] for node in G.nodes()]
 
         # Créer une nouvelle fenêtre pour afficher le graphe
@@ -88,7 +194,7 @@ def welsh_powell(gui, output_label):
 
         # Dessiner le graphe avec les couleurs des nœuds
         fig, ax = plt.subplots(figsize=(6, 6))
-        nx.draw(G, with_labels=True, node_color=node_colors, edge_color='gray', node_size=500, font_size=10, ax=ax)
+        dessiner_graphe(G, ax, node_color=node_colors, couleur_fond='gray', node_size=500, font_size=10)
         plt.title(f"Graphe colorié avec {unique_colors} couleurs (Algorithme Welsh-Powell)")
 
         # Intégrer le graphe dans la nouvelle fenêtre avec FigureCanvasTkAgg
@@ -97,4 +203,20 @@ def welsh_powell(gui, output_label):
         canvas.get_tk_widget().pack(fill="both", expand=True)
 
     else:
-        output_label.config(text="Le graphe n'a pas de sommets à afficher.")
\ No newline at end of file
+        output_label.config(text="Le graphe n'a pas de sommets à afficher.")
+
+# Fonction principale pour l'algorithme Welsh-Powell
+def welsh_powell(gui, output_label):
+    preparation = preparer_welsh_powell(gui, output_label)
+    if preparation is None:
+        return
+    instance, contexte = preparation
+
+    # Démarrer le chronomètre avant la coloration
+    tic()
+    # Obtenir la coloration des sommets
+    resultat = solve_welsh_powell(**instance)
+    # Arrêter le chronomètre après la coloration
+    toc()
+
+    afficher_welsh_powell(gui, output_label, contexte, resultat)